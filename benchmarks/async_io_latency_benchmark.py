@@ -0,0 +1,94 @@
+"""Measure the event loop latency while files are read and written
+
+Usage (with odc_pycommons installed, or from the repository root with PYTHONPATH=.):
+
+    python benchmarks/async_io_latency_benchmark.py [--files 20] [--size 1048576] [--rounds 5]
+
+A ticker coroutine sleeps for 1 ms at a time and records how late it wakes up, while ``files`` TextFileIO instances
+write and read ``size`` bytes each, ``rounds`` times. The run is done twice: once calling the blocking write() and
+read() directly from coroutines, and once with awrite() and aread(), which run the file IO on the async IO thread
+pool. The median and maximum ticker delays are reported for both.
+"""
+
+import argparse
+import asyncio
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from odc_pycommons.persistence import GenericDataContainer, TextFileIO, configure_async_io
+
+
+TICK_INTERVAL = 0.001
+
+
+async def ticker(stop_event: asyncio.Event, delays: list):
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_INTERVAL)
+        delays.append(time.perf_counter() - start - TICK_INTERVAL)
+
+
+async def blocking_io(io: TextFileIO, data: GenericDataContainer, rounds: int):
+    for _ in range(rounds):
+        io.write(data=data)
+        io.read()
+        await asyncio.sleep(0)
+
+
+async def async_io(io: TextFileIO, data: GenericDataContainer, rounds: int):
+    for _ in range(rounds):
+        await io.awrite(data=data)
+        await io.aread()
+
+
+async def measure(io_function, ios: list, data: GenericDataContainer, rounds: int)->tuple:
+    stop_event = asyncio.Event()
+    delays = list()
+    ticker_task = asyncio.ensure_future(ticker(stop_event=stop_event, delays=delays))
+    start = time.perf_counter()
+    await asyncio.gather(*[io_function(io=io, data=data, rounds=rounds) for io in ios])
+    elapsed = time.perf_counter() - start
+    stop_event.set()
+    await ticker_task
+    return (elapsed, delays)
+
+
+def run(files: int=20, size: int=1048576, rounds: int=5, max_workers: int=4)->dict:
+    """Run the benchmark
+
+    :returns: dict with the 'blocking' and 'async' results, each a dict with the 'elapsed' seconds and the 'median_delay' and 'max_delay' of the ticker in seconds
+    """
+    configure_async_io(max_workers=max_workers)
+    folder_path = tempfile.mkdtemp(prefix='odc_async_io_benchmark_')
+    try:
+        ios = [TextFileIO(file_folder_path=folder_path, file_name='file-{}'.format(i)) for i in range(files)]
+        data = GenericDataContainer(data_type=str)
+        data.store(data='x' * size)
+        results = dict()
+        for name, io_function in (('blocking', blocking_io), ('async', async_io)):
+            loop = asyncio.new_event_loop()
+            try:
+                elapsed, delays = loop.run_until_complete(measure(io_function=io_function, ios=ios, data=data, rounds=rounds))
+            finally:
+                loop.close()
+            if len(delays) == 0:
+                delays = [elapsed]
+            results[name] = {'elapsed': elapsed, 'median_delay': statistics.median(delays), 'max_delay': max(delays)}
+        return results
+    finally:
+        shutil.rmtree(folder_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure the event loop latency during file IO')
+    parser.add_argument('--files', type=int, default=20, help='number of files written and read concurrently (default=20)')
+    parser.add_argument('--size', type=int, default=1048576, help='number of bytes per file (default=1048576)')
+    parser.add_argument('--rounds', type=int, default=5, help='number of write/read rounds per file (default=5)')
+    parser.add_argument('--max-workers', type=int, default=4, help='number of async IO threads (default=4)')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    print('{:<10} {:>12} {:>18} {:>15}'.format('mode', 'elapsed s', 'median delay ms', 'max delay ms'))
+    for name, result in run(files=args.files, size=args.size, rounds=args.rounds, max_workers=args.max_workers).items():
+        print('{:<10} {:>12.3f} {:>18.3f} {:>15.3f}'.format(name, result['elapsed'], result['median_delay'] * 1000, result['max_delay'] * 1000))
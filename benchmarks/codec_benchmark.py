@@ -0,0 +1,55 @@
+"""Compare the registered SerializationCodecs on a generated dict payload
+
+Usage (with odc_pycommons installed, or from the repository root with PYTHONPATH=.):
+
+    python benchmarks/codec_benchmark.py [--records 1000] [--repeat 5]
+
+For each codec registered in odc_pycommons.persistence.SERIALIZATION_CODECS, the best of ``repeat`` runs for an
+encode and a decode of the payload is reported, together with the encoded size. Optional codecs (orjson, ujson,
+msgpack) are only included when the packages are installed (pip install odc_pycommons[codecs]).
+"""
+
+import argparse
+import timeit
+from odc_pycommons.persistence import SERIALIZATION_CODECS
+
+
+def build_payload(records: int)->dict:
+    return {
+        'record-{}'.format(i): {
+            'id': i,
+            'name': 'Record number {}'.format(i),
+            'value': i * 1.5,
+            'active': i % 2 == 0,
+            'tags': ['a', 'b', 'c'],
+        }
+        for i in range(records)
+    }
+
+
+def run(records: int=1000, repeat: int=5)->list:
+    """Run the benchmark
+
+    :returns: list of (codec name, encode seconds, decode seconds, encoded size in bytes) tuples, fastest round trip first
+    """
+    payload = build_payload(records=records)
+    results = list()
+    for name, codec in SERIALIZATION_CODECS.items():
+        raw = codec.encode(payload)
+        if codec.decode(raw) != payload:
+            raise Exception('Codec "{}" failed to round trip the payload'.format(name))
+        encode_seconds = min(timeit.repeat(lambda: codec.encode(payload), number=1, repeat=repeat))
+        decode_seconds = min(timeit.repeat(lambda: codec.decode(raw), number=1, repeat=repeat))
+        results.append((name, encode_seconds, decode_seconds, len(raw)))
+    results.sort(key=lambda result: result[1] + result[2])
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the registered SerializationCodecs')
+    parser.add_argument('--records', type=int, default=1000, help='number of records in the payload (default=1000)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs per codec (default=5)')
+    args = parser.parse_args()
+    print('{:<10} {:>12} {:>12} {:>12}'.format('codec', 'encode ms', 'decode ms', 'bytes'))
+    for name, encode_seconds, decode_seconds, size in run(records=args.records, repeat=args.repeat):
+        print('{:<10} {:>12.3f} {:>12.3f} {:>12}'.format(name, encode_seconds * 1000, decode_seconds * 1000, size))
@@ -0,0 +1,98 @@
+"""Measure the store and snapshot throughput of a ConcurrentDataContainer with concurrent writers and readers
+
+Usage (with odc_pycommons installed, or from the repository root with PYTHONPATH=.):
+
+    python benchmarks/concurrent_container_benchmark.py [--keys 10000] [--seconds 2] [--writers 1 2 4] [--readers 2]
+
+The container is filled with ``keys`` dict values. For each ``writers`` count, that many threads store values to
+random keys while ``readers`` threads take a snapshot() and iterate over it, for ``seconds`` seconds. The stores and
+snapshots per second are reported, together with the number of copies the copy-on-write snapshots caused. The
+container logs through a logger that discards all messages, so the results show the cost of the container and not
+of the log calls.
+"""
+
+import argparse
+import random
+import threading
+import time
+from odc_pycommons import OculusDLogger
+from odc_pycommons.persistence import ConcurrentDataContainer
+
+
+class QuietLogger(OculusDLogger):
+
+    def info(self, message: str, **kwargs):
+        pass
+
+    def debug(self, message: str, **kwargs):
+        pass
+
+    def warning(self, message: str, **kwargs):
+        pass
+
+    def error(self, message: str, **kwargs):
+        pass
+
+
+def build_container(keys: int)->ConcurrentDataContainer:
+    container = ConcurrentDataContainer(result_set_name='benchmark', data_type=dict, logger=QuietLogger())
+    for i in range(keys):
+        container.store(data={'id': i, 'value': i}, key='key-{}'.format(i))
+    return container
+
+
+def measure(container: ConcurrentDataContainer, keys: int, seconds: float, writers: int, readers: int)->tuple:
+    stop_event = threading.Event()
+    stores = [0] * writers
+    snapshots = [0] * readers
+
+    def writer(writer_id: int):
+        generator = random.Random(writer_id)
+        while not stop_event.is_set():
+            i = generator.randrange(keys)
+            container.store(data={'id': i, 'value': writer_id}, key='key-{}'.format(i))
+            stores[writer_id] += 1
+
+    def reader(reader_id: int):
+        while not stop_event.is_set():
+            for _ in container.snapshot().items():
+                pass
+            snapshots[reader_id] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads.extend([threading.Thread(target=reader, args=(i,)) for i in range(readers)])
+    copies = container.snapshot_copies
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    return (sum(stores), sum(snapshots), container.snapshot_copies - copies)
+
+
+def run(keys: int=10000, seconds: float=2.0, writers: list=None, readers: int=2)->list:
+    """Run the benchmark
+
+    :returns: list of (number of writers, stores per second, snapshots per second, snapshot copies) tuples
+    """
+    if writers is None:
+        writers = [1, 2, 4]
+    container = build_container(keys=keys)
+    results = list()
+    for writer_count in writers:
+        stores, snapshots, copies = measure(container=container, keys=keys, seconds=seconds, writers=writer_count, readers=readers)
+        results.append((writer_count, stores / seconds, snapshots / seconds, copies))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure ConcurrentDataContainer throughput')
+    parser.add_argument('--keys', type=int, default=10000, help='number of keys in the container (default=10000)')
+    parser.add_argument('--seconds', type=float, default=2.0, help='duration of each run in seconds (default=2)')
+    parser.add_argument('--writers', type=int, nargs='+', default=None, help='writer thread counts to run (default=1 2 4)')
+    parser.add_argument('--readers', type=int, default=2, help='number of reader threads (default=2)')
+    args = parser.parse_args()
+    print('{:<10} {:>12} {:>12} {:>10}'.format('writers', 'stores/s', 'snapshots/s', 'copies'))
+    for writer_count, stores, snapshots, copies in run(keys=args.keys, seconds=args.seconds, writers=args.writers, readers=args.readers):
+        print('{:<10} {:>12.0f} {:>12.1f} {:>10}'.format(writer_count, stores, snapshots, copies))
@@ -0,0 +1,77 @@
+"""Measure how GenericIOProcessorProcessPool scales with the number of worker processes
+
+Usage (with odc_pycommons installed, or from the repository root with PYTHONPATH=.):
+
+    python benchmarks/process_pool_benchmark.py [--containers 64] [--size 262144] [--rounds 100] [--max-workers 1 2 4]
+
+A CPU heavy processor (``rounds`` chained BLAKE2b digests over ``size`` bytes) is run over ``containers`` containers,
+first inline in the current process and then on a GenericIOProcessorProcessPool for each ``max_workers`` value. The
+worker processes are started before the timed run, so the results show the processing and transfer cost only. The
+elapsed time and the speed-up over the inline run are reported.
+"""
+
+import argparse
+import copy
+import hashlib
+import logging
+import os
+import time
+from odc_pycommons.persistence import GenericDataContainer, GenericIOProcessor, GenericIOProcessorProcessPool
+
+
+class DigestGenericIOProcessor(GenericIOProcessor):
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        digest = b''
+        for _ in range(kwarg.get('rounds', 1)):
+            digest = hashlib.blake2b(digest + data.data).digest()
+        data.store(data=digest)
+
+
+def build_containers(containers: int, size: int)->list:
+    result = list()
+    for i in range(containers):
+        data = GenericDataContainer(result_set_name='container-{}'.format(i), data_type=bytes)
+        data.store(data=os.urandom(size))
+        result.append(data)
+    return result
+
+
+def run(containers: int=64, size: int=262144, rounds: int=100, max_workers: list=None)->list:
+    """Run the benchmark
+
+    :returns: list of (number of workers, elapsed seconds, speed-up over the inline run) tuples. The inline run is reported with 0 workers
+    """
+    if max_workers is None:
+        cpu_count = os.cpu_count() or 1
+        max_workers = sorted(set([1, 2, 4, cpu_count]))
+    processor = DigestGenericIOProcessor()
+    data = build_containers(containers=containers, size=size)
+    start = time.perf_counter()
+    for container in data:
+        processor.process(data=copy.copy(container), rounds=rounds)
+    inline_seconds = time.perf_counter() - start
+    results = [(0, inline_seconds, 1.0)]
+    for workers in max_workers:
+        with GenericIOProcessorProcessPool(processor=processor, max_workers=workers) as pool:
+            list(pool.map(containers=data[:workers], rounds=1))
+            start = time.perf_counter()
+            processed = list(pool.map(containers=data, rounds=rounds))
+            elapsed = time.perf_counter() - start
+        if len(processed) != containers:
+            raise Exception('Expected {} results but got {}'.format(containers, len(processed)))
+        results.append((workers, elapsed, inline_seconds / elapsed))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure GenericIOProcessorProcessPool scaling')
+    parser.add_argument('--containers', type=int, default=64, help='number of containers processed (default=64)')
+    parser.add_argument('--size', type=int, default=262144, help='number of bytes per container (default=262144)')
+    parser.add_argument('--rounds', type=int, default=100, help='number of digests per container (default=100)')
+    parser.add_argument('--max-workers', type=int, nargs='+', default=None, help='worker process counts to run (default=1 2 4 and the number of CPUs)')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    print('{:<10} {:>12} {:>10}'.format('workers', 'elapsed s', 'speed-up'))
+    for workers, elapsed, speed_up in run(containers=args.containers, size=args.size, rounds=args.rounds, max_workers=args.max_workers):
+        print('{:<10} {:>12.3f} {:>10.2f}'.format(workers if workers > 0 else 'inline', elapsed, speed_up))
@@ -8,9 +8,61 @@ from odc_pycommons import OculusDLogger, get_utc_timestamp
 from odc_pycommons.security import DataValidator, StringDataValidator, NumberDataValidator
 import pathlib
 import os
+import re
+import sqlite3
+import array
+import sys
+import time
+import codecs
+import stat
 import json
+import marshal
+import pickle
+import hashlib
+import tempfile
+import gzip
+import bz2
+import lzma
+import threading
+import atexit
+import traceback
+import asyncio
+import functools
+import queue
+import copy
+import weakref
+import types
+import bisect
+import math
+import collections
+import struct
+import mmap
+import importlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from decimal import Decimal
 
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    orjson = None       # pragma: no cover
+try:
+    import ujson
+except ImportError:     # pragma: no cover
+    ujson = None        # pragma: no cover
+try:
+    import msgpack
+except ImportError:     # pragma: no cover
+    msgpack = None      # pragma: no cover
+try:
+    import fcntl
+except ImportError:     # pragma: no cover
+    fcntl = None        # pragma: no cover
+try:
+    from multiprocessing import shared_memory
+    from multiprocessing import resource_tracker
+except ImportError:         # pragma: no cover
+    shared_memory = None    # pragma: no cover
+
 
 L = OculusDLogger()
 
@@ -18,16 +70,753 @@ L = OculusDLogger()
 HOME = '{}{}'.format(str(pathlib.Path.home()), os.sep)
 L.debug('HOME={}'.format(HOME))
 
+WRITE_MODE_OVERWRITE = 'overwrite'
+WRITE_MODE_ATOMIC = 'atomic'
+WRITE_MODE_APPEND = 'append'
+SUPPORTED_WRITE_MODES = (WRITE_MODE_OVERWRITE, WRITE_MODE_ATOMIC, WRITE_MODE_APPEND)
+
+_new_file_mode = None
+_new_file_mode_lock = threading.Lock()
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_BZ2 = 'bz2'
+COMPRESSION_LZMA = 'lzma'
+SUPPORTED_COMPRESSION = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_BZ2, COMPRESSION_LZMA)
+COMPRESSION_EXTENSIONS = {
+    '.gz': COMPRESSION_GZIP,
+    '.gzip': COMPRESSION_GZIP,
+    '.bz2': COMPRESSION_BZ2,
+    '.xz': COMPRESSION_LZMA,
+    '.lzma': COMPRESSION_LZMA,
+}
+COMPRESSION_MAGIC_BYTES = (
+    (re.compile(b'\x1f\x8b\x08'), COMPRESSION_GZIP),
+    (re.compile(b'BZh[1-9]1AY&SY'), COMPRESSION_BZ2),
+    (re.compile(b'\xfd7zXZ\x00'), COMPRESSION_LZMA),
+)
+COMPRESSION_MAGIC_BYTES_LENGTH = 10
+
+PIPELINE_EXECUTOR_INLINE = 'inline'
+PIPELINE_EXECUTOR_THREAD = 'thread'
+PIPELINE_EXECUTOR_PROCESS = 'process'
+SUPPORTED_PIPELINE_EXECUTORS = (PIPELINE_EXECUTOR_INLINE, PIPELINE_EXECUTOR_THREAD, PIPELINE_EXECUTOR_PROCESS)
+PIPELINE_BACKPRESSURE_BLOCK = 'block'
+PIPELINE_BACKPRESSURE_DROP = 'drop'
+SUPPORTED_PIPELINE_BACKPRESSURE = (PIPELINE_BACKPRESSURE_BLOCK, PIPELINE_BACKPRESSURE_DROP)
+MEMORY_BUDGET_WARN = 'warn'
+MEMORY_BUDGET_EVICT = 'evict'
+SUPPORTED_MEMORY_BUDGET_ACTIONS = (MEMORY_BUDGET_WARN, MEMORY_BUDGET_EVICT)
+PIPELINE_ERROR_STOP = 'stop'
+PIPELINE_ERROR_SKIP = 'skip'
+PIPELINE_ERROR_CONTINUE = 'continue'
+SUPPORTED_PIPELINE_ERROR_POLICIES = (PIPELINE_ERROR_STOP, PIPELINE_ERROR_SKIP, PIPELINE_ERROR_CONTINUE)
+
+
+def detect_compression(path: str, read_magic_bytes: bool=False)->str:
+    """Detect the compression of a file from the file extension or, when enabled, from the first bytes of the file
+
+    Looking at the file content opens the file an extra time and can mistake a plain text file for a compressed one, 
+    so it is only done when ``read_magic_bytes`` is True. The full stream headers are matched (see 
+    COMPRESSION_MAGIC_BYTES) to keep such false positives unlikely.
+
+    :param path: str with the file path
+    :param read_magic_bytes: bool to look at the file content if the file exists (default=False)
+
+    :returns: str with one of SUPPORTED_COMPRESSION
+    """
+    if read_magic_bytes is True and os.path.isfile(path):
+        with open(path, 'rb') as f:
+            header = f.read(COMPRESSION_MAGIC_BYTES_LENGTH)
+        if len(header) > 0:
+            for magic_bytes, compression in COMPRESSION_MAGIC_BYTES:
+                if magic_bytes.match(header) is not None:
+                    return compression
+            return COMPRESSION_NONE
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COMPRESSION_EXTENSIONS:
+        return COMPRESSION_EXTENSIONS[extension]
+    return COMPRESSION_NONE
+
+
+def _open_file(path: str, mode: str, compression: str=COMPRESSION_NONE, compression_level: int=None):
+    """Open a file, streaming through a compressor/decompressor when required. Text modes use UTF-8 for compressed files
+    """
+    if compression == COMPRESSION_NONE:
+        return open(path, mode)
+    if 'b' not in mode and 't' not in mode:
+        mode = '{}t'.format(mode)
+    encoding = None
+    if 't' in mode:
+        encoding = 'utf-8'
+    if compression == COMPRESSION_GZIP:
+        if compression_level is None:
+            compression_level = 9
+        return gzip.open(path, mode, compresslevel=compression_level, encoding=encoding)
+    if compression == COMPRESSION_BZ2:
+        if compression_level is None:
+            compression_level = 9
+        return bz2.open(path, mode, compresslevel=compression_level, encoding=encoding)
+    if compression == COMPRESSION_LZMA:
+        if 'r' in mode:
+            return lzma.open(path, mode, encoding=encoding)
+        return lzma.open(path, mode, preset=compression_level, encoding=encoding)
+    raise Exception('Compression "{}" was not found in the current supported compression types: {}'.format(compression, SUPPORTED_COMPRESSION))
+
+ASYNC_IO_MAX_WORKERS = 4
+_async_io_executor = None
+_async_io_executor_lock = threading.Lock()
+
+
+def configure_async_io(max_workers: int=ASYNC_IO_MAX_WORKERS):
+    """Set the number of threads available for the async GenericIO methods (aread() and awrite())
+
+    Blocking file IO from the async methods runs on a dedicated thread pool, separate from the event loop's default 
+    executor, so that heavy file IO can not starve other users of the default executor. At most ``max_workers`` 
+    reads/writes will run concurrently, the rest will wait in the pool's queue.
+
+    Calls in progress on a previously configured pool are allowed to complete.
+
+    :param max_workers: int with the maximum number of concurrent blocking IO calls
+    """
+    global _async_io_executor
+    if max_workers < 1:
+        raise Exception('max_workers must be 1 or more')
+    with _async_io_executor_lock:
+        old_executor = _async_io_executor
+        _async_io_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='odc_async_io')
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+
+
+def get_async_io_executor()->ThreadPoolExecutor:
+    global _async_io_executor
+    with _async_io_executor_lock:
+        if _async_io_executor is None:
+            _async_io_executor = ThreadPoolExecutor(max_workers=ASYNC_IO_MAX_WORKERS, thread_name_prefix='odc_async_io')
+        return _async_io_executor
+
+
+def _get_new_file_mode(folder_path: str)->int:
+    """Returns the permission bits a new file gets (0o666 minus the umask), so files created with mkstemp (mode 0o600) 
+    can be given the same mode as a file created with open()
+
+    The umask can only be read by changing it, which affects all threads. Instead, a probe file is created once, at 
+    first use, and its mode is kept.
+    """
+    global _new_file_mode
+    with _new_file_mode_lock:
+        if _new_file_mode is None:
+            probe_path = os.path.join(folder_path, '.odc_file_mode.{}.{}.probe'.format(os.getpid(), threading.get_ident()))
+            fd = os.open(probe_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            try:
+                _new_file_mode = stat.S_IMODE(os.fstat(fd).st_mode)
+            finally:
+                os.close(fd)
+                os.remove(probe_path)
+        return _new_file_mode
+
+
+def _fsync_path(path: str, is_directory: bool=False):
+    """Flush a file (or directory entry) that is no longer open to stable storage
+
+    Directories can only be synced on POSIX systems - on other systems the call is silently ignored.
+    """
+    if is_directory is True and os.name != 'posix':
+        return      # pragma: no cover
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SpillableList:
+    """A list-like object holding at most ``max_items_in_memory`` items in memory. Further items are pickled to a 
+    temporary segment file
+
+    Items can only be appended. Iteration, ``len()`` and indexing work across the in-memory and the spilled items, 
+    in the order the items were appended. ``spilled_items`` and ``spilled_bytes`` show how much was spilled to disk.
+
+    When pickled (for example to send a container to a worker process), all items are sent and the list is rebuilt 
+    with the same memory ceiling, spilling to a new segment file of its own.
+    """
+
+    def __init__(self, max_items_in_memory: int, spill_folder: str=None):
+        """Initialize the list
+
+        :param max_items_in_memory: int with the maximum number of items kept in memory
+        :param spill_folder: str with the folder for the temporary segment file (default=None, meaning the system temporary folder)
+        """
+        if max_items_in_memory < 0:
+            raise Exception('max_items_in_memory can not be negative')
+        self.max_items_in_memory = max_items_in_memory
+        self.spill_folder = spill_folder
+        self.memory_items = list()
+        self.spill_file = None
+        self.spill_offsets = array.array('Q')
+        self.spilled_items = 0
+        self.spilled_bytes = 0
+
+    def append(self, item: object):
+        if len(self.memory_items) < self.max_items_in_memory:
+            self.memory_items.append(item)
+            return
+        if self.spill_file is None:
+            self.spill_file = tempfile.TemporaryFile(dir=self.spill_folder)
+        raw = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+        self.spill_file.seek(0, os.SEEK_END)
+        self.spill_offsets.append(self.spill_file.tell())
+        self.spill_file.write(raw)
+        self.spilled_items = self.spilled_items + 1
+        self.spilled_bytes = self.spilled_bytes + len(raw)
+
+    def _iter_spilled(self, start: int=0):
+        if self.spill_file is None or start >= len(self.spill_offsets):
+            return
+        self.spill_file.flush()
+        position = self.spill_offsets[start]
+        for index in range(start, len(self.spill_offsets)):
+            self.spill_file.seek(position)
+            item = pickle.load(self.spill_file)
+            position = self.spill_file.tell()
+            yield item
+
+    def __len__(self)->int:
+        return len(self.memory_items) + len(self.spill_offsets)
+
+    def __iter__(self):
+        for item in self.memory_items:
+            yield item
+        for item in self._iter_spilled():
+            yield item
+
+    def __getitem__(self, index: int)->object:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index = index + len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('SpillableList index out of range')
+        if index < len(self.memory_items):
+            return self.memory_items[index]
+        return next(self._iter_spilled(start=index - len(self.memory_items)))
+
+    def __eq__(self, other: object)->bool:
+        if isinstance(other, (list, SpillableList)):
+            return len(self) == len(other) and list(self) == list(other)
+        return False
+
+    def __repr__(self)->str:
+        return repr(list(self))
+
+    def __reduce__(self):
+        return (_spillable_list_from_items, (self.max_items_in_memory, self.spill_folder, list(self)))
+
+    def close(self):
+        """Remove the segment file. The spilled items are no longer available after this call
+        """
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+        self.spill_offsets = array.array('Q')
+
+
+def _spillable_list_from_items(max_items_in_memory: int, spill_folder: str, items: list)->SpillableList:
+    spillable_list = SpillableList(max_items_in_memory=max_items_in_memory, spill_folder=spill_folder)
+    for item in items:
+        spillable_list.append(item)
+    return spillable_list
+
+
+def deep_sizeof(obj: object, seen: set=None)->int:
+    """Estimate the memory used by an object, including the objects it contains
+
+    Dicts (and mapping proxies), lists, tuples, sets, deques, SpillableList (in-memory items only) and 
+    GenericDataContainer data are followed. Each object is counted once, also when it is referenced more than once. 
+    For memoryviews the viewed bytes are included. Other objects are counted with ``sys.getsizeof``.
+
+    :param obj: object to measure
+    :param seen: set of object ids that were already counted - pass the same set to measure several objects without double counting (default=None)
+
+    :returns: int with the estimated size in bytes
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while len(stack) > 0:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (dict, types.MappingProxyType)):
+            for key, value in item.items():
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(item, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(item)
+        elif isinstance(item, SpillableList):
+            stack.append(item.memory_items)
+            stack.append(item.spill_offsets)
+        elif isinstance(item, GenericDataContainer):
+            stack.append(item.data)
+        elif isinstance(item, memoryview):
+            try:
+                if id(item.obj) not in seen:
+                    seen.add(id(item.obj))
+                    size += item.nbytes
+            except ValueError:
+                pass
+    return size
+
+
+class MemoryRegistry:
+    """Process-wide accounting of the memory held by GenericDataContainers and TextFileIO caches
+
+    Every GenericDataContainer registers itself on creation, and every TextFileIO registers when it caches data. Only 
+    weak references are kept, so the registry never keeps objects alive.
+
+    The size of cached data is estimated once, on first use: after every cache update when a cache budget is set, 
+    otherwise only when cache_bytes() or totals() is called, so caching costs nothing extra without a budget. When 
+    the cache budget is exceeded, the oldest caches are cleared (``MEMORY_BUDGET_EVICT``) or a 
+    warning is logged (``MEMORY_BUDGET_WARN``). Container sizes are estimated on demand, which is proportional to 
+    the amount of data, so the container budget is only checked by check_budgets(). Containers can not be evicted - 
+    exceeding the container budget logs a warning.
+
+    Cached data is held in GenericDataContainers, so the cache bytes are included in the container bytes.
+    """
+
+    def __init__(self, logger=L):
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.containers = weakref.WeakSet()
+        self.caches = weakref.WeakSet()
+        self.cache_budget_bytes = None
+        self.cache_budget_action = MEMORY_BUDGET_EVICT
+        self.container_budget_bytes = None
+        self.evictions = 0
+        self.budget_warnings = 0
+
+    def register_container(self, container: object):
+        with self.lock:
+            self.containers.add(container)
+
+    def register_cache(self, io: object):
+        with self.lock:
+            self.caches.add(io)
+
+    def set_budgets(self, cache_budget_bytes: int=None, container_budget_bytes: int=None, cache_budget_action: str=MEMORY_BUDGET_EVICT):
+        """Configure the memory budgets
+
+        :param cache_budget_bytes: int with the maximum bytes of cached data (default=None, meaning no budget)
+        :param container_budget_bytes: int with the maximum bytes held by all containers (default=None, meaning no budget)
+        :param cache_budget_action: str with MEMORY_BUDGET_EVICT or MEMORY_BUDGET_WARN (default=MEMORY_BUDGET_EVICT)
+        """
+        if cache_budget_action not in SUPPORTED_MEMORY_BUDGET_ACTIONS:
+            raise Exception('Unsupported budget action "{}". Expected one of {}'.format(cache_budget_action, SUPPORTED_MEMORY_BUDGET_ACTIONS))
+        self.cache_budget_bytes = cache_budget_bytes
+        self.container_budget_bytes = container_budget_bytes
+        self.cache_budget_action = cache_budget_action
+
+    def _live_caches(self)->list:
+        with self.lock:
+            return [io for io in self.caches if io.cached_data is not None]
+
+    def cache_bytes(self)->int:
+        return sum([io.cached_data_size for io in self._live_caches()])
+
+    def container_bytes(self)->int:
+        """Returns the estimated bytes held by all live containers. A GenericDataContainer that is changed by 
+        another thread while it is measured is skipped (ConcurrentDataContainers are measured under their data lock)
+        """
+        with self.lock:
+            containers = list(self.containers)
+        seen = set()
+        size = 0
+        for container in containers:
+            try:
+                size += container.memory_usage(seen=seen)
+            except RuntimeError as e:
+                self.logger.warning('Memory usage of container "{}" skipped: {}'.format(container.result_set_name, e))
+        return size
+
+    def totals(self)->dict:
+        """Returns the number of live containers and caches and their estimated sizes in bytes
+        """
+        with self.lock:
+            container_count = len(self.containers)
+        caches = self._live_caches()
+        return {
+            'containers': container_count,
+            'container_bytes': self.container_bytes(),
+            'caches': len(caches),
+            'cache_bytes': sum([io.cached_data_size for io in caches]),
+        }
+
+    def check_cache_budget(self):
+        """Evict caches, or log a warning, when the cached data exceeds the cache budget
+        """
+        if self.cache_budget_bytes is None:
+            return
+        caches = self._live_caches()
+        total = sum([io.cached_data_size for io in caches])
+        if total <= self.cache_budget_bytes:
+            return
+        if self.cache_budget_action == MEMORY_BUDGET_WARN:
+            self.budget_warnings += 1
+            self.logger.warning('Cached data uses {} bytes - over the budget of {} bytes'.format(total, self.cache_budget_bytes))
+            return
+        for io in sorted(caches, key=lambda io: io.cached_data_timestamp):
+            if total <= self.cache_budget_bytes:
+                break
+            total -= io.cached_data_size
+            io.clear_cache()
+            self.evictions += 1
+            self.logger.info('Cache of "{}" evicted - cached data uses {} bytes after eviction'.format(io.uri, total))
+
+    def check_budgets(self):
+        """Check the cache budget and log a warning if the containers exceed the container budget
+        """
+        self.check_cache_budget()
+        if self.container_budget_bytes is None:
+            return
+        total = self.container_bytes()
+        if total > self.container_budget_bytes:
+            self.budget_warnings += 1
+            self.logger.warning('GenericDataContainers use {} bytes - over the budget of {} bytes'.format(total, self.container_budget_bytes))
+
+
+MEMORY_REGISTRY = MemoryRegistry()
+
+
+AGGREGATE_DATA_TYPES = ('list', 'tuple', 'int', 'float', 'Decimal')
+
+
+class RunningAggregates:
+    """Incrementally maintained count, sum, min, max, mean and variance of a series of numbers
+
+    Every update is O(1) (amortized for windowed min/max), so the statistics can be read at any time without a pass 
+    over the data. The variance uses Welford's algorithm. With a ``window``, only the last ``window`` values are 
+    aggregated.
+
+    The numeric type of the first value decides the type of the aggregates: once a Decimal was added, later int and 
+    float values are converted to Decimal, otherwise Decimal values are converted to float. Decimal aggregates are 
+    calculated with the current Decimal context.
+    """
+
+    def __init__(self, window: int=None):
+        """Initialize the aggregates
+
+        :param window: int with the number of most recent values to aggregate (default=None, meaning all values)
+        """
+        if window is not None and window < 1:
+            raise Exception('window must be 1 or more')
+        self.window = window
+        self.values = None
+        self.min_candidates = None
+        self.max_candidates = None
+        if window is not None:
+            self.values = collections.deque()
+            self.min_candidates = collections.deque()
+            self.max_candidates = collections.deque()
+        self.is_decimal = None
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.sum = 0
+        self.mean = 0
+        self.m2 = 0
+        self.min = None
+        self.max = None
+        self.total_count = 0
+        if self.window is not None:
+            self.values.clear()
+            self.min_candidates.clear()
+            self.max_candidates.clear()
+
+    @staticmethod
+    def is_number(value: object)->bool:
+        return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+    def _normalize(self, value: object)->object:
+        if not self.is_number(value):
+            raise Exception('Aggregates can only be calculated for numbers but got "{}"'.format(type(value).__name__))
+        if self.is_decimal is None:
+            self.is_decimal = isinstance(value, Decimal)
+            if self.is_decimal is True:
+                self.sum = Decimal(0)
+                self.mean = Decimal(0)
+                self.m2 = Decimal(0)
+        if self.is_decimal is True and not isinstance(value, Decimal):
+            return Decimal(value)
+        if self.is_decimal is False and isinstance(value, Decimal):
+            return float(value)
+        return value
+
+    def add(self, value: object):
+        """Add a value to the aggregates
+
+        :param value: int, float or Decimal
+        """
+        value = self._normalize(value=value)
+        self.total_count += 1
+        self.count += 1
+        self.sum += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.window is None:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+            return
+        self.values.append(value)
+        while len(self.min_candidates) > 0 and self.min_candidates[-1] > value:
+            self.min_candidates.pop()
+        self.min_candidates.append(value)
+        while len(self.max_candidates) > 0 and self.max_candidates[-1] < value:
+            self.max_candidates.pop()
+        self.max_candidates.append(value)
+        if len(self.values) > self.window:
+            self._remove_oldest()
+        self.min = self.min_candidates[0]
+        self.max = self.max_candidates[0]
+
+    def _remove_oldest(self):
+        value = self.values.popleft()
+        if self.min_candidates[0] == value:
+            self.min_candidates.popleft()
+        if self.max_candidates[0] == value:
+            self.max_candidates.popleft()
+        self.count -= 1
+        self.sum -= value
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+        if self.m2 < 0:
+            self.m2 = self.m2 * 0
+
+    @property
+    def variance(self)->object:
+        """The population variance, or None if no values were added
+        """
+        if self.count == 0:
+            return None
+        return self.m2 / self.count
+
+    @property
+    def sample_variance(self)->object:
+        """The sample variance, or None if less than two values were added
+        """
+        if self.count < 2:
+            return None
+        return self.m2 / (self.count - 1)
+
+    @property
+    def stddev(self)->object:
+        """The population standard deviation, or None if no values were added
+        """
+        variance = self.variance
+        if variance is None:
+            return None
+        if isinstance(variance, Decimal):
+            return variance.sqrt()
+        return math.sqrt(variance)
+
+    def as_dict(self)->dict:
+        mean = None
+        if self.count > 0:
+            mean = self.mean
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'mean': mean,
+            'variance': self.variance,
+        }
+
+
+class DictSecondaryIndex:
+    """A secondary index over the values of a dict GenericDataContainer
+
+    The index value of each record is either the value of ``field`` (for records that are dicts) or the result of 
+    ``key_function(record)``. Records without the field, or for which the key function returns None, are not indexed.
+
+    Equality lookups use a hash map from index value to container keys. Range lookups use a sorted list of the 
+    distinct index values, so all index values must be comparable with each other.
+    """
+
+    def __init__(self, name: str, field: object=None, key_function: object=None):
+        """Initialize the index
+
+        :param name: str with the index name
+        :param field: object with the record field to index (default=None)
+        :param key_function: callable taking a record and returning the index value (default=None)
+        """
+        if (field is None) == (key_function is None):
+            raise Exception('Set either a field or a key_function for index "{}"'.format(name))
+        self.name = name
+        self.field = field
+        self.key_function = key_function
+        self.keys_by_value = dict()
+        self.value_by_key = dict()
+        self.sorted_values = list()
+
+    def index_value(self, record: object)->object:
+        if self.key_function is not None:
+            return self.key_function(record)
+        if isinstance(record, dict):
+            return record.get(self.field, None)
+        return None
+
+    def prepare(self, record: object)->tuple:
+        """Compute and check the index value of a record, without changing the index
+
+        :returns: tuple with the index value and the position of the value in the sorted values (None when the value is None or already indexed)
+        """
+        value = self.index_value(record=record)
+        if value is None:
+            return (None, None)
+        try:
+            if value in self.keys_by_value:
+                return (value, None)
+        except TypeError:
+            raise Exception('Index "{}" value "{}" is not hashable'.format(self.name, value))
+        try:
+            position = bisect.bisect_left(self.sorted_values, value)
+        except TypeError:
+            raise Exception('Index "{}" value "{}" can not be compared with the other index values'.format(self.name, value))
+        return (value, position)
+
+    def apply(self, key: object, value: object, position: int):
+        """Index the record stored under key with a value returned by prepare(). No other change may be made to the 
+        index between prepare() and apply()
+        """
+        if key in self.value_by_key and self.value_by_key[key] == value:
+            return
+        if position is not None:
+            self.sorted_values.insert(position, value)
+            self.keys_by_value[value] = set()
+        self.remove(key=key)
+        if value is not None:
+            self.keys_by_value[value].add(key)
+            self.value_by_key[key] = value
+
+    def update(self, key: object, record: object):
+        """Index (or re-index) the record stored under key
+        """
+        value, position = self.prepare(record=record)
+        self.apply(key=key, value=value, position=position)
+
+    def remove(self, key: object):
+        """Remove the record stored under key from the index
+        """
+        if key not in self.value_by_key:
+            return
+        value = self.value_by_key.pop(key)
+        keys = self.keys_by_value[value]
+        keys.discard(key)
+        if len(keys) == 0:
+            del self.keys_by_value[value]
+            del self.sorted_values[bisect.bisect_left(self.sorted_values, value)]
+
+    def lookup(self, value: object)->list:
+        """Returns the container keys of the records with the index value
+        """
+        return list(self.keys_by_value.get(value, ()))
+
+    def lookup_range(self, start: object=None, end: object=None, include_end: bool=True)->list:
+        """Returns the container keys of the records with an index value from start up to end, in index value order
+
+        :param start: object with the lowest index value to include (default=None, meaning no lower bound)
+        :param end: object with the highest index value (default=None, meaning no upper bound)
+        :param include_end: bool to include records with the index value end (default=True)
+        """
+        low = 0
+        if start is not None:
+            low = bisect.bisect_left(self.sorted_values, start)
+        high = len(self.sorted_values)
+        if end is not None:
+            if include_end is True:
+                high = bisect.bisect_right(self.sorted_values, end)
+            else:
+                high = bisect.bisect_left(self.sorted_values, end)
+        keys = list()
+        for value in self.sorted_values[low:high]:
+            keys.extend(self.keys_by_value[value])
+        return keys
+
+    @property
+    def entries(self)->int:
+        """The number of indexed records
+        """
+        return len(self.value_by_key)
+
+    @property
+    def distinct_values(self)->int:
+        """The number of distinct index values
+        """
+        return len(self.sorted_values)
+
+    def memory_usage(self)->int:
+        """The approximate number of bytes used by the index structures (excluding the keys and values themselves, which are shared with the container)
+        """
+        size = sys.getsizeof(self.keys_by_value) + sys.getsizeof(self.value_by_key) + sys.getsizeof(self.sorted_values)
+        for keys in self.keys_by_value.values():
+            size += sys.getsizeof(keys)
+        return size
+
 
 class GenericDataContainer:
     """A data container for storing some common Python types with some basic validation capabilities
     """
 
-    def __init__(self, result_set_name: str='anonymous', data_type: object=str, data_validator: DataValidator=None, logger=L):
+    def __init__(
+        self,
+        result_set_name: str='anonymous',
+        data_type: object=str,
+        data_validator: DataValidator=None,
+        logger=L,
+        max_items_in_memory: int=None,
+        spill_folder: str=None,
+        aggregates: bool=False,
+        aggregate_window: int=None,
+        track_changes: bool=False
+    ):
+        """Initialize the container
+
+        For the list data type, ``max_items_in_memory`` puts a ceiling on the number of items kept in memory. Items 
+        stored beyond the ceiling are spilled to a temporary file (see SpillableList).
+
+        For the list, tuple, int, float and Decimal data types, ``aggregates`` maintains RunningAggregates (available 
+        as ``self.aggregates``) over all stored values: list items, tuple items, or each number stored in a number 
+        container.
+
+        For the dict data type, ``track_changes`` records the keys that are stored or deleted, so that only the changes 
+        since a known version have to be sent or written (see changes_since() and drain_changes()). Every store() and 
+        delete() increments ``self.version``, whether changes are tracked or not.
+
+        :param result_set_name: str with a name for the data (default='anonymous')
+        :param data_type: object with one of the supported data types (default=str)
+        :param data_validator: DataValidator used when data is stored (default=None)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        :param max_items_in_memory: int with the maximum number of list items kept in memory (default=None, meaning no limit)
+        :param spill_folder: str with the folder for spilled list items (default=None, meaning the system temporary folder)
+        :param aggregates: bool to maintain running aggregates of the stored numbers (default=False)
+        :param aggregate_window: int with the number of most recent values to aggregate (default=None, meaning all values)
+        :param track_changes: bool to track the changed and deleted keys of a dict container (default=False)
+        """
         self.data = None
         self.data_type = data_type
         if data_type.__name__ == 'str':
             self.data = ''
+        elif data_type.__name__ == 'list' and max_items_in_memory is not None:
+            self.data = SpillableList(max_items_in_memory=max_items_in_memory, spill_folder=spill_folder)
         elif data_type.__name__ == 'list' or data_type.__name__ == 'tuple':
             self.data = list()
         elif data_type.__name__ == 'int':
@@ -38,11 +827,13 @@ class GenericDataContainer:
             self.data = Decimal('0.0')
         elif data_type.__name__ == 'dict':
             self.data = dict()
+        elif data_type.__name__ == 'bytes':
+            self.data = b''
         else:
             raise Exception(
                 'Data type "{}" was not found in the current supported types: {}'.format(
                     data_type.__name__,
-                    ('str', 'list', 'tuple', 'int', 'float', 'Decimal', 'dict')
+                    ('str', 'list', 'tuple', 'int', 'float', 'Decimal', 'dict', 'bytes')
                 )
             )
         self.data_validator = None
@@ -54,15 +845,44 @@ class GenericDataContainer:
                 raise Exception('Invalid data validator type. Expected an implementation of DataValidator')
         else:
             logger.warning('No data validator set')
+        self.indexes = dict()
+        self.version = 0
+        self.track_changes = track_changes
+        self.changes = collections.OrderedDict()
+        self.changes_base_version = 0
+        if track_changes is True and data_type.__name__ != 'dict':
+            raise Exception('Change tracking is only supported for the dict data type')
+        self.aggregates = None
+        if aggregates is True:
+            if data_type.__name__ not in AGGREGATE_DATA_TYPES:
+                raise Exception('Aggregates are only supported for the data types {}'.format(AGGREGATE_DATA_TYPES))
+            self.aggregates = RunningAggregates(window=aggregate_window)
         logger.info('GenericDataContainer "{}" ready'.format(result_set_name))
         self.logger = logger
         self.result_set_name = result_set_name
+        MEMORY_REGISTRY.register_container(self)
 
-    def _store_dict(self, data: object, key: object, **kwarg)->int:
+    def memory_usage(self, seen: set=None)->int:
+        """Estimate the memory used by the data, indexes, aggregates and tracked changes of the container (see deep_sizeof())
+
+        :param seen: set of object ids that were already counted (default=None)
+
+        :returns: int with the estimated size in bytes
+        """
+        if seen is None:
+            seen = set()
+        size = deep_sizeof(self.data, seen=seen) + deep_sizeof(self.changes, seen=seen)
+        for index in self.indexes.values():
+            size += index.memory_usage()
+        if self.aggregates is not None and self.aggregates.window is not None:
+            size += deep_sizeof(self.aggregates.values, seen=seen)
+            size += deep_sizeof(self.aggregates.min_candidates, seen=seen)
+            size += deep_sizeof(self.aggregates.max_candidates, seen=seen)
+        return size
+
+    def _validate_dict_value(self, data: object, key: object, **kwarg):
         if key is None:
             raise Exception('Expected a key value but found None (data_type was set to dict)')
-        if key in self.data:
-            self.logger.warning('Key "{}" already exists in dict - old value was replaced with new value'.format(key))
         if self.data_validator is not None:
             if isinstance(self.data_validator, DataValidator):
                 if not self.data_validator.validate(data=data, **kwarg):
@@ -73,9 +893,143 @@ class GenericDataContainer:
                 self.logger.warning('No DataValidator set - Dictionary value for key "{}" stored without validation! [2]'.format(key)) # pragma: no cover
         else:
             self.logger.warning('No DataValidator set - Dictionary value for key "{}" stored without validation! [1]'.format(key))
+
+    def _set_dict_value(self, data: object, key: object)->int:
+        if key in self.data:
+            self.logger.warning('Key "{}" already exists in dict - old value was replaced with new value'.format(key))
+        # All index values are checked before any index changes, so a rejected value leaves every index unchanged
+        prepared = [(index, index.prepare(record=data)) for index in self.indexes.values()]
+        for index, (value, position) in prepared:
+            index.apply(key=key, value=value, position=position)
         self.data[key] = data
+        self._record_change(key=key, is_deleted=False)
+        return len(self.data)
+
+    def _record_change(self, key: object, is_deleted: bool):
+        self.version += 1
+        if self.track_changes is True:
+            self.changes[key] = (self.version, is_deleted)
+            self.changes.move_to_end(key)
+
+    def _delete_dict_value(self, key: object)->int:
+        if key not in self.data:
+            raise Exception('Key "{}" not found'.format(key))
+        for index in self.indexes.values():
+            index.remove(key=key)
+        del self.data[key]
+        self._record_change(key=key, is_deleted=True)
         return len(self.data)
 
+    def delete(self, key: object)->int:
+        """Delete a key from a dict container
+
+        :param key: object with the key to delete
+
+        :returns: int with the number of keys left
+        """
+        if self.data_type.__name__ != 'dict':
+            raise Exception('Delete is only supported for the dict data type')
+        return self._delete_dict_value(key=key)
+
+    def changes_since(self, version: int)->dict:
+        """Returns the keys that changed after the given version
+
+        :param version: int with a previous value of ``self.version`` (0 for all tracked changes)
+
+        :returns: dict with the current 'version', the 'changed' keys with their current values and a list of 'deleted' keys
+        """
+        if self.track_changes is False:
+            raise Exception('Changes are not tracked for container "{}"'.format(self.result_set_name))
+        if version < self.changes_base_version:
+            raise Exception('Changes up to version {} were drained - can not get the changes since version {}'.format(self.changes_base_version, version))
+        changed = dict()
+        deleted = list()
+        for key in reversed(self.changes):
+            change_version, is_deleted = self.changes[key]
+            if change_version <= version:
+                break
+            if is_deleted is True:
+                deleted.append(key)
+            else:
+                changed[key] = self.data[key]
+        return {'version': self.version, 'changed': changed, 'deleted': deleted}
+
+    def drain_changes(self)->dict:
+        """Returns all tracked changes (see changes_since()) and stops tracking them, so they are not returned again
+        """
+        changes = self.changes_since(version=self.changes_base_version)
+        self.changes.clear()
+        self.changes_base_version = changes['version']
+        return changes
+
+    def _store_dict(self, data: object, key: object, **kwarg)->int:
+        self._validate_dict_value(data=data, key=key, **kwarg)
+        return self._set_dict_value(data=data, key=key)
+
+    def add_index(self, name: str, field: object=None, key_function: object=None)->DictSecondaryIndex:
+        """Add a secondary index to a dict container. Existing records are indexed immediately and the index is 
+        maintained by store()
+
+        Changes made directly to ``self.data`` bypass the indexes.
+
+        :param name: str with the index name
+        :param field: object with the record field to index (default=None)
+        :param key_function: callable taking a record and returning the index value (default=None)
+
+        :returns: DictSecondaryIndex
+        """
+        if self.data_type.__name__ != 'dict':
+            raise Exception('Indexes are only supported for the dict data type')
+        if name in self.indexes:
+            raise Exception('Index "{}" already exists'.format(name))
+        index = DictSecondaryIndex(name=name, field=field, key_function=key_function)
+        for key, record in self.data.items():
+            index.update(key=key, record=record)
+        self.indexes[name] = index
+        self.logger.info('Index "{}" added with {} entries'.format(name, index.entries))
+        return index
+
+    def drop_index(self, name: str):
+        if name not in self.indexes:
+            raise Exception('Index "{}" not found'.format(name))
+        del self.indexes[name]
+
+    def _get_index(self, name: str)->DictSecondaryIndex:
+        if name not in self.indexes:
+            raise Exception('Index "{}" not found'.format(name))
+        return self.indexes[name]
+
+    def lookup(self, index_name: str, value: object)->dict:
+        """Returns the records with the index value
+
+        :param index_name: str with the index name
+        :param value: object with the index value to look up
+
+        :returns: dict with the matching keys and records
+        """
+        return {key: self.data[key] for key in self._get_index(name=index_name).lookup(value=value)}
+
+    def lookup_range(self, index_name: str, start: object=None, end: object=None, include_end: bool=True)->dict:
+        """Returns the records with an index value from start up to end, in index value order
+
+        :param index_name: str with the index name
+        :param start: object with the lowest index value to include (default=None, meaning no lower bound)
+        :param end: object with the highest index value (default=None, meaning no upper bound)
+        :param include_end: bool to include records with the index value end (default=True)
+
+        :returns: dict with the matching keys and records
+        """
+        index = self._get_index(name=index_name)
+        return {key: self.data[key] for key in index.lookup_range(start=start, end=end, include_end=include_end)}
+
+    def index_stats(self)->dict:
+        """Returns the entries, distinct values and approximate memory usage (in bytes) of each index
+        """
+        return {
+            name: {'entries': index.entries, 'distinct_values': index.distinct_values, 'memory_usage': index.memory_usage()}
+            for name, index in self.indexes.items()
+        }
+
     def _store_str(self, data: object, key: object=None, **kwarg)->int:
         validated = False
         if self.data_validator is not None:
@@ -176,144 +1130,2634 @@ class GenericDataContainer:
                 raise Exception('Expected a NumberDataValidator')
         return 1
 
+    def _store_bytes(self, data: object, key: object=None, **kwarg)->int:
+        """Stores any object supporting the buffer protocol (bytes, bytearray, memoryview, array.array, etc.) as is - no copy is made
+        """
+        try:
+            size = memoryview(data).nbytes
+        except TypeError:
+            raise Exception('Expecting a bytes-like object but got "{}"'.format(type(data).__name__))
+        if self.data_validator is not None:
+            if not self.data_validator.validate(data=data, **kwarg):
+                raise Exception('Bytes validation failed')
+        self.data = data
+        return size
+
+    def _update_aggregates(self, data: object):
+        if self.data_type.__name__ == 'list':
+            self.aggregates.add(value=data)
+        elif self.data_type.__name__ == 'tuple':
+            for item in self.data:
+                self.aggregates.add(value=item)
+        else:
+            self.aggregates.add(value=self.data)
+
     def store(self, data: object, key: object=None, **kwarg)->int:
+        if self.aggregates is not None:
+            if self.data_type.__name__ == 'list' and not RunningAggregates.is_number(data):
+                raise Exception('Container "{}" maintains aggregates - expected a number but got "{}"'.format(self.result_set_name, type(data).__name__))
+            if self.data_type.__name__ == 'tuple' and isinstance(data, (list, tuple)):
+                for item in data:
+                    if not RunningAggregates.is_number(item):
+                        raise Exception('Container "{}" maintains aggregates - expected only numbers but got "{}"'.format(self.result_set_name, type(item).__name__))
+        result = None
         if self.data_type.__name__ == 'dict':
-            return self._store_dict(data=data, key=key, **kwarg)
+            result = self._store_dict(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'str':
-            return self._store_str(data=data, key=key, **kwarg)
+            result = self._store_str(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'list':
-            return self._store_list(data=data, key=key, **kwarg)
+            result = self._store_list(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'tuple':
-            return self._store_tuple(data=data, key=key, **kwarg)
+            result = self._store_tuple(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'int':
-            return self._store_int(data=data, key=key, **kwarg)
+            result = self._store_int(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'float':
-            return self._store_float(data=data, key=key, **kwarg)
+            result = self._store_float(data=data, key=key, **kwarg)
         elif self.data_type.__name__ == 'Decimal':
-            return self._store_decimal(data=data, key=key, **kwarg)
+            result = self._store_decimal(data=data, key=key, **kwarg)
+        elif self.data_type.__name__ == 'bytes':
+            result = self._store_bytes(data=data, key=key, **kwarg)
+        if self.data_type.__name__ != 'dict':
+            self.version += 1
+        if self.aggregates is not None:
+            self._update_aggregates(data=data)
+        return result
 
 
-class GenericIOProcessor:
-    """A processing Abstract Base Class that can be used to process data post reading/writing
+SHARED_MEMORY_HEADER = struct.Struct('<Qc7x')
+
+_shared_memory_tracker_lock = threading.Lock()
+
+
+def _attach_untracked_shared_memory(name: str)->object:
+    """Attach to an existing shared memory segment without registering it with the resource tracker
+
+    Before Python 3.13 the resource tracker also registers segments that are only attached to, and unlinks them 
+    when the attaching process exits, which would free the segment while the owner still uses it. There is no 
+    ``track`` argument before 3.13, so ``resource_tracker.register`` is replaced for the duration of the attach. The 
+    module function is shared by all threads, so the replacement only skips the segment being attached and passes 
+    every other registration (for example segments created by other threads at the same time) on to the tracker.
     """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    with _shared_memory_tracker_lock:
+        register = resource_tracker.register
 
-    def __init__(self, logger=L):
-        """Initialize the processor
+        def register_other_resources(resource_name: str, resource_type: str):
+            if resource_type == 'shared_memory' and resource_name.lstrip('/') == name.lstrip('/'):
+                return
+            register(resource_name, resource_type)
 
-        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
-        """
-        self.logger = logger
+        resource_tracker.register = register_other_resources
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
 
-    def process(self, data: GenericDataContainer, **kwarg):
-        """Each GenericIO implementation have the option to implement post read/write processing. When this is done, 
-        this method will be called.
 
-        The method will not return any data. If you need to get data from this processing function, a possible solution
-        is to define an in-memory SQLite database, and pass the DB handler and key as keyword parameters to your
-        processor. The caller can then retrieve the result from memory using the key. Example:
+def _attach_shared_memory_container(name: str, writable: bool, result_set_name: str)->'SharedMemoryDataContainer':
+    return SharedMemoryDataContainer.attach(name=name, writable=writable, result_set_name=result_set_name)
 
-        ::
-            import sqlite3
 
-            conn = sqlite3.connect(':memory:')
-            c = conn.cursor()
-            c.execute('''CREATE TABLE store (key TEXT PRIMARY KEY, value TEXT)'''
-            conn.commit()
+class SharedMemoryDataContainer(GenericDataContainer):
+    """A bytes GenericDataContainer holding a typed numeric array in a named shared memory segment
 
-            class MyIOProcessor(GenericIOProcessor):
-                def __init__(self, logger=L):
-                    super().__init__(logger=logger)
-                def process(self, data: GenericDataContainer, **kwarg):
-                       .
-                       .
-                       .
-                    # if 'memory_db_handler' key is present in kwarg, use it to store the result, using the uri of the GenericDataContainer as the in-memory DB key
-                    if 'memory_db_handler' in kwarg:
-                        if kwarg['memory_db_handler'] is not None:
-                            if isinstance(kwarg['memory_db_handler'], sqlite3.Connection):
-                                key = data.uri
-                                c = kwarg['memory_db_handler'].cursor()
-                                c.execute('''INSERT INTO store ( key, value ) VALUES ( ?, ? )''', (data.uri, '{}'.format(True),))
-                                kwarg['memory_db_handler'].commit()
-                        .
-                        .
-                        .
+    The data is a memoryview cast to the array typecode, directly on the shared memory, so other processes can 
+    attach to the segment by name without copying the data. The memoryview is read-only unless the container was 
+    created or attached with ``writable=True``.
 
-            # Do a test:
-            test_data = GenericDataContainer(result_set_name='test1')
-            processor = MyIOProcessor()
-            processor.process(
-                data = GenericDataContainer(),
-                memory_db_handler=conn
-            )
-               .
-               .
-               .
-            # Later...
-            c.execute('''SELECT value FROM store WHERE key = ?''', (test_data.uri, ))
-            print('value={}'.format(c.fetchone()))
+    The process that creates the segment owns it. Every process must call close() when done with its view, and 
+    the owner must call unlink() (after all other processes closed their views) to free the memory. Used as a 
+    context manager, the container is closed on exit and, for the owner, unlinked. 
 
-        :param data: GenericDataContainer containing the data to process
-        :param **kwarg: All additional arguments passed to the GenericIO implementation class will be forwarded to this method
-        """
-        raise Exception('Not yet implemented')
+    When pickled (for example when passed to a process pool) only the segment name is sent, and the receiving 
+    process attaches to the same segment.
 
+    Segment layout: a 16 byte header with the data size (unsigned 64 bit little endian) and the array typecode, 
+    followed by the array data.
 
-class ValidateFileExistIOProcessor(GenericIOProcessor):
-    """The TestFileExistIOProcessor should be used in cases where the existance of a file should be tested for
+    Requires Python 3.8 or later.
     """
-    def __init__(self, logger=L):
+
+    def __init__(self, result_set_name: str='anonymous', data_validator: DataValidator=None, logger=L):
+        """Containers should be created with create() or attach()
+        """
+        if shared_memory is None:
+            raise Exception('Shared memory requires Python 3.8 or later')     # pragma: no cover
+        super().__init__(result_set_name=result_set_name, data_type=bytes, data_validator=data_validator, logger=logger)
+        self.shm = None
+        self.typecode = None
+        self.owner = False
+        self.writable = False
+        self.closed = False
+
+    @classmethod
+    def create(
+        cls,
+        data: object,
+        typecode: str=None,
+        name: str=None,
+        writable: bool=False,
+        result_set_name: str='anonymous',
+        data_validator: DataValidator=None,
+        logger=L
+    )->'SharedMemoryDataContainer':
+        """Create a new shared memory segment and copy the data into it. The calling process becomes the owner
+
+        :param data: array.array, other buffer, or a list of numbers
+        :param typecode: str with the array typecode (default=None, meaning the typecode of an array.array, or 'd' for other data)
+        :param name: str with the segment name (default=None, meaning a random name)
+        :param writable: bool to make the data writable in this process (default=False)
+        :param result_set_name: str with a name for the data (default='anonymous')
+        :param data_validator: DataValidator to validate the data with before it is shared (default=None)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+
+        :returns: SharedMemoryDataContainer
+        """
+        if typecode is None:
+            typecode = 'd'
+            if isinstance(data, array.array):
+                typecode = data.typecode
+        if isinstance(data, (list, tuple)):
+            data = array.array(typecode, data)
+        source = memoryview(data).cast('B')
+        container = cls(result_set_name=result_set_name, data_validator=data_validator, logger=logger)
+        if container.data_validator is not None:
+            if not container.data_validator.validate(data=memoryview(data), **dict()):
+                raise Exception('Bytes validation failed')
+        container.shm = shared_memory.SharedMemory(name=name, create=True, size=SHARED_MEMORY_HEADER.size + max(source.nbytes, 1))
+        SHARED_MEMORY_HEADER.pack_into(container.shm.buf, 0, source.nbytes, typecode.encode('ascii'))
+        container.shm.buf[SHARED_MEMORY_HEADER.size:SHARED_MEMORY_HEADER.size + source.nbytes] = source
+        container.owner = True
+        container._map(typecode=typecode, nbytes=source.nbytes, writable=writable)
+        logger.info('Shared memory segment "{}" created with {} bytes'.format(container.name, source.nbytes))
+        return container
+
+    @classmethod
+    def attach(
+        cls,
+        name: str,
+        writable: bool=False,
+        result_set_name: str='anonymous',
+        logger=L
+    )->'SharedMemoryDataContainer':
+        """Attach to an existing shared memory segment. No data is copied
+
+        :param name: str with the segment name (see the ``name`` property of the creating container)
+        :param writable: bool to make the data writable in this process (default=False)
+        :param result_set_name: str with a name for the data (default='anonymous')
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+
+        :returns: SharedMemoryDataContainer
+        """
+        container = cls(result_set_name=result_set_name, logger=logger)
+        container.shm = _attach_untracked_shared_memory(name=name)
+        nbytes, typecode = SHARED_MEMORY_HEADER.unpack_from(container.shm.buf, 0)
+        container._map(typecode=typecode.decode('ascii'), nbytes=nbytes, writable=writable)
+        logger.info('Attached to shared memory segment "{}" with {} bytes'.format(name, nbytes))
+        return container
+
+    def _map(self, typecode: str, nbytes: int, writable: bool):
+        view = self.shm.buf[SHARED_MEMORY_HEADER.size:SHARED_MEMORY_HEADER.size + nbytes]
+        if writable is False:
+            view = view.toreadonly()
+        self.data = view.cast(typecode)
+        self.typecode = typecode
+        self.writable = writable
+
+    @property
+    def name(self)->str:
+        if self.shm is None:
+            return None
+        return self.shm.name
+
+    def store(self, data: object, key: object=None, **kwarg)->int:
+        """Copy new values into the shared array. The data must have the same number of items and the container must be writable
+
+        :param data: array.array, other buffer, or a list of numbers
+        """
+        if self.writable is False:
+            raise Exception('Shared memory container "{}" is read-only'.format(self.result_set_name))
+        if isinstance(data, (list, tuple)):
+            data = array.array(self.typecode, data)
+        source = memoryview(data).cast('B')
+        if source.nbytes != self.data.nbytes:
+            raise Exception('Expected {} bytes but got {} - the size of a shared memory container can not change'.format(self.data.nbytes, source.nbytes))
+        if self.data_validator is not None:
+            if not self.data_validator.validate(data=memoryview(data), **kwarg):
+                raise Exception('Bytes validation failed')
+        self.data.cast('B')[:] = source
+        return source.nbytes
+
+    def close(self):
+        """Release this process's view of the segment. Views taken from ``data`` must be released first. Closing a 
+        closed container does nothing
+        """
+        if self.shm is None or self.closed is True:
+            return
+        self.data.release()
+        self.data = b''
+        self.shm.close()
+        self.closed = True
+        self.logger.info('Shared memory segment "{}" closed'.format(self.shm.name))
+
+    def unlink(self):
+        """Free the shared memory segment, closing the container first if required. Only the owner can unlink the 
+        segment. Unlinking an unlinked segment does nothing
+        """
+        if self.shm is None:
+            return
+        if self.owner is False:
+            raise Exception('Only the owner of shared memory segment "{}" can unlink it'.format(self.name))
+        self.close()
+        self.shm.unlink()
+        self.logger.info('Shared memory segment "{}" unlinked'.format(self.shm.name))
+        self.shm = None
+        self.owner = False
+
+    def __reduce__(self):
+        return (_attach_shared_memory_container, (self.name, self.writable, self.result_set_name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.owner is True:
+            self.unlink()
+        else:
+            self.close()
+            self.shm = None
+
+
+class ConcurrentDataContainer(GenericDataContainer):
+    """A thread-safe GenericDataContainer
+
+    For the dict data type, stores to the same key are serialized by one of ``lock_stripes`` striped locks, so 
+    validation of different keys can run concurrently, while the dict itself (and its indexes) is only locked for 
+    the short time needed to set the value. For all other data types the whole store() runs under the data lock.
+
+    Readers should use snapshot(), which returns a read-only view of the data that is consistent and safe to iterate 
+    while writers continue. For dict containers the snapshot is copy-on-write: it shares the current dict and the 
+    first store() or delete() after a snapshot replaces the data with a copy (an O(n) copy made under the data lock), 
+    leaving the snapshot unchanged. Lists are copied by snapshot(). Snapshots are shared by all readers until the 
+    next change, so either way a copy is only made once per write burst. Reading ``self.data`` directly is not safe 
+    while other threads store data. 
+    The index methods (add_index(), lookup() and so on) hold the data lock, so they are safe to use while other 
+    threads store data.
+    """
+
+    def __init__(self, lock_stripes: int=16, **kwarg):
+        """Initialize the container. All keyword arguments of GenericDataContainer are supported
+
+        :param lock_stripes: int with the number of striped locks for dict keys (default=16)
+        """
+        if lock_stripes < 1:
+            raise Exception('lock_stripes must be 1 or more')
+        super().__init__(**kwarg)
+        self.lock_stripes = [threading.Lock() for _ in range(lock_stripes)]
+        self.data_lock = threading.Lock()
+        self.snapshot_lock = threading.Lock()
+        self.snapshot_version = None
+        self.cached_snapshot = None
+        self.snapshot_copies = 0
+        self.data_shared = False
+
+    def _unshare_data(self):
+        """Replace the data with a copy when a snapshot still shares it, so the snapshot does not change. The data 
+        lock must be held
+        """
+        if self.data_shared is True:
+            self.data = self.data.copy()
+            self.data_shared = False
+            self.snapshot_copies += 1
+
+    def _store_dict(self, data: object, key: object, **kwarg)->int:
+        with self.lock_stripes[hash(key) % len(self.lock_stripes)]:
+            self._validate_dict_value(data=data, key=key, **kwarg)
+            with self.data_lock:
+                return self._set_dict_value(data=data, key=key)
+
+    def _set_dict_value(self, data: object, key: object)->int:
+        self._unshare_data()
+        return super()._set_dict_value(data=data, key=key)
+
+    def _delete_dict_value(self, key: object)->int:
+        with self.lock_stripes[hash(key) % len(self.lock_stripes)]:
+            with self.data_lock:
+                self._unshare_data()
+                return super()._delete_dict_value(key=key)
+
+    def store(self, data: object, key: object=None, **kwarg)->int:
+        if self.data_type.__name__ == 'dict':
+            return super().store(data=data, key=key, **kwarg)
+        with self.data_lock:
+            return super().store(data=data, key=key, **kwarg)
+
+    def changes_since(self, version: int)->dict:
+        with self.data_lock:
+            return super().changes_since(version=version)
+
+    def drain_changes(self)->dict:
+        with self.data_lock:
+            changes = GenericDataContainer.changes_since(self, version=self.changes_base_version)
+            self.changes.clear()
+            self.changes_base_version = changes['version']
+            return changes
+
+    def add_index(self, name: str, field: object=None, key_function: object=None)->DictSecondaryIndex:
+        with self.data_lock:
+            return super().add_index(name=name, field=field, key_function=key_function)
+
+    def drop_index(self, name: str):
+        with self.data_lock:
+            super().drop_index(name=name)
+
+    def lookup(self, index_name: str, value: object)->dict:
+        with self.data_lock:
+            return super().lookup(index_name=index_name, value=value)
+
+    def lookup_range(self, index_name: str, start: object=None, end: object=None, include_end: bool=True)->dict:
+        with self.data_lock:
+            return super().lookup_range(index_name=index_name, start=start, end=end, include_end=include_end)
+
+    def index_stats(self)->dict:
+        with self.data_lock:
+            return super().index_stats()
+
+    def snapshot(self)->object:
+        """Returns a read-only view of the data: a mapping proxy for dict containers, a tuple for list and tuple 
+        containers, and the value itself for all other data types
+
+        Dicts are not copied: the mapping proxy shares the current dict, which is marked as shared so that the next 
+        change copies it first (see _unshare_data()). Lists are copied with ``tuple()`` without holding the data lock, 
+        so writers are not blocked by the O(n) copy. This relies on ``tuple()`` of a list not running other threads 
+        while it copies (true for CPython's GIL, not guaranteed by the language), so the copy always holds a state 
+        the list was in. Lists that spilled to disk are copied under the data lock.
+        """
+        with self.snapshot_lock:
+            with self.data_lock:
+                version = self.version
+                if self.snapshot_version == version:
+                    return self.cached_snapshot
+                data = self.data
+                if self.data_type.__name__ == 'dict':
+                    self.data_shared = True
+                elif isinstance(data, SpillableList):
+                    data = tuple(data)
+            if self.data_type.__name__ == 'dict':
+                snapshot = types.MappingProxyType(data)
+            elif self.data_type.__name__ in ('list', 'tuple'):
+                snapshot = tuple(data)
+                self.snapshot_copies += 1
+            else:
+                snapshot = data
+            self.cached_snapshot = snapshot
+            self.snapshot_version = version
+            return self.cached_snapshot
+
+    def memory_usage(self, seen: set=None)->int:
+        if seen is None:
+            seen = set()
+        with self.data_lock:
+            size = super().memory_usage(seen=seen)
+        return size + deep_sizeof(self.cached_snapshot, seen=seen)
+
+
+def _data_container_from_object(data: object, result_set_name: str='anonymous', logger=L)->GenericDataContainer:
+    """Wrap a deserialized object in a GenericDataContainer of the matching data type (no validation is done)
+    """
+    data_types = {
+        'str': str,
+        'list': list,
+        'tuple': tuple,
+        'int': int,
+        'float': float,
+        'Decimal': Decimal,
+        'dict': dict,
+        'bytes': bytes,
+        'bytearray': bytes,
+    }
+    if type(data).__name__ not in data_types:
+        raise Exception('Deserialized data type "{}" is not supported by GenericDataContainer'.format(type(data).__name__))
+    container = GenericDataContainer(result_set_name=result_set_name, data_type=data_types[type(data).__name__], logger=logger)
+    container.data = data
+    return container
+
+
+class SerializationCodec:
+    """Base class for codecs converting container data to bytes and back
+
+    Implementations must be registered with register_codec() before they can be selected by name. ``data_types`` 
+    lists the names of the GenericDataContainer data types the codec can write and read back as the same data type. 
+    Containers of other data types are rejected before anything is written.
+    """
+
+    name = None
+    data_types = ('str', 'list', 'int', 'float', 'dict')
+
+    def encode(self, data: object)->bytes:
+        raise Exception('Not yet implemented')
+
+    def decode(self, raw: bytes)->object:
+        raise Exception('Not yet implemented')
+
+
+class JsonCodec(SerializationCodec):
+    """Standard library JSON (always available)
+    """
+
+    name = 'json'
+
+    def encode(self, data: object)->bytes:
+        return json.dumps(data).encode('utf-8')
+
+    def decode(self, raw: bytes)->object:
+        return json.loads(raw.decode('utf-8'))
+
+
+class MarshalCodec(SerializationCodec):
+    """Standard library marshal - a fast binary format for the core Python types (str, int, float, list, tuple, dict, bytes)
+
+    The format may change between Python versions, so only use it for data read back by the same Python version.
+    """
+
+    name = 'marshal'
+    data_types = ('str', 'list', 'tuple', 'int', 'float', 'dict', 'bytes')
+
+    def encode(self, data: object)->bytes:
+        return marshal.dumps(data)
+
+    def decode(self, raw: bytes)->object:
+        return marshal.loads(raw)
+
+
+class OrjsonCodec(SerializationCodec):
+    """JSON using the orjson package (only registered when orjson is installed)
+    """
+
+    name = 'orjson'
+
+    def encode(self, data: object)->bytes:
+        return orjson.dumps(data)
+
+    def decode(self, raw: bytes)->object:
+        return orjson.loads(raw)
+
+
+class UjsonCodec(SerializationCodec):
+    """JSON using the ujson package (only registered when ujson is installed)
+    """
+
+    name = 'ujson'
+
+    def encode(self, data: object)->bytes:
+        return ujson.dumps(data).encode('utf-8')
+
+    def decode(self, raw: bytes)->object:
+        return ujson.loads(raw.decode('utf-8'))
+
+
+class MsgpackCodec(SerializationCodec):
+    """MessagePack using the msgpack package (only registered when msgpack is installed)
+    """
+
+    name = 'msgpack'
+    data_types = ('str', 'list', 'int', 'float', 'dict', 'bytes')
+
+    def encode(self, data: object)->bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, raw: bytes)->object:
+        return msgpack.unpackb(raw, raw=False)
+
+
+SERIALIZATION_CODECS = dict()
+
+
+def register_codec(codec: SerializationCodec):
+    """Make a codec available by name. A codec registered with an existing name replaces the existing codec
+
+    :param codec: SerializationCodec implementation
+    """
+    if not isinstance(codec, SerializationCodec):
+        raise Exception('Expected an implementation of SerializationCodec')
+    if codec.name is None:
+        raise Exception('The codec must have a name')
+    SERIALIZATION_CODECS[codec.name] = codec
+
+
+def get_codec(name: str)->SerializationCodec:
+    if name not in SERIALIZATION_CODECS:
+        raise Exception('Codec "{}" was not found in the current registered codecs: {}'.format(name, tuple(SERIALIZATION_CODECS.keys())))
+    return SERIALIZATION_CODECS[name]
+
+
+def _codec_encode(codec: SerializationCodec, data: object)->bytes:
+    """Encode data with a codec, turning the errors codecs raise for unsupported (nested) values into one clear error
+    """
+    try:
+        return codec.encode(data)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise Exception('Codec "{}" could not encode the data: {}'.format(codec.name, e))
+
+
+register_codec(JsonCodec())
+register_codec(MarshalCodec())
+if orjson is not None:
+    register_codec(OrjsonCodec())
+if ujson is not None:
+    register_codec(UjsonCodec())        # pragma: no cover
+if msgpack is not None:
+    register_codec(MsgpackCodec())      # pragma: no cover
+
+
+SNAPSHOT_MAGIC = b'ODCSNAP1'
+SNAPSHOT_HEADER_LENGTH = struct.Struct('<Q')
+SNAPSHOT_BUFFER_ALIGNMENT = 64
+SNAPSHOT_DATA_TYPES = {
+    'str': str,
+    'list': list,
+    'tuple': tuple,
+    'int': int,
+    'float': float,
+    'Decimal': Decimal,
+    'dict': dict,
+    'bytes': bytes,
+}
+
+
+def _snapshot_align(offset: int)->int:
+    return -(-offset // SNAPSHOT_BUFFER_ALIGNMENT) * SNAPSHOT_BUFFER_ALIGNMENT
+
+
+def save_snapshot(data: GenericDataContainer, path: str, logger=L)->int:
+    """Save a GenericDataContainer, including its data type and data validator reference, as a binary snapshot
+
+    Snapshot layout:
+
+    * 8 bytes magic (``SNAPSHOT_MAGIC``)
+    * the header length (unsigned 64 bit little endian), followed by the JSON header with the container meta data
+    * the pickle (protocol 5) payload
+    * the out-of-band buffers, each aligned to 64 bytes from the (aligned) end of the payload
+
+    The data of bytes containers (including array.array data) and any nested objects supporting out-of-band pickling 
+    (for example bytearray) are written as raw buffers, so load_snapshot() can map them without a copy or parse step.
+
+    The data validator is recorded as a "module:ClassName" reference. load_snapshot() creates a new instance, so any 
+    state of the validator instance is not saved. The snapshot is written atomically.
+
+    Snapshots use pickle protocol 5 and therefore require Python 3.8 or later.
+
+    :param data: GenericDataContainer to save
+    :param path: str with the snapshot file path
+    :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+
+    :returns: int with the size of the snapshot in bytes
+    """
+    if pickle.HIGHEST_PROTOCOL < 5:
+        raise Exception('Snapshots require Python 3.8 or later')     # pragma: no cover
+    if not isinstance(data, GenericDataContainer):
+        raise Exception('Expected a GenericDataContainer')
+    obj = data.data
+    buffer_format = None
+    if data.data_type.__name__ == 'bytes':
+        view = memoryview(obj)
+        buffer_format = view.format
+        obj = pickle.PickleBuffer(view)
+    elif isinstance(obj, SpillableList):
+        obj = list(obj)
+    buffers = list()
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    validator = None
+    if data.data_validator is not None:
+        validator = '{}:{}'.format(data.data_validator.__class__.__module__, data.data_validator.__class__.__qualname__)
+    buffer_offsets = list()
+    offset = 0
+    for buffer in buffers:
+        raw = buffer.raw()
+        buffer_offsets.append([offset, raw.nbytes])
+        offset = _snapshot_align(offset + raw.nbytes)
+    header = json.dumps({
+        'data_type': data.data_type.__name__,
+        'result_set_name': data.result_set_name,
+        'validator': validator,
+        'buffer_format': buffer_format,
+        'payload_length': len(payload),
+        'buffers': buffer_offsets,
+    }).encode('utf-8')
+    folder_path = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder_path, prefix='.{}.'.format(os.path.basename(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(SNAPSHOT_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(payload)
+            position = len(SNAPSHOT_MAGIC) + SNAPSHOT_HEADER_LENGTH.size + len(header) + len(payload)
+            data_start = _snapshot_align(position)
+            for buffer, buffer_offset in zip(buffers, buffer_offsets):
+                f.write(b'\x00' * (data_start + buffer_offset[0] - position))
+                f.write(buffer.raw())
+                position = data_start + buffer_offset[0] + buffer_offset[1]
+        os.chmod(tmp_path, _get_new_file_mode(folder_path=folder_path))
+        os.replace(tmp_path, path)
+    except:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info('Snapshot of "{}" saved to "{}" - {} bytes with {} out-of-band buffers'.format(data.result_set_name, path, position, len(buffers)))
+    return position
+
+
+def load_snapshot(path: str, use_mmap: bool=True, restore_validator: bool=True, logger=L)->GenericDataContainer:
+    """Load a GenericDataContainer from a snapshot saved with save_snapshot()
+
+    With ``use_mmap`` the file is memory mapped and the out-of-band buffers become read-only memoryviews on the 
+    mapping, so large buffers are paged in on demand instead of being copied. The mapping stays open for as long as 
+    any of these views is referenced.
+
+    Snapshots contain a pickle - only load snapshots from trusted sources.
+
+    :param path: str with the snapshot file path
+    :param use_mmap: bool to memory map the file (default=True)
+    :param restore_validator: bool to import and create the recorded data validator (default=True)
+    :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+
+    :returns: GenericDataContainer
+    """
+    if pickle.HIGHEST_PROTOCOL < 5:
+        raise Exception('Snapshots require Python 3.8 or later')     # pragma: no cover
+    with open(path, 'rb') as f:
+        if use_mmap is True:
+            raw = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            raw = f.read()
+    view = memoryview(raw)
+    if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        view.release()
+        raise Exception('File "{}" is not a GenericDataContainer snapshot'.format(path))
+    header_length = SNAPSHOT_HEADER_LENGTH.unpack_from(view, len(SNAPSHOT_MAGIC))[0]
+    position = len(SNAPSHOT_MAGIC) + SNAPSHOT_HEADER_LENGTH.size
+    header = json.loads(bytes(view[position:position + header_length]).decode('utf-8'))
+    position += header_length
+    data_start = _snapshot_align(position + header['payload_length'])
+    buffers = [view[data_start + offset:data_start + offset + length] for offset, length in header['buffers']]
+    payload = view[position:position + header['payload_length']]
+    obj = pickle.loads(payload, buffers=buffers)
+    payload.release()
+    if header['buffer_format'] is not None:
+        obj = memoryview(obj).cast('B').cast(header['buffer_format'])
+    if len(buffers) == 0:
+        view.release()
+        if use_mmap is True:
+            raw.close()
+    if header['data_type'] not in SNAPSHOT_DATA_TYPES:
+        raise Exception('Snapshot data type "{}" is not supported'.format(header['data_type']))
+    data_validator = None
+    if restore_validator is True and header['validator'] is not None:
+        module_name, class_name = header['validator'].split(':', 1)
+        try:
+            validator_class = importlib.import_module(module_name)
+            for name in class_name.split('.'):
+                validator_class = getattr(validator_class, name)
+            data_validator = validator_class(logger=logger)
+        except (ImportError, AttributeError, TypeError):
+            raise Exception('Could not import the snapshot data validator "{}"'.format(header['validator']))
+    container = GenericDataContainer(
+        result_set_name=header['result_set_name'],
+        data_type=SNAPSHOT_DATA_TYPES[header['data_type']],
+        data_validator=data_validator,
+        logger=logger
+    )
+    container.data = obj
+    logger.info('Snapshot of "{}" loaded from "{}"'.format(container.result_set_name, path))
+    return container
+
+
+class GenericIOProcessor:
+    """A processing Abstract Base Class that can be used to process data post reading/writing
+    """
+
+    def __init__(self, logger=L):
+        """Initialize the processor
+
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        self.logger = logger
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        """Each GenericIO implementation have the option to implement post read/write processing. When this is done, 
+        this method will be called.
+
+        The method will not return any data. If you need to get data from this processing function, a possible solution
+        is to define an in-memory SQLite database, and pass the DB handler and key as keyword parameters to your
+        processor. The caller can then retrieve the result from memory using the key. (SqliteKeyValueIO provides a 
+        ready made key/value store that can be used for this purpose.) Example:
+
+        ::
+            import sqlite3
+
+            conn = sqlite3.connect(':memory:')
+            c = conn.cursor()
+            c.execute('''CREATE TABLE store (key TEXT PRIMARY KEY, value TEXT)'''
+            conn.commit()
+
+            class MyIOProcessor(GenericIOProcessor):
+                def __init__(self, logger=L):
+                    super().__init__(logger=logger)
+                def process(self, data: GenericDataContainer, **kwarg):
+                       .
+                       .
+                       .
+                    # if 'memory_db_handler' key is present in kwarg, use it to store the result, using the uri of the GenericDataContainer as the in-memory DB key
+                    if 'memory_db_handler' in kwarg:
+                        if kwarg['memory_db_handler'] is not None:
+                            if isinstance(kwarg['memory_db_handler'], sqlite3.Connection):
+                                key = data.uri
+                                c = kwarg['memory_db_handler'].cursor()
+                                c.execute('''INSERT INTO store ( key, value ) VALUES ( ?, ? )''', (data.uri, '{}'.format(True),))
+                                kwarg['memory_db_handler'].commit()
+                        .
+                        .
+                        .
+
+            # Do a test:
+            test_data = GenericDataContainer(result_set_name='test1')
+            processor = MyIOProcessor()
+            processor.process(
+                data = GenericDataContainer(),
+                memory_db_handler=conn
+            )
+               .
+               .
+               .
+            # Later...
+            c.execute('''SELECT value FROM store WHERE key = ?''', (test_data.uri, ))
+            print('value={}'.format(c.fetchone()))
+
+        :param data: GenericDataContainer containing the data to process
+        :param **kwarg: All additional arguments passed to the GenericIO implementation class will be forwarded to this method
+        """
+        raise Exception('Not yet implemented')
+
+
+class ValidateFileExistIOProcessor(GenericIOProcessor):
+    """The TestFileExistIOProcessor should be used in cases where the existance of a file should be tested for
+    """
+    def __init__(self, logger=L):
+        super().__init__(logger=logger)
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        """This method will take the text string stored in the data container and assume that is a file path
+
+        The existence of the file path will be tested. An exception will be raised if the file path does not exist
+
+        Results will be logged
+
+        :param data: GenericDataContainer storing a string containing a file path
+        """
+        if not isinstance(data, GenericDataContainer):
+            self.logger.error('Cannot validate file - invalid data type. Expected a GenericDataContainer')
+            raise Exception('Expected a GenericDataContainer')
+        if not data.data_type.__name__ == 'str':
+            self.logger.error('Cannot validate file - invalid data type. Expected a GenericDataContainer storing a string value')
+            raise Exception('Expected a string in GenericDataContainer')
+        if not os.path.isfile(data.data):
+            self.logger.error('File "{}" does not seem to exists'.format(data.data))
+            raise Exception('File not found')
+        self.logger.info('File "{}" exists'.format(data.data))
+
+
+class BatchValidateFileExistIOProcessor(GenericIOProcessor):
+    """Tests for the existence of many files at once, listing each directory only once
+
+    Paths are grouped by directory and each directory is listed with ``os.scandir`` (on a thread pool when there 
+    are several directories). Listings are cached for ``cache_ttl`` seconds, so repeated validations against the 
+    same directories are served from memory. Files that are created or removed within the TTL may therefore be 
+    reported with their previous state.
+    """
+
+    def __init__(self, cache_ttl: float=5.0, max_workers: int=8, logger=L):
+        """Initialize the processor
+
+        :param cache_ttl: float with the number of seconds a directory listing is cached (default=5.0, 0 disables the cache)
+        :param max_workers: int with the maximum number of directories listed at the same time (default=8)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
         super().__init__(logger=logger)
+        self.cache_ttl = cache_ttl
+        self.max_workers = max_workers
+        self.listing_cache = dict()
+        self.lock = threading.Lock()
+
+    def _list_directory(self, directory: str)->frozenset:
+        """Returns the names of the files in a directory, or None if the directory could not be listed
+        """
+        now = time.monotonic()
+        with self.lock:
+            if directory in self.listing_cache:
+                listed_at, file_names = self.listing_cache[directory]
+                if now - listed_at < self.cache_ttl:
+                    return file_names
+        try:
+            with os.scandir(directory) as entries:
+                file_names = frozenset(entry.name for entry in entries if entry.is_file())
+        except (FileNotFoundError, NotADirectoryError):
+            file_names = frozenset()
+        except OSError as e:
+            self.logger.warning('Could not list directory "{}" - falling back to checking files one by one: {}'.format(directory, e))
+            return None
+        with self.lock:
+            self.listing_cache[directory] = (now, file_names)
+        return file_names
+
+    def clear_cache(self):
+        """Remove all cached directory listings
+        """
+        with self.lock:
+            self.listing_cache = dict()
+
+    def validate_paths(self, paths: list)->dict:
+        """Test the existence of each path
+
+        :param paths: list of str file paths
+
+        :returns: dict with each path as key and a bool value that is True if the file exists
+        """
+        directories = dict()
+        for path in paths:
+            absolute_path = os.path.abspath(path)
+            directories.setdefault(os.path.dirname(absolute_path), list()).append((path, os.path.basename(absolute_path)))
+        if len(directories) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(directories))) as executor:
+                listings = dict(zip(directories.keys(), executor.map(self._list_directory, directories.keys())))
+        else:
+            listings = {directory: self._list_directory(directory) for directory in directories.keys()}
+        result = dict()
+        for directory, entries in directories.items():
+            file_names = listings[directory]
+            for path, file_name in entries:
+                if file_names is None:
+                    result[path] = os.path.isfile(path)
+                else:
+                    result[path] = file_name in file_names
+        self.logger.info('Validated {} paths in {} directories - {} not found'.format(len(result), len(directories), list(result.values()).count(False)))
+        return result
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        """Test the existence of each file path stored in the data container
+
+        Missing files do not raise an exception. Instead, a dict with each path as key and a bool value that is True 
+        if the file exists is returned. If the keyword argument ``result_generic_data_container`` is set to a 
+        GenericDataContainer with a dict data type, each result is also stored in it.
+
+        :param data: GenericDataContainer storing a string, list or tuple of file paths
+
+        :returns: dict with each path as key and a bool value that is True if the file exists
+        """
+        if not isinstance(data, GenericDataContainer):
+            self.logger.error('Cannot validate files - invalid data type. Expected a GenericDataContainer')
+            raise Exception('Expected a GenericDataContainer')
+        if data.data_type.__name__ == 'str':
+            paths = [data.data]
+        elif data.data_type.__name__ in ('list', 'tuple'):
+            paths = list(data.data)
+        else:
+            self.logger.error('Cannot validate files - invalid data type. Expected a GenericDataContainer storing a string, list or tuple')
+            raise Exception('Expected a string, list or tuple in GenericDataContainer')
+        for path in paths:
+            if not isinstance(path, str):
+                raise Exception('Expected only string file paths, but found "{}"'.format(type(path)))
+        result = self.validate_paths(paths=paths)
+        if 'result_generic_data_container' in kwarg:
+            if isinstance(kwarg['result_generic_data_container'], GenericDataContainer):
+                for path, exists in result.items():
+                    kwarg['result_generic_data_container'].store(data=exists, key=path)
+        return result
+
+
+def _run_pipeline_stage_processor(processor: GenericIOProcessor, data: GenericDataContainer, kwarg: dict)->GenericDataContainer:
+    """Runs a processor in a worker process and returns the (possibly modified) container to the parent process
+    """
+    processor.process(data=data, **kwarg)
+    return data
+
+
+class GenericIOProcessorPipelineStage:
+    """Configuration of one stage of a GenericIOProcessorPipeline
+
+    Executors:
+
+    * ``inline`` - the processor runs on the stage thread, one container at a time
+    * ``thread`` - containers are processed on a thread pool with ``max_workers`` threads
+    * ``process`` - containers are processed on a process pool with ``max_workers`` processes. The processor and 
+      the containers must be picklable and, since the worker gets a copy, the container returned by the worker is 
+      passed on to the next stage
+
+    Containers leave a stage in the order they entered it, regardless of the executor.
+
+    Backpressure policies (applied when the input queue of the stage is full):
+
+    * ``block`` - the upstream stage (or the caller of process()) waits for room in the queue
+    * ``drop`` - the container is dropped and counted in ``dropped``
+
+    Error policies (applied when the processor raises an exception):
+
+    * ``stop`` - the pipeline stops processing and close() raises an exception
+    * ``skip`` - the error is recorded and the container is not passed on
+    * ``continue`` - the error is recorded and the container is still passed on to the next stage
+    """
+
+    def __init__(
+        self,
+        processor: GenericIOProcessor,
+        executor: str=PIPELINE_EXECUTOR_INLINE,
+        max_workers: int=1,
+        queue_size: int=100,
+        backpressure: str=PIPELINE_BACKPRESSURE_BLOCK,
+        error_policy: str=PIPELINE_ERROR_STOP,
+        name: str=None
+    ):
+        """Initialize the stage
+
+        :param processor: GenericIOProcessor to run in this stage
+        :param executor: str with one of the SUPPORTED_PIPELINE_EXECUTORS (default=PIPELINE_EXECUTOR_INLINE)
+        :param max_workers: int with the number of threads or processes for pool executors (default=1)
+        :param queue_size: int with the maximum number of containers waiting in the input queue of the stage (default=100)
+        :param backpressure: str with one of the SUPPORTED_PIPELINE_BACKPRESSURE policies (default=PIPELINE_BACKPRESSURE_BLOCK)
+        :param error_policy: str with one of the SUPPORTED_PIPELINE_ERROR_POLICIES (default=PIPELINE_ERROR_STOP)
+        :param name: str with a name for the stage used in logging and errors (default=None, meaning the processor class name)
+        """
+        if not isinstance(processor, GenericIOProcessor):
+            raise Exception('Expected a GenericIOProcessor')
+        if executor not in SUPPORTED_PIPELINE_EXECUTORS:
+            raise Exception('Unsupported executor "{}". Expected one of {}'.format(executor, SUPPORTED_PIPELINE_EXECUTORS))
+        if backpressure not in SUPPORTED_PIPELINE_BACKPRESSURE:
+            raise Exception('Unsupported backpressure policy "{}". Expected one of {}'.format(backpressure, SUPPORTED_PIPELINE_BACKPRESSURE))
+        if error_policy not in SUPPORTED_PIPELINE_ERROR_POLICIES:
+            raise Exception('Unsupported error policy "{}". Expected one of {}'.format(error_policy, SUPPORTED_PIPELINE_ERROR_POLICIES))
+        if max_workers < 1:
+            raise Exception('max_workers must be at least 1')
+        if queue_size < 1:
+            raise Exception('queue_size must be at least 1')
+        self.processor = processor
+        self.executor = executor
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.error_policy = error_policy
+        self.name = name
+        if name is None:
+            self.name = processor.__class__.__name__
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+
+
+class GenericIOProcessorPipeline(GenericIOProcessor):
+    """Chains GenericIOProcessors, with a bounded queue between stages
+
+    The pipeline is itself a GenericIOProcessor, so it can be passed as the read or write processor of any 
+    GenericIO implementation. process() only queues the container and returns, so the processing overlaps with 
+    the IO of the caller. Call close() (or use the pipeline as a context manager) to wait for all queued containers 
+    to pass through the pipeline. The pipeline starts again on the next call to process().
+
+    Example:
+
+    ::
+
+        pipeline = GenericIOProcessorPipeline(
+            stages=[
+                GenericIOProcessorPipelineStage(processor=ParseProcessor(), executor=PIPELINE_EXECUTOR_PROCESS, max_workers=4),
+                ForwardProcessor(),     # Plain processors run inline
+            ]
+        )
+        with pipeline:
+            for file_name in file_names:
+                TextFileIO(file_folder_path='/data', file_name=file_name).read(read_processor=pipeline)
+    """
+
+    def __init__(self, stages: list, collect_results: bool=False, logger=L):
+        """Initialize the pipeline
+
+        :param stages: list of GenericIOProcessorPipelineStage and/or GenericIOProcessor instances (plain processors run inline)
+        :param collect_results: bool to keep the containers leaving the last stage in ``results`` (default=False)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        super().__init__(logger=logger)
+        if len(stages) == 0:
+            raise Exception('A pipeline needs at least one stage')
+        self.stages = list()
+        for stage in stages:
+            if isinstance(stage, GenericIOProcessorPipelineStage):
+                self.stages.append(stage)
+            else:
+                self.stages.append(GenericIOProcessorPipelineStage(processor=stage))
+        self.collect_results = collect_results
+        self.results = list()
+        self.errors = list()
+        self.lock = threading.Lock()
+        self.error_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.stop_error = None
+        self.queues = list()
+        self.threads = list()
+        self.executors = list()
+        self.running = False
+
+    def start(self):
+        """Start the stage threads and executors. This is done automatically by process()
+        """
+        with self.lock:
+            if self.running is True:
+                return
+            self.queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+            self.threads = list()
+            self.executors = list()
+            for index, stage in enumerate(self.stages):
+                if stage.executor == PIPELINE_EXECUTOR_INLINE:
+                    self.threads.append(threading.Thread(target=self._run_inline_stage, args=(index,), daemon=True))
+                    continue
+                if stage.executor == PIPELINE_EXECUTOR_THREAD:
+                    executor = ThreadPoolExecutor(max_workers=stage.max_workers)
+                else:
+                    executor = ProcessPoolExecutor(max_workers=stage.max_workers)
+                self.executors.append(executor)
+                in_flight = queue.Queue(maxsize=stage.max_workers)
+                self.threads.append(threading.Thread(target=self._run_pool_stage_submit, args=(index, executor, in_flight), daemon=True))
+                self.threads.append(threading.Thread(target=self._run_pool_stage_collect, args=(index, in_flight), daemon=True))
+            for thread in self.threads:
+                thread.start()
+            self.running = True
+            self.logger.info('Pipeline started with {} stages'.format(len(self.stages)))
+
+    def _put(self, index: int, item: tuple):
+        if index >= len(self.stages):
+            if item is not None and self.collect_results is True:
+                self.results.append(item[0])
+            return
+        if item is None:
+            self.queues[index].put(None)
+            return
+        stage = self.stages[index]
+        if stage.backpressure == PIPELINE_BACKPRESSURE_BLOCK:
+            self.queues[index].put(item)
+            return
+        try:
+            self.queues[index].put_nowait(item)
+        except queue.Full:
+            stage.dropped += 1
+            self.logger.warning('Pipeline stage "{}" queue full - container "{}" dropped'.format(stage.name, item[0].result_set_name))
+
+    def _handle_error(self, index: int, item: tuple, error: Exception)->bool:
+        """Records a stage error and returns True if the container must still be passed on
+        """
+        stage = self.stages[index]
+        stage.failed += 1
+        stage_error = (stage.name, item[0], error, ''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+        self.errors.append(stage_error)
+        self.logger.error('Pipeline stage "{}" failed on container "{}": {}'.format(stage.name, item[0].result_set_name, error))
+        if stage.error_policy == PIPELINE_ERROR_STOP:
+            with self.error_lock:
+                if self.stop_error is None:
+                    self.stop_error = stage_error
+            self.stop_event.set()
+            return False
+        return stage.error_policy == PIPELINE_ERROR_CONTINUE
+
+    def _run_inline_stage(self, index: int):
+        stage = self.stages[index]
+        while True:
+            item = self.queues[index].get()
+            if item is None:
+                self._put(index + 1, None)
+                return
+            if self.stop_event.is_set():
+                continue
+            try:
+                stage.processor.process(data=item[0], **item[1])
+                stage.processed += 1
+            except Exception as e:
+                if self._handle_error(index=index, item=item, error=e) is False:
+                    continue
+            self._put(index + 1, item)
+
+    def _run_pool_stage_submit(self, index: int, executor: object, in_flight: queue.Queue):
+        stage = self.stages[index]
+        while True:
+            item = self.queues[index].get()
+            if item is None:
+                in_flight.put(None)
+                return
+            if self.stop_event.is_set():
+                continue
+            if stage.executor == PIPELINE_EXECUTOR_PROCESS:
+                future = executor.submit(_run_pipeline_stage_processor, stage.processor, item[0], item[1])
+            else:
+                future = executor.submit(stage.processor.process, data=item[0], **item[1])
+            in_flight.put((future, item))
+
+    def _run_pool_stage_collect(self, index: int, in_flight: queue.Queue):
+        stage = self.stages[index]
+        while True:
+            entry = in_flight.get()
+            if entry is None:
+                self._put(index + 1, None)
+                return
+            future, item = entry
+            try:
+                result = future.result()
+                stage.processed += 1
+                if stage.executor == PIPELINE_EXECUTOR_PROCESS:
+                    item = (result, item[1])
+            except Exception as e:
+                if self._handle_error(index=index, item=item, error=e) is False:
+                    continue
+            if self.stop_event.is_set():
+                continue
+            self._put(index + 1, item)
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        """Queue a container for processing by all the stages of the pipeline. All keyword arguments are passed on to 
+        the processor of each stage
+
+        :param data: GenericDataContainer to process
+        """
+        if self.stop_event.is_set():
+            raise Exception('Pipeline stopped after a stage error - call close() to get the error details')
+        self.start()
+        self._put(0, (data, kwarg))
+
+    def close(self, raise_errors: bool=True):
+        """Wait for all queued containers to pass through the pipeline and stop the stage threads and executors
+
+        :param raise_errors: bool to raise an exception if a stage with the PIPELINE_ERROR_STOP policy failed (default=True)
+        """
+        with self.lock:
+            if self.running is False:
+                return
+            self.queues[0].put(None)
+            for thread in self.threads:
+                thread.join()
+            for executor in self.executors:
+                executor.shutdown(wait=True)
+            self.running = False
+        self.logger.info('Pipeline closed - {} errors'.format(len(self.errors)))
+        if self.stop_error is not None:
+            stage_name, data, error, error_traceback = self.stop_error
+            self.stop_error = None
+            self.stop_event.clear()
+            if raise_errors is True:
+                raise Exception('Pipeline stage "{}" failed on container "{}": {}\n{}'.format(stage_name, data.result_set_name, error, error_traceback))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close(raise_errors=exc_type is None)
+
+
+_process_pool_processor = None
+
+
+def _init_process_pool_worker(processor: GenericIOProcessor):
+    """Keeps the processor in each worker process, so it is only pickled once per worker and not once per chunk
+    """
+    global _process_pool_processor
+    _process_pool_processor = processor
+
+
+def _run_process_pool_chunk(chunk: list, kwarg: dict)->list:
+    """Runs the worker's processor over a chunk of (index, GenericDataContainer) pairs
+
+    Exceptions are caught per container and returned with their formatted traceback, since traceback objects can 
+    not be sent back to the parent process.
+    """
+    results = list()
+    for index, data in chunk:
+        try:
+            _process_pool_processor.process(data=data, **kwarg)
+            results.append((index, data, None, None))
+        except Exception as e:
+            error_traceback = traceback.format_exc()
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = Exception(repr(e))
+            results.append((index, data, e, error_traceback))
+    return results
+
+
+class ProcessorResult:
+    """The result of running a processor over one container in a GenericIOProcessorProcessPool
+    """
+
+    def __init__(self, index: int, data: GenericDataContainer=None, error: Exception=None, error_traceback: str=None):
+        self.index = index
+        self.data = data
+        self.error = error
+        self.error_traceback = error_traceback
+        self.is_error = error is not None
+
+
+class GenericIOProcessorProcessPool:
+    """Runs a GenericIOProcessor over many containers on a process pool, so CPU heavy processing can use all cores
+
+    The processor is sent to each worker process once, when the worker starts. Containers are sent in chunks to 
+    keep the per task overhead low. Each worker processes a copy of the container, so the processed copy is returned 
+    in the ProcessorResult - the original container is not modified. Containers holding a memoryview (for example 
+    from BinaryFileIO) are sent with a copy of the viewed bytes, except SharedMemoryDataContainer instances, which 
+    the workers attach to by name.
+
+    The processor and the containers (including their validators) must be picklable and the processor class must be 
+    importable by the worker processes.
+    """
+
+    def __init__(self, processor: GenericIOProcessor, max_workers: int=None, chunk_size: int=None, logger=L):
+        """Initialize the pool. The worker processes are started on the first call to map()
+
+        :param processor: GenericIOProcessor to run
+        :param max_workers: int with the number of worker processes (default=None, meaning the number of CPUs)
+        :param chunk_size: int with the number of containers per task (default=None, meaning about four chunks per worker)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        if not isinstance(processor, GenericIOProcessor):
+            raise Exception('Expected a GenericIOProcessor')
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise Exception('max_workers must be 1 or more')
+        if chunk_size is not None and chunk_size < 1:
+            raise Exception('chunk_size must be 1 or more')
+        self.processor = processor
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.logger = logger
+        self.executor = None
+
+    def _get_executor(self)->ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_process_pool_worker,
+                initargs=(self.processor,)
+            )
+        return self.executor
+
+    def _prepare(self, data: GenericDataContainer)->GenericDataContainer:
+        if not isinstance(data, GenericDataContainer):
+            raise Exception('Expected a GenericDataContainer')
+        if isinstance(data.data, memoryview) and not isinstance(data, SharedMemoryDataContainer):
+            data = copy.copy(data)
+            data.data = data.data.tobytes()
+        return data
+
+    def map(self, containers: list, ordered: bool=True, raise_errors: bool=True, **kwarg):
+        """Process the containers and yield a ProcessorResult per container
+
+        :param containers: list (or other iterable) of GenericDataContainer instances
+        :param ordered: bool to yield the results in the order of the containers. When False, the results of each chunk are yielded as soon as the chunk completes (default=True)
+        :param raise_errors: bool to raise an exception, including the worker traceback, on the first failed container. When False, failures are yielded as ProcessorResult instances with is_error set (default=True)
+        :param **kwarg: passed on to the processor
+
+        :returns: generator of ProcessorResult
+        """
+        items = [(index, self._prepare(data=data)) for index, data in enumerate(containers)]
+        if len(items) == 0:
+            return
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(items) // (self.max_workers * 4)))
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_run_process_pool_chunk, items[start:start + chunk_size], kwarg)
+            for start in range(0, len(items), chunk_size)
+        ]
+        self.logger.info('Processing {} containers in {} chunks on {} processes'.format(len(items), len(futures), self.max_workers))
+        try:
+            completed = futures
+            if ordered is False:
+                completed = as_completed(futures)
+            for future in completed:
+                for index, data, error, error_traceback in future.result():
+                    if error is not None and raise_errors is True:
+                        raise Exception('Processor failed on container {} "{}": {}\n{}'.format(index, data.result_set_name, error, error_traceback))
+                    yield ProcessorResult(index=index, data=data, error=error, error_traceback=error_traceback)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        """Stop the worker processes
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+
+class GenericIO:
+
+    def __init__(self, uri: str, logger=L):
+        self.uri = uri
+        self.logger = logger
+
+    def data_processing(self, data: GenericDataContainer, processor: GenericIOProcessor, **kwarg):
+        if processor is not None:
+            if isinstance(processor, GenericIOProcessor):
+                self.logger.info('Running processor')
+                self.logger.debug('kwarg={}'.format(kwarg))
+                processor.process(data=data, **kwarg)
+            else:
+                self.logger.error('Skipping processor - wrong type. Expected a GenericIOProcessor')
+
+    def read(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
+        raise Exception('Not yet implemented')
+
+    def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        raise Exception('Not yet implemented')
+
+    async def aread(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
+        """Async version of read(). The blocking read runs on the async IO thread pool (see configure_async_io())
+
+        Cancelling the awaiting task will prevent the read if it has not yet started. A read already in progress 
+        can not be interrupted, but its result will be discarded.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_async_io_executor(),
+            functools.partial(self.read, read_processor=read_processor, **kwarg)
+        )
+
+    async def awrite(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        """Async version of write(). The blocking write runs on the async IO thread pool (see configure_async_io())
+
+        Cancelling the awaiting task will prevent the write if it has not yet started. A write already in progress 
+        will complete.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_async_io_executor(),
+            functools.partial(self.write, data=data, write_processor=write_processor, **kwarg)
+        )
+
+
+_write_behind_buffers = weakref.WeakSet()
+
+
+def _flush_write_behind_buffers():
+    for write_behind_buffer in list(_write_behind_buffers):
+        write_behind_buffer.flush(raise_errors=False)
+
+
+atexit.register(_flush_write_behind_buffers)
+
+
+class WriteBehindBuffer:
+    """Buffers writes in memory and writes them out later, keeping only the latest value per uri
+
+    Pending writes are flushed every ``flush_interval`` seconds (counted from the first write after the last flush), 
+    when ``flush()`` is called explicitly and when the interpreter exits (buffers that are still referenced at that 
+    point). A write that fails during a flush stays pending, unless a newer value for the same uri arrived meanwhile.
+
+    Only a reference to the GenericDataContainer is kept, so changes made to the container after it was passed to 
+    ``write()`` will also be written when the buffer is flushed.
+    """
+
+    def __init__(self, flush_interval: float=1.0, logger=L):
+        """Initialize the buffer
+
+        :param flush_interval: float with the maximum number of seconds a write stays pending. Set to 0 to only flush explicitly (or on exit)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        self.flush_interval = flush_interval
+        self.pending = dict()
+        self.coalesced_writes = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.timer = None
+        self.logger = logger
+        _write_behind_buffers.add(self)
+
+    def _start_timer(self):
+        if self.timer is None and self.flush_interval > 0:
+            self.timer = threading.Timer(self.flush_interval, self._timed_flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def put(self, io: object, data: object, write_processor: object=None, **kwarg):
+        """Add a pending write. Any pending write for the same uri is replaced
+
+        :param io: GenericIO implementation with a write_now() method that will do the actual write
+        :param data: GenericDataContainer to write
+        :param write_processor: GenericIOProcessor to run after the data was written
+        """
+        with self.lock:
+            if io.uri in self.pending:
+                self.coalesced_writes = self.coalesced_writes + 1
+            self.pending[io.uri] = (io, data, write_processor, kwarg)
+            self._start_timer()
+
+    def get(self, uri: str)->object:
+        """Get the pending GenericDataContainer for a uri
+
+        :returns: GenericDataContainer or None if there is no pending write for the uri
+        """
+        with self.lock:
+            if uri in self.pending:
+                return self.pending[uri][1]
+        return None
+
+    def _timed_flush(self):
+        with self.lock:
+            self.timer = None
+        self.flush(raise_errors=False)
+
+    def flush(self, uri: str=None, raise_errors: bool=True):
+        """Write out pending data
+
+        Entries stay pending until they were written, so reads through the GenericIO still see the pending value 
+        while the flush is in progress. An entry is only removed when no newer value replaced it during the write.
+
+        :param uri: str to only flush the pending write of one uri. When None, all pending writes are flushed (default=None)
+        :param raise_errors: bool when True the first write error will be raised after all pending writes were attempted. When False errors are only logged (default=True)
+        """
+        with self.flush_lock:
+            with self.lock:
+                if uri is None:
+                    entries = list(self.pending.values())
+                elif uri in self.pending:
+                    entries = [self.pending[uri]]
+                else:
+                    entries = list()
+            first_exception = None
+            for entry in entries:
+                io, data, write_processor, kwarg = entry
+                try:
+                    io.write_now(data=data, write_processor=write_processor, **kwarg)
+                    with self.lock:
+                        if self.pending.get(io.uri) is entry:
+                            del self.pending[io.uri]
+                except Exception as e:
+                    self.logger.error('Write-behind flush for "{}" failed: {}'.format(io.uri, traceback.format_exc()))
+                    with self.lock:
+                        self._start_timer()
+                    if first_exception is None:
+                        first_exception = e
+            if len(entries) > 0:
+                self.logger.debug('{} pending writes flushed'.format(len(entries)))
+            if first_exception is not None and raise_errors is True:
+                raise first_exception
+
+
+class LineOffsetIndex:
+    """An index of the byte offset at which each line of a (large) text file starts
+
+    The index is built by streaming the file in chunks and stored in a compact ``array``, optionally persisted in a 
+    sidecar file (``<file>.lineidx``). The file's size, modification time and inode are recorded with the index - 
+    when any of them change the index is rebuilt. Line numbers start at 0.
+    """
+
+    def __init__(self, path: str, use_sidecar: bool=True, chunk_size: int=1048576, logger=L):
+        """Initialize the index (it is only built or loaded on first use)
+
+        :param path: str with the text file path
+        :param use_sidecar: bool to persist the index in a sidecar file (default=True)
+        :param chunk_size: int with the number of bytes read at a time while building the index (default=1048576)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        self.path = path
+        self.index_uri = '{}.lineidx'.format(path)
+        self.use_sidecar = use_sidecar
+        self.chunk_size = chunk_size
+        self.offsets = array.array('Q')
+        self.stat_key = None
+        self.logger = logger
+
+    def _current_stat_key(self)->list:
+        file_stat = os.stat(self.path)
+        return [file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino]
+
+    def is_valid(self)->bool:
+        return self.stat_key is not None and self.stat_key == self._current_stat_key()
+
+    def build(self):
+        """Build the index by streaming the file, then save it to the sidecar file (if enabled)
+        """
+        stat_key = self._current_stat_key()
+        offsets = array.array('Q')
+        position = 0
+        with open(self.path, 'rb') as f:
+            chunk = f.read(self.chunk_size)
+            if len(chunk) > 0:
+                offsets.append(0)
+            while len(chunk) > 0:
+                newline = chunk.find(b'\n')
+                while newline != -1:
+                    offsets.append(position + newline + 1)
+                    newline = chunk.find(b'\n', newline + 1)
+                position = position + len(chunk)
+                chunk = f.read(self.chunk_size)
+        if len(offsets) > 0 and offsets[-1] == position:
+            offsets.pop()
+        self.offsets = offsets
+        self.stat_key = stat_key
+        self.logger.info('Line index for "{}" built - {} lines'.format(self.path, len(offsets)))
+        if self.use_sidecar is True:
+            self.save()
+
+    def save(self):
+        """Save the index to the sidecar file. When the sidecar can not be written (for example in a read-only folder), 
+        a warning is logged and only the in-memory index is used
+        """
+        header = json.dumps({'stat': self.stat_key, 'count': len(self.offsets), 'itemsize': self.offsets.itemsize, 'byteorder': sys.byteorder})
+        tmp_path = '{}.tmp'.format(self.index_uri)
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write('{}\n'.format(header).encode('utf-8'))
+                self.offsets.tofile(f)
+            os.replace(tmp_path, self.index_uri)
+        except OSError:
+            self.logger.warning('Could not save line index "{}" - keeping the index in memory only'.format(self.index_uri))
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self)->bool:
+        """Load the index from the sidecar file
+
+        :returns: bool with True if the sidecar existed and is still valid for the file
+        """
+        if not os.path.isfile(self.index_uri):
+            return False
+        try:
+            with open(self.index_uri, 'rb') as f:
+                header = json.loads(f.readline().decode('utf-8'))
+                if header['stat'] != self._current_stat_key():
+                    return False
+                offsets = array.array('Q')
+                if header['itemsize'] != offsets.itemsize or header['byteorder'] != sys.byteorder:
+                    return False
+                offsets.fromfile(f, header['count'])
+        except (OSError, ValueError, KeyError, TypeError, EOFError):
+            self.logger.warning('Could not load line index "{}" - ignoring'.format(self.index_uri))
+            return False
+        self.offsets = offsets
+        self.stat_key = header['stat']
+        return True
+
+    def ensure(self):
+        """Make sure the index is valid for the current file, loading or rebuilding it when required
+        """
+        if self.is_valid():
+            return
+        if self.use_sidecar is True and self.load():
+            return
+        self.build()
+
+    def line_count(self)->int:
+        self.ensure()
+        return len(self.offsets)
+
+    def read_lines(self, start: int, end: int=None)->str:
+        """Read a range of lines with a single seek
+
+        :param start: int with the first line number to read
+        :param end: int with the line number to stop at (exclusive) (default=None, meaning only read line ``start``)
+
+        :returns: str with the lines, including line endings
+        """
+        self.ensure()
+        if end is None:
+            end = start + 1
+        end = min(end, len(self.offsets))
+        if start < 0 or start >= len(self.offsets):
+            raise Exception('Line {} is out of range - the file has {} lines'.format(start, len(self.offsets)))
+        if end <= start:
+            return ''
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[start])
+            if end < len(self.offsets):
+                raw = f.read(self.offsets[end] - self.offsets[start])
+            else:
+                raw = f.read()
+        return raw.decode('utf-8')
+
+
+class TextFileIO(GenericIO):
+
+    def __init__(
+        self,
+        file_folder_path: str,
+        file_name: str,
+        cache_max_age: int=900,
+        enable_cache: bool=False,
+        write_mode: str=WRITE_MODE_OVERWRITE,
+        fsync: bool=False,
+        fsync_batch_size: int=1,
+        write_behind_buffer: WriteBehindBuffer=None,
+        skip_unchanged: bool=False,
+        fingerprint_sidecar: bool=False,
+        codec: str=None,
+        compression: str=None,
+        compression_level: int=None,
+        read_magic_bytes: bool=False,
+        logger=L
+    ):
+        """Text file IO
+
+        Writes can be done in one of the following modes:
+
+        * ``WRITE_MODE_OVERWRITE`` - (default) the file is truncated and written in place
+        * ``WRITE_MODE_ATOMIC`` - the data is written to a temporary file in the same folder which then replaces the target file. Readers will either see the old or the new file, never a partially written one
+        * ``WRITE_MODE_APPEND`` - the data is appended to the end of the file
+
+        When ``fsync`` is True, the file (and, for new or replaced files, the folder) is flushed to stable storage. With
+        ``fsync_batch_size`` greater than 1, the flushes are grouped and only done on every n-th write (or when
+        ``sync()`` is called), trading the durability of the last few writes for write throughput. In atomic mode the 
+        temporary file is always flushed before it replaces the target file, so only the folder flushes are grouped.
+
+        When a ``write_behind_buffer`` is supplied, writes are only buffered and done later by the WriteBehindBuffer. 
+        Successive writes are coalesced so that only the latest value is written. Reads through this instance will 
+        return the pending value, if there is one.
+
+        When ``skip_unchanged`` is True, a fingerprint (BLAKE2b digest) of the serialized data is compared with the 
+        fingerprint of the last write and the write is skipped when nothing changed and the file was not modified 
+        since. The fingerprint is kept in memory and, with ``fingerprint_sidecar`` set, also in a file next to the 
+        target file (``<file_name>.fingerprint``) so that it survives restarts. Fingerprinting is not used in 
+        ``WRITE_MODE_APPEND``. The ``bytes_written``, ``bytes_skipped`` and ``writes_skipped`` counters track the effect.
+
+        By default data is written as text (JSON for dict values) and read back as a string. When a ``codec`` is 
+        selected (see SERIALIZATION_CODECS), data is written with the codec and read back into a GenericDataContainer 
+        of the same data type as was written. Containers with a data type the codec can not round trip (see 
+        SerializationCodec.data_types) are rejected with an exception.
+
+        Files can be transparently compressed with gzip, bz2 or lzma. By default, the compression is detected from 
+        the file extension (see COMPRESSION_EXTENSIONS). With ``read_magic_bytes`` set, the first bytes of an existing 
+        file are used instead, for files without a telling extension. A file that looks compressed but can not be 
+        decompressed is then read as plain text. Set ``compression`` to force a compression type, or to 
+        COMPRESSION_NONE to disable compression.
+
+        :param file_folder_path: str with the folder containing the file
+        :param file_name: str with the file name
+        :param cache_max_age: int with the cache max age in seconds (default=900)
+        :param enable_cache: bool to enable caching of data read or written (default=False)
+        :param write_mode: str with one of SUPPORTED_WRITE_MODES (default=WRITE_MODE_OVERWRITE)
+        :param fsync: bool to flush written data to stable storage (default=False)
+        :param fsync_batch_size: int with the number of writes grouped together per flush (default=1)
+        :param write_behind_buffer: WriteBehindBuffer to defer writes to (default=None, meaning writes are done immediately)
+        :param skip_unchanged: bool to skip writes of data identical to the data last written (default=False)
+        :param fingerprint_sidecar: bool to persist the fingerprint of the last write in a sidecar file (default=False)
+        :param codec: str with the name of a registered SerializationCodec (default=None, meaning plain text)
+        :param compression: str with one of SUPPORTED_COMPRESSION (default=None, meaning detect)
+        :param compression_level: int with the compression level (gzip/bz2: 1-9, lzma: 0-9) (default=None, meaning the library default)
+        :param read_magic_bytes: bool to detect the compression from the file content instead of the file extension (default=False)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        # TODO: check that folder exists...
+        if write_mode not in SUPPORTED_WRITE_MODES:
+            raise Exception('Write mode "{}" was not found in the current supported modes: {}'.format(write_mode, SUPPORTED_WRITE_MODES))
+        if fsync_batch_size < 1:
+            raise Exception('fsync_batch_size must be 1 or more')
+        if compression is not None and compression not in SUPPORTED_COMPRESSION:
+            raise Exception('Compression "{}" was not found in the current supported compression types: {}'.format(compression, SUPPORTED_COMPRESSION))
+        self.cached_data = None
+        self.cached_data_timestamp = 0
+        self._cached_data_size = None
+        self.cache_max_age = cache_max_age
+        self.enable_cache = enable_cache
+        self.file_folder_path = file_folder_path
+        self.file_name = file_name
+        self.write_mode = write_mode
+        self.fsync = fsync
+        self.fsync_batch_size = fsync_batch_size
+        self.unsynced_writes = 0
+        self.unsynced_directory = False
+        self.write_behind_buffer = write_behind_buffer
+        self.skip_unchanged = skip_unchanged
+        self.fingerprint_sidecar = fingerprint_sidecar
+        self.fingerprint = None
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.writes_skipped = 0
+        self.codec = None
+        if codec is not None:
+            self.codec = get_codec(name=codec)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.read_magic_bytes = read_magic_bytes
+        self.line_index = None
+        self.follow_file = None
+        self.follow_inode = None
+        self.follow_offset = 0
+        self.follow_decoder = None
+        self.rotations_detected = 0
+        self.truncations_detected = 0
+        super().__init__(
+            uri='{}{}{}'.format(
+                file_folder_path,
+                os.sep,
+                file_name
+            ),
+            logger=logger
+        )
+        self.fingerprint_uri = '{}.fingerprint'.format(self.uri)
+
+    def read_from_cache(self, **kwarg)->str:
+        if self.enable_cache is True:
+            now = get_utc_timestamp()
+            if 'force' not in kwarg:
+                if self.cached_data is not None and (now - self.cached_data_timestamp) < self.cache_max_age:
+                    self.logger.info('Returning cached value')
+                    return self.cached_data
+            else:
+                self.logger.info('Cache reset forced.')
+            self.clear_cache()
+        return None
+
+    @property
+    def cached_data_size(self)->int:
+        """The estimated size of the cached data in bytes, estimated on first use after each cache update
+        """
+        cached_data = self.cached_data
+        if cached_data is None:
+            return 0
+        cached_data_size = self._cached_data_size
+        if cached_data_size is None or cached_data_size[0] is not cached_data:
+            cached_data_size = (cached_data, deep_sizeof(cached_data))
+            self._cached_data_size = cached_data_size
+        return cached_data_size[1]
+
+    def clear_cache(self):
+        self.cached_data = None
+        self.cached_data_timestamp = 0
+        self._cached_data_size = None
+
+    def update_cache(self, data: GenericDataContainer, **kwarg):
+        if self.enable_cache is True:
+            self._cached_data_size = None
+            self.cached_data = data
+            self.cached_data_timestamp = get_utc_timestamp()
+            self.logger.info('Cache updated')
+            MEMORY_REGISTRY.register_cache(self)
+            if MEMORY_REGISTRY.cache_budget_bytes is not None:
+                MEMORY_REGISTRY.check_cache_budget()
+
+    def read_compression(self)->str:
+        if self.compression is not None:
+            return self.compression
+        return detect_compression(path=self.uri, read_magic_bytes=self.read_magic_bytes)
+
+    def write_compression(self)->str:
+        if self.compression is not None:
+            return self.compression
+        return detect_compression(path=self.uri, read_magic_bytes=self.read_magic_bytes and self.write_mode == WRITE_MODE_APPEND)
+
+    def read(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
+        """Read text data from a file
+
+        :param read_processor: GenericIOProcessor that is not used in this function - whatever is supplied here will be ignored (for now)
+        :param force: bool which is an optional argument. If the keyword is present, any cached data will be ignored (cache will be cleared as well)
+
+        :returns: GenericDataContainer
+        """
+        if self.write_behind_buffer is not None:
+            data = self.write_behind_buffer.get(uri=self.uri)
+            if data is not None:
+                self.logger.info('Returning pending write-behind value')
+                return data
+        data = self.read_from_cache(**kwarg)
+        if data is not None:
+            return data
+        compression = self.read_compression()
+        try:
+            data = self._read_file(compression=compression)
+        except (OSError, EOFError, lzma.LZMAError):
+            if self.compression is not None or compression == detect_compression(path=self.uri):
+                raise
+            self.logger.warning('File "{}" looked {} compressed but could not be decompressed - reading it as plain text'.format(self.uri, compression))
+            data = self._read_file(compression=COMPRESSION_NONE)
+        self.update_cache(data=data, **kwarg)
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def _read_file(self, compression: str)->GenericDataContainer:
+        if self.codec is not None:
+            with _open_file(path=self.uri, mode='rb', compression=compression) as f:
+                raw = f.read()
+            data = _data_container_from_object(data=self.codec.decode(raw), result_set_name=self.uri, logger=self.logger)
+            self.logger.info('{} bytes read.'.format(len(raw)))
+            return data
+        data = GenericDataContainer(result_set_name=self.uri, data_type=str)
+        data_str = ''
+        lines = list()
+        with _open_file(path=self.uri, mode='r', compression=compression) as f:
+            lines = f.readlines()
+        if len(lines) > 1:
+            data_str = ''.join(lines)
+        elif len(lines) == 1:
+            data_str = lines[0]
+        else:
+            data_str = ''
+        data.store(data=data_str)
+        self.logger.info('{} bytes read.'.format(len(data_str)))
+        return data
+
+    def read_lines(self, start: int, end: int=None, read_processor: GenericIOProcessor=None, use_sidecar: bool=True, **kwarg)->GenericDataContainer:
+        """Read a range of lines using a line offset index, without reading the rest of the file
+
+        The index is built (by streaming the file) on first use, persisted in a sidecar file (unless ``use_sidecar`` is 
+        False) and rebuilt when the file changes. Only uncompressed files are supported. The cache is not used.
+
+        :param start: int with the first line number to read (line numbers start at 0)
+        :param end: int with the line number to stop at (exclusive) (default=None, meaning only read line ``start``)
+        :param read_processor: GenericIOProcessor to run after the lines were read
+        :param use_sidecar: bool to persist the line index in a sidecar file next to the file (default=True)
+
+        :returns: GenericDataContainer with the lines as a string
+        """
+        if self.read_compression() != COMPRESSION_NONE:
+            raise Exception('Line ranges can not be read from compressed files')
+        if self.line_index is None:
+            self.line_index = LineOffsetIndex(path=self.uri, use_sidecar=use_sidecar, logger=self.logger)
+        self.line_index.use_sidecar = use_sidecar
+        data = GenericDataContainer(result_set_name=self.uri, data_type=str)
+        data.store(data=self.line_index.read_lines(start=start, end=end))
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def _open_follow_file(self, from_end: bool=False):
+        try:
+            self.follow_file = open(self.uri, 'rb')
+        except FileNotFoundError:
+            self.follow_file = None
+            return
+        self.follow_inode = os.fstat(self.follow_file.fileno()).st_ino
+        self.follow_offset = 0
+        if from_end is True:
+            self.follow_offset = self.follow_file.seek(0, os.SEEK_END)
+
+    def read_new(self, read_processor: GenericIOProcessor=None, from_end: bool=False, **kwarg)->GenericDataContainer:
+        """Read only the data appended to the file since the previous call
+
+        The file is kept open between calls, so each call costs only as much as the new data. When the file was 
+        rotated (the path now refers to a different file), the rest of the old file is read before following the 
+        new file from the start. When the file was truncated, it is followed from the start again. Only uncompressed 
+        files are supported. The cache is not used.
+
+        :param read_processor: GenericIOProcessor to run on the new data (only called when there is new data)
+        :param from_end: bool to skip the existing content when the file is opened for the first time (default=False)
+
+        :returns: GenericDataContainer with the new data as a string (an empty string if there is no new data)
+        """
+        if self.follow_decoder is None:
+            if os.path.isfile(self.uri) and self.read_compression() != COMPRESSION_NONE:
+                raise Exception('Compressed files can not be followed')
+            self.follow_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            self._open_follow_file(from_end=from_end)
+        elif self.follow_file is None:
+            self._open_follow_file()
+        chunks = list()
+        if self.follow_file is not None:
+            try:
+                current_stat = os.stat(self.uri)
+            except FileNotFoundError:
+                current_stat = None
+            if current_stat is None or current_stat.st_ino != self.follow_inode:
+                self.logger.info('File "{}" was rotated'.format(self.uri))
+                self.rotations_detected = self.rotations_detected + 1
+                chunks.append(self.follow_file.read())
+                self.follow_file.close()
+                self._open_follow_file()
+            elif current_stat.st_size < self.follow_offset:
+                self.logger.info('File "{}" was truncated'.format(self.uri))
+                self.truncations_detected = self.truncations_detected + 1
+                self.follow_file.seek(0)
+                self.follow_offset = 0
+        if self.follow_file is not None:
+            raw = self.follow_file.read()
+            self.follow_offset = self.follow_offset + len(raw)
+            chunks.append(raw)
+        data_str = self.follow_decoder.decode(b''.join(chunks))
+        data = GenericDataContainer(result_set_name=self.uri, data_type=str)
+        data.store(data=data_str)
+        if len(data_str) > 0:
+            self.logger.debug('{} new characters read.'.format(len(data_str)))
+            self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def follow(self, poll_interval: float=1.0, read_processor: GenericIOProcessor=None, from_end: bool=False, stop_event: threading.Event=None, **kwarg):
+        """Generator yielding a GenericDataContainer each time new data was appended to the file (see read_new())
+
+        :param poll_interval: float with the number of seconds to wait when there is no new data (default=1.0)
+        :param read_processor: GenericIOProcessor to run on each chunk of new data
+        :param from_end: bool to skip the existing content when the file is opened for the first time (default=False)
+        :param stop_event: threading.Event that stops the generator when set (default=None, meaning follow until the generator is closed)
+        """
+        while stop_event is None or not stop_event.is_set():
+            data = self.read_new(read_processor=read_processor, from_end=from_end, **kwarg)
+            if len(data.data) > 0:
+                yield data
+            elif stop_event is not None:
+                stop_event.wait(poll_interval)
+            else:
+                time.sleep(poll_interval)
+
+    def stop_following(self):
+        """Close the file kept open by read_new()/follow(). The next read_new() call starts from the start of the file
+        """
+        if self.follow_file is not None:
+            self.follow_file.close()
+        self.follow_file = None
+        self.follow_inode = None
+        self.follow_offset = 0
+        self.follow_decoder = None
+
+    def _check_codec_data_type(self, data: GenericDataContainer):
+        if self.codec is not None and data.data_type.__name__ not in self.codec.data_types:
+            raise Exception(
+                'Codec "{}" does not support the GenericDataContainer data type "{}". Supported data types: {}'.format(
+                    self.codec.name,
+                    data.data_type.__name__,
+                    self.codec.data_types
+                )
+            )
+
+    def _serialize(self, data: GenericDataContainer)->object:
+        if self.codec is not None:
+            self._check_codec_data_type(data=data)
+            if data.data_type.__name__ == 'tuple':
+                return _codec_encode(codec=self.codec, data=tuple(data.data))
+            if isinstance(data.data, SpillableList):
+                return _codec_encode(codec=self.codec, data=list(data.data))
+            return _codec_encode(codec=self.codec, data=data.data)
+        data_to_write = data.data
+        if data.data_type.__name__ != 'str':
+            if data.data_type.__name__ == 'dict':
+                data_to_write = json.dumps(data_to_write)
+            elif data.data_type.__name__ == 'bytes':
+                # Bytes containers may hold a memoryview or array - write the raw bytes, not their text representation
+                data_to_write = bytes(memoryview(data_to_write).cast('B'))
+            else:
+                data_to_write = '{}'.format(data_to_write)
+        return data_to_write
+
+    def _write_atomic(self, data_to_write: object, compression: str):
+        file_mode = 'w'
+        if isinstance(data_to_write, bytes):
+            file_mode = 'wb'
+        fd, tmp_path = tempfile.mkstemp(prefix='.{}.'.format(self.file_name), suffix='.tmp', dir=self.file_folder_path)
+        os.close(fd)
+        try:
+            with _open_file(path=tmp_path, mode=file_mode, compression=compression, compression_level=self.compression_level) as f:
+                f.write(data_to_write)
+            if self.fsync is True:
+                # The data must be on stable storage before the rename, even when fsyncs are grouped - otherwise a
+                # crash could leave an empty or truncated file in place of the old one. Only the folder fsync is grouped
+                _fsync_path(path=tmp_path)
+            if os.path.isfile(self.uri):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(self.uri).st_mode))
+            else:
+                os.chmod(tmp_path, _get_new_file_mode(folder_path=self.file_folder_path))
+            os.replace(tmp_path, self.uri)
+        except:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_in_place(self, data_to_write: object, compression: str):
+        file_mode = 'w'
+        if self.write_mode == WRITE_MODE_APPEND:
+            file_mode = 'a'
+        if isinstance(data_to_write, bytes):
+            file_mode = '{}b'.format(file_mode)
+        with _open_file(path=self.uri, mode=file_mode, compression=compression, compression_level=self.compression_level) as f:
+            f.write(data_to_write)
+        if self.fsync is True and self.fsync_batch_size == 1:
+            _fsync_path(path=self.uri)
+
+    def sync(self):
+        """Flush all writes not yet flushed to stable storage (only relevant when fsync_batch_size is greater than 1)
+        """
+        if self.unsynced_writes > 0 and self.write_mode != WRITE_MODE_ATOMIC and os.path.isfile(self.uri):
+            _fsync_path(path=self.uri)
+        if self.unsynced_directory is True:
+            _fsync_path(path=self.file_folder_path, is_directory=True)
+        if self.unsynced_writes > 0:
+            self.logger.debug('{} writes synced'.format(self.unsynced_writes))
+        self.unsynced_writes = 0
+        self.unsynced_directory = False
+
+    def _write_to_file(self, data_to_write: object):
+        new_file = not os.path.isfile(self.uri)
+        compression = self.write_compression()
+        if self.write_mode == WRITE_MODE_ATOMIC:
+            self._write_atomic(data_to_write=data_to_write, compression=compression)
+        else:
+            self._write_in_place(data_to_write=data_to_write, compression=compression)
+        if self.fsync is True:
+            if self.fsync_batch_size == 1:
+                if new_file is True or self.write_mode == WRITE_MODE_ATOMIC:
+                    _fsync_path(path=self.file_folder_path, is_directory=True)
+            else:
+                self.unsynced_writes = self.unsynced_writes + 1
+                if new_file is True or self.write_mode == WRITE_MODE_ATOMIC:
+                    self.unsynced_directory = True
+                if self.unsynced_writes >= self.fsync_batch_size:
+                    self.sync()
+
+    def _load_fingerprint(self)->dict:
+        if self.fingerprint is None and self.fingerprint_sidecar is True and os.path.isfile(self.fingerprint_uri):
+            try:
+                with open(self.fingerprint_uri, 'r') as f:
+                    self.fingerprint = json.load(f)
+            except (OSError, ValueError, KeyError, TypeError):
+                self.logger.warning('Could not load fingerprint from "{}" - ignoring'.format(self.fingerprint_uri))
+        return self.fingerprint
+
+    def _save_fingerprint(self, digest: str):
+        file_stat = os.stat(self.uri)
+        self.fingerprint = {'digest': digest, 'size': file_stat.st_size, 'mtime_ns': file_stat.st_mtime_ns}
+        if self.fingerprint_sidecar is True:
+            with open(self.fingerprint_uri, 'w') as f:
+                json.dump(self.fingerprint, f)
+
+    def _is_unchanged(self, digest: str)->bool:
+        fingerprint = self._load_fingerprint()
+        if fingerprint is None or fingerprint['digest'] != digest:
+            return False
+        try:
+            file_stat = os.stat(self.uri)
+        except FileNotFoundError:
+            return False
+        return file_stat.st_size == fingerprint['size'] and file_stat.st_mtime_ns == fingerprint['mtime_ns']
+
+    def write_now(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        """Write text data to a file immediately, bypassing any write-behind buffer
+
+        :param data: GenericDataContainer with the data to write. Without a codec, bytes data is written as is and other non string data will be converted to a string (dict values will be converted to JSON)
+        :param write_processor: GenericIOProcessor to run after the data was written
+        """
+        data_to_write = self._serialize(data=data)
+        encoded_data = data_to_write
+        if isinstance(data_to_write, str):
+            encoded_data = data_to_write.encode('utf-8')
+        if self.skip_unchanged is True and self.write_mode != WRITE_MODE_APPEND:
+            digest = hashlib.blake2b(encoded_data, digest_size=16).hexdigest()
+            if self._is_unchanged(digest=digest):
+                self.bytes_skipped = self.bytes_skipped + len(encoded_data)
+                self.writes_skipped = self.writes_skipped + 1
+                self.logger.debug('Data unchanged - write to "{}" skipped'.format(self.uri))
+            else:
+                self._write_to_file(data_to_write=data_to_write)
+                self.bytes_written = self.bytes_written + len(encoded_data)
+                self._save_fingerprint(digest=digest)
+        else:
+            self._write_to_file(data_to_write=data_to_write)
+            self.bytes_written = self.bytes_written + len(encoded_data)
+        self.update_cache(data=data, **kwarg)
+        self.data_processing(data=data, processor=write_processor, **kwarg)
+
+    def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        """Write text data to a file, using the write mode set during initialization
+
+        When a write-behind buffer is set, the write is deferred and the write processor will only run once the data 
+        was actually written.
+
+        :param data: GenericDataContainer with the data to write. Bytes data is written as is and other non string data will be converted to a string (dict values will be converted to JSON)
+        :param write_processor: GenericIOProcessor to run after the data was written
+        """
+        if self.write_behind_buffer is not None:
+            self._check_codec_data_type(data=data)
+            self.write_behind_buffer.put(io=self, data=data, write_processor=write_processor, **kwarg)
+            return
+        self.write_now(data=data, write_processor=write_processor, **kwarg)
+
+    async def aread(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
+        """Async version of read()
+
+        Pending write-behind values and cached values are returned directly, without a round trip to the async IO 
+        thread pool.
+        """
+        if self.write_behind_buffer is not None:
+            data = self.write_behind_buffer.get(uri=self.uri)
+            if data is not None:
+                self.logger.info('Returning pending write-behind value')
+                return data
+        data = self.read_from_cache(**kwarg)
+        if data is not None:
+            return data
+        return await super().aread(read_processor=read_processor, **kwarg)
+
+    async def awrite(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        """Async version of write()
+
+        With a write-behind buffer set the write is only buffered, which is done directly on the event loop.
+        """
+        if self.write_behind_buffer is not None:
+            self._check_codec_data_type(data=data)
+            self.write_behind_buffer.put(io=self, data=data, write_processor=write_processor, **kwarg)
+            return
+        await super().awrite(data=data, write_processor=write_processor, **kwarg)
+
+    def flush(self):
+        """Write out any pending write-behind data for this file
+        """
+        if self.write_behind_buffer is not None:
+            self.write_behind_buffer.flush(uri=self.uri)
+
+
+class BinaryFileIO(GenericIO):
+    """Binary file IO, reading into preallocated buffers and writing from any bytes-like object without copying
+
+    Data is read and written using GenericDataContainer instances with a ``bytes`` data type.
+    """
+
+    def __init__(
+        self,
+        file_folder_path: str,
+        file_name: str,
+        buffer_size: int=65536,
+        reuse_buffer: bool=True,
+        logger=L
+    ):
+        """Initialize the binary file IO
+
+        With ``reuse_buffer`` set to True (the default), read() reads into a single buffer owned by this instance, 
+        that is only reallocated when a larger read is required. The GenericDataContainer returned by read() then 
+        holds a memoryview on this buffer, which is only valid until the next read. Use ``bytes(data.data)`` to keep 
+        a copy, or set ``reuse_buffer`` to False to read into a new buffer each time.
+
+        :param file_folder_path: str with the folder containing the file
+        :param file_name: str with the file name
+        :param buffer_size: int with the minimum size, in bytes, of the read buffer (default=65536)
+        :param reuse_buffer: bool to reuse the read buffer between reads (default=True)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        self.file_folder_path = file_folder_path
+        self.file_name = file_name
+        self.buffer_size = buffer_size
+        self.reuse_buffer = reuse_buffer
+        self.buffer = None
+        super().__init__(
+            uri='{}{}{}'.format(
+                file_folder_path,
+                os.sep,
+                file_name
+            ),
+            logger=logger
+        )
+
+    def _get_buffer(self, size: int)->bytearray:
+        if self.reuse_buffer is False:
+            return bytearray(size)
+        if self.buffer is None or len(self.buffer) < size:
+            self.buffer = bytearray(max(size, self.buffer_size))
+        return self.buffer
+
+    def _readinto(self, f, view: memoryview)->int:
+        total = 0
+        while total < len(view):
+            bytes_read = f.readinto(view[total:])
+            if not bytes_read:
+                break
+            total = total + bytes_read
+        return total
 
-    def process(self, data: GenericDataContainer, **kwarg):
-        """This method will take the text string stored in the data container and assume that is a file path
+    def read_into(self, buffer: object, offset: int=0)->int:
+        """Read from the file directly into a caller supplied writable buffer (for example a bytearray)
 
-        The existence of the file path will be tested. An exception will be raised if the file path does not exist
+        :param buffer: writable bytes-like object to fill
+        :param offset: int with the file position to start reading from (default=0)
 
-        Results will be logged
+        :returns: int with the number of bytes read, which will be less than the buffer size if the end of the file was reached
+        """
+        view = memoryview(buffer).cast('B')
+        with open(self.uri, 'rb') as f:
+            f.seek(offset)
+            return self._readinto(f=f, view=view)
 
-        :param data: GenericDataContainer storing a string containing a file path
+    def read(self, read_processor: GenericIOProcessor=None, offset: int=0, length: int=None, **kwarg)->GenericDataContainer:
+        """Read binary data from a file
+
+        :param read_processor: GenericIOProcessor to run after the data was read
+        :param offset: int with the file position to start reading from (default=0)
+        :param length: int with the maximum number of bytes to read (default=None, meaning read up to the end of the file)
+
+        :returns: GenericDataContainer with a bytes data type holding a memoryview on the read buffer
         """
-        if not isinstance(data, GenericDataContainer):
-            self.logger.error('Cannot validate file - invalid data type. Expected a GenericDataContainer')
-            raise Exception('Expected a GenericDataContainer')
-        if not data.data_type.__name__ == 'str':
-            self.logger.error('Cannot validate file - invalid data type. Expected a GenericDataContainer storing a string value')
-            raise Exception('Expected a string in GenericDataContainer')
-        if not os.path.isfile(data.data):
-            self.logger.error('File "{}" does not seem to exists'.format(data.data))
-            raise Exception('File not found')
-        self.logger.info('File "{}" exists'.format(data.data))
+        with open(self.uri, 'rb') as f:
+            if length is None:
+                length = max(os.fstat(f.fileno()).st_size - offset, 0)
+            view = memoryview(self._get_buffer(size=length))[:length]
+            f.seek(offset)
+            bytes_read = self._readinto(f=f, view=view)
+        data = GenericDataContainer(result_set_name=self.uri, data_type=bytes)
+        data.store(data=view[:bytes_read])
+        self.logger.info('{} bytes read.'.format(bytes_read))
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
 
+    def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, offset: int=None, **kwarg):
+        """Write binary data to a file
 
-class GenericIO:
+        :param data: GenericDataContainer with a bytes data type
+        :param write_processor: GenericIOProcessor to run after the data was written
+        :param offset: int with the file position to write the data to. When None, the file is replaced with the data (default=None)
+        """
+        if data.data_type.__name__ != 'bytes':
+            raise Exception('Expected a GenericDataContainer with a bytes data type')
+        if offset is None:
+            with open(self.uri, 'wb') as f:
+                f.write(data.data)
+        else:
+            file_mode = 'r+b'
+            if not os.path.isfile(self.uri):
+                file_mode = 'w+b'
+            with open(self.uri, file_mode) as f:
+                f.seek(offset)
+                f.write(data.data)
+        self.data_processing(data=data, processor=write_processor, **kwarg)
 
-    def __init__(self, uri: str, logger=L):
-        self.uri = uri
-        self.logger = logger
 
-    def read(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
-        raise Exception('Not yet implemented')
+class JsonLinesFileIO(GenericIO):
+    """JSON Lines file IO - one JSON document (record) per line
+
+    Writes append records to the end of the file, so existing records are never rewritten. Reads parse the file 
+    incrementally, one record at a time, and can resume from a byte offset. After each complete record, 
+    ``last_offset`` holds the file position directly after it, which can be used to resume reading later. A last 
+    line without a line ending (a record still being written) is not consumed.
+    """
+
+    def __init__(
+        self,
+        file_folder_path: str,
+        file_name: str,
+        fsync: bool=False,
+        compression: str=None,
+        compression_level: int=None,
+        read_magic_bytes: bool=False,
+        logger=L
+    ):
+        """Initialize the JSON Lines file IO
+
+        Compressed files are supported in the same way as for TextFileIO. Appending to a compressed file adds a new 
+        compressed stream to the end of the file and reads decompress the file as a stream. Byte offsets always refer 
+        to the uncompressed data.
+
+        :param file_folder_path: str with the folder containing the file
+        :param file_name: str with the file name
+        :param fsync: bool to flush appended records to stable storage (default=False)
+        :param compression: str with one of SUPPORTED_COMPRESSION (default=None, meaning detect)
+        :param compression_level: int with the compression level (default=None, meaning the library default)
+        :param read_magic_bytes: bool to detect the compression from the file content instead of the file extension (default=False)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        if compression is not None and compression not in SUPPORTED_COMPRESSION:
+            raise Exception('Compression "{}" was not found in the current supported compression types: {}'.format(compression, SUPPORTED_COMPRESSION))
+        self.file_folder_path = file_folder_path
+        self.file_name = file_name
+        self.fsync = fsync
+        self.compression = compression
+        self.compression_level = compression_level
+        self.read_magic_bytes = read_magic_bytes
+        self.last_offset = 0
+        super().__init__(
+            uri='{}{}{}'.format(
+                file_folder_path,
+                os.sep,
+                file_name
+            ),
+            logger=logger
+        )
+
+    def iter_records(self, offset: int=0, data_validator: DataValidator=None, **kwarg):
+        """Generator yielding the records (typically dicts) in the file, parsed one line at a time
+
+        :param offset: int with the byte offset to start reading from - must be the start of a line (default=0)
+        :param data_validator: DataValidator to validate each record with. An exception is raised on the first invalid record (default=None)
+        :param **kwarg: All additional arguments are passed to the DataValidator
+        """
+        position = offset
+        compression = self.compression
+        if compression is None:
+            compression = detect_compression(path=self.uri, read_magic_bytes=self.read_magic_bytes)
+        with _open_file(path=self.uri, mode='rb', compression=compression) as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                record_offset = position
+                position = position + len(line)
+                if len(line.strip()) == 0:
+                    self.last_offset = position
+                    continue
+                record = json.loads(line.decode('utf-8'))
+                if data_validator is not None:
+                    if not data_validator.validate(data=record, **kwarg):
+                        raise Exception('Record validation failed at offset {}'.format(record_offset))
+                self.last_offset = position
+                yield record
+
+    def read(self, read_processor: GenericIOProcessor=None, offset: int=0, data_validator: DataValidator=None, **kwarg)->GenericDataContainer:
+        """Read all records from a byte offset into a list GenericDataContainer
+
+        Each record is stored (and therefore validated) as soon as it is parsed.
+
+        :param read_processor: GenericIOProcessor to run after the records were read
+        :param offset: int with the byte offset to start reading from (default=0)
+        :param data_validator: DataValidator for the GenericDataContainer, validating each record (default=None)
+
+        :returns: GenericDataContainer with a list of records
+        """
+        data = GenericDataContainer(result_set_name=self.uri, data_type=list, data_validator=data_validator, logger=self.logger)
+        for record in self.iter_records(offset=offset):
+            data.store(data=record, **kwarg)
+        self.logger.info('{} records read.'.format(len(data.data)))
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def _truncate_incomplete_line(self, chunk_size: int=65536):
+        """Remove an incomplete last line (left behind by an interrupted write) from an uncompressed file, so that new 
+        records are not appended onto it. The write lock must be held
+        """
+        with open(self.uri, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            keep = 0
+            position = size
+            while position > 0:
+                chunk_start = max(0, position - chunk_size)
+                f.seek(chunk_start)
+                newline_index = f.read(position - chunk_start).rfind(b'\n')
+                if newline_index >= 0:
+                    keep = chunk_start + newline_index + 1
+                    break
+                position = chunk_start
+            self.logger.warning('Discarding incomplete record at the end of "{}"'.format(self.uri))
+            f.truncate(keep)
 
     def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
-        raise Exception('Not yet implemented')
+        """Append records to the file
 
+        Each write holds an exclusive ``flock`` on the file while it appends, so several JsonLinesFileIO writers (also 
+        in different processes) can append to the same file. While the lock is held no other writer can be half way 
+        through a record, so an incomplete last line in an uncompressed file can only be left by a write that was 
+        interrupted - it is discarded before the new records are appended. All writers of the file must use 
+        JsonLinesFileIO (or take the same lock). Where ``fcntl`` is not available (Windows), only a single writer per 
+        file is supported.
 
-class TextFileIO(GenericIO):
+        :param data: GenericDataContainer with a dict data type (appended as one record) or a list/tuple data type (each item appended as a record)
+        :param write_processor: GenericIOProcessor to run after the records were written
+        """
+        if data.data_type.__name__ == 'dict':
+            records = [data.data]
+        elif data.data_type.__name__ in ('list', 'tuple'):
+            records = data.data
+        else:
+            raise Exception('Expected a GenericDataContainer with a dict, list or tuple data type')
+        lines = ''.join(['{}\n'.format(json.dumps(record)) for record in records])
+        compression = self.compression
+        if compression is None:
+            compression = detect_compression(path=self.uri, read_magic_bytes=self.read_magic_bytes)
+        with open(self.uri, 'ab') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            if compression == COMPRESSION_NONE:
+                self._truncate_incomplete_line()
+            with _open_file(path=self.uri, mode='ab', compression=compression, compression_level=self.compression_level) as f:
+                f.write(lines.encode('utf-8'))
+        if self.fsync is True:
+            _fsync_path(path=self.uri)
+        self.data_processing(data=data, processor=write_processor, **kwarg)
+
+
+class SqliteKeyValueIO(GenericIO):
+    """A key/value store for dict GenericDataContainer data, backed by a SQLite database
+
+    Values are serialized with a registered SerializationCodec. The store never needs to load all keys into memory: 
+    iter_items() streams matching rows from the database in batches, and read() loads only the requested keys.
+    """
+
+    def __init__(
+        self,
+        database_path: str=':memory:',
+        table_name: str='store',
+        codec: str='json',
+        wal_mode: bool=True,
+        batch_size: int=1000,
+        logger=L
+    ):
+        """Initialize the store, creating the table if required
+
+        :param database_path: str with the SQLite database file path, or ':memory:' for an in-memory database (default=':memory:')
+        :param table_name: str with the table name (default='store')
+        :param codec: str with the name of a registered SerializationCodec for the values (default='json')
+        :param wal_mode: bool to use the write-ahead log journal mode for file databases (default=True)
+        :param batch_size: int with the number of rows written per transaction and fetched per round trip (default=1000)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', table_name) is None:
+            raise Exception('Invalid table name "{}"'.format(table_name))
+        if batch_size < 1:
+            raise Exception('batch_size must be 1 or more')
+        super().__init__(uri=database_path, logger=logger)
+        self.table_name = table_name
+        self.codec = get_codec(name=codec)
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        if wal_mode is True and database_path != ':memory:':
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS {} (key TEXT PRIMARY KEY, value BLOB) WITHOUT ROWID'.format(table_name)
+        )
+        self.connection.commit()
+        # The SQL text is fixed per instance so that SQLite's statement cache reuses the prepared statements
+        self.sql_upsert = 'INSERT OR REPLACE INTO {} (key, value) VALUES (?, ?)'.format(table_name)
+        self.sql_select = 'SELECT value FROM {} WHERE key = ?'.format(table_name)
+        self.sql_delete = 'DELETE FROM {} WHERE key = ?'.format(table_name)
+        self.sql_count = 'SELECT COUNT(*) FROM {}'.format(table_name)
+        self.sql_select_all = 'SELECT key, value FROM {} ORDER BY key'.format(table_name)
+        self.sql_select_range = 'SELECT key, value FROM {} WHERE key >= ? AND key < ? ORDER BY key'.format(table_name)
+        self.sql_select_from = 'SELECT key, value FROM {} WHERE key >= ? ORDER BY key'.format(table_name)
+        self.sql_select_to = 'SELECT key, value FROM {} WHERE key < ? ORDER BY key'.format(table_name)
+
+    def _encode_items(self, items):
+        for key, value in items:
+            if not isinstance(key, str):
+                raise Exception('Keys must be strings but got "{}"'.format(type(key).__name__))
+            yield (key, _codec_encode(codec=self.codec, data=value))
+
+    def store_many(self, items: object)->int:
+        """Store many key/value pairs, using one transaction per batch_size items
+
+        :param items: iterable of (key, value) tuples. Keys must be strings
+        :returns: int with the number of items stored
+        """
+        total = 0
+        batch = list()
+        with self.lock:
+            for item in self._encode_items(items=items):
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    with self.connection:
+                        self.connection.executemany(self.sql_upsert, batch)
+                    total = total + len(batch)
+                    batch = list()
+            if len(batch) > 0:
+                with self.connection:
+                    self.connection.executemany(self.sql_upsert, batch)
+                total = total + len(batch)
+        self.logger.debug('{} items stored in "{}"'.format(total, self.table_name))
+        return total
+
+    def store(self, key: str, value: object):
+        self.store_many(items=[(key, value)])
+
+    def get(self, key: str)->object:
+        """Get the value of a key
+
+        :returns: object with the decoded value, or None if the key does not exist
+        """
+        row = self.connection.execute(self.sql_select, (key,)).fetchone()
+        if row is None:
+            return None
+        return self.codec.decode(row[0])
+
+    def delete(self, key: str):
+        with self.lock:
+            with self.connection:
+                self.connection.execute(self.sql_delete, (key,))
+
+    def count(self)->int:
+        return self.connection.execute(self.sql_count).fetchone()[0]
+
+    def iter_items(self, prefix: str=None, start_key: str=None, end_key: str=None):
+        """Generator yielding (key, value) tuples in key order, fetched from the database batch_size rows at a time
+
+        :param prefix: str to only return keys starting with this prefix (default=None)
+        :param start_key: str with the first key to return (inclusive) (default=None)
+        :param end_key: str with the key to stop at (exclusive) (default=None)
+        """
+        if prefix is not None:
+            start_key = prefix
+            end_key = '{}{}'.format(prefix, chr(0x10ffff))
+        if start_key is not None and end_key is not None:
+            cursor = self.connection.execute(self.sql_select_range, (start_key, end_key))
+        elif start_key is not None:
+            cursor = self.connection.execute(self.sql_select_from, (start_key,))
+        elif end_key is not None:
+            cursor = self.connection.execute(self.sql_select_to, (end_key,))
+        else:
+            cursor = self.connection.execute(self.sql_select_all)
+        try:
+            rows = cursor.fetchmany(self.batch_size)
+            while len(rows) > 0:
+                for key, value in rows:
+                    yield (key, self.codec.decode(value))
+                rows = cursor.fetchmany(self.batch_size)
+        finally:
+            cursor.close()
+
+    def read(
+        self,
+        read_processor: GenericIOProcessor=None,
+        keys: list=None,
+        prefix: str=None,
+        start_key: str=None,
+        end_key: str=None,
+        **kwarg
+    )->GenericDataContainer:
+        """Read key/values into a dict GenericDataContainer
+
+        Without any keys, prefix or range all items will be read - use iter_items() for large stores.
+
+        :param read_processor: GenericIOProcessor to run after the data was read
+        :param keys: list of keys to read. Keys that do not exist are skipped (default=None)
+        :param prefix: str to only read keys starting with this prefix (default=None)
+        :param start_key: str with the first key to read (inclusive) (default=None)
+        :param end_key: str with the key to stop at (exclusive) (default=None)
+
+        :returns: GenericDataContainer with a dict data type
+        """
+        data = GenericDataContainer(result_set_name=self.uri, data_type=dict, logger=self.logger)
+        if keys is not None:
+            for key in keys:
+                value = self.get(key=key)
+                if value is not None:
+                    data.data[key] = value
+        else:
+            for key, value in self.iter_items(prefix=prefix, start_key=start_key, end_key=end_key):
+                data.data[key] = value
+        self.logger.info('{} items read.'.format(len(data.data)))
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
+        """Store all key/values of a dict GenericDataContainer (existing keys are replaced)
+
+        :param data: GenericDataContainer with a dict data type
+        :param write_processor: GenericIOProcessor to run after the data was written
+        """
+        if data.data_type.__name__ != 'dict':
+            raise Exception('Expected a GenericDataContainer with a dict data type')
+        self.store_many(items=data.data.items())
+        self.data_processing(data=data, processor=write_processor, **kwarg)
+
+    def close(self):
+        self.connection.close()
+
+
+class LogStructuredDictIO(GenericIO):
+    """An append-only, log-structured store for dict GenericDataContainer data
+
+    Each change is appended to a journal file as a JSON line - ``{"k": key, "v": value}`` for a new or changed key and 
+    ``{"k": key, "d": true}`` for a deleted key. An in-memory index maps every live key to the position of its latest 
+    record, so a write only costs as much as the data that changed and single keys can be read without reading the 
+    rest of the journal.
+
+    Superseded and deleted records are garbage. When the garbage exceeds ``compaction_threshold`` (as a fraction of 
+    the journal size) and ``compaction_min_bytes``, the journal is compacted by copying the live records to a new 
+    journal, in a background thread by default. Writes can continue during compaction.
+
+    On start-up the index is recovered from the last checkpoint (``<file_name>.checkpoint``, written by checkpoint(), 
+    close() and after compaction), followed by a scan of the journal from the checkpointed position. Without a valid 
+    checkpoint the whole journal is scanned. An incomplete last record (from a crash during a write) is discarded.
+    """
 
     def __init__(
         self,
         file_folder_path: str,
         file_name: str,
-        cache_max_age: int=900,
-        enable_cache: bool=False,
+        compaction_threshold: float=0.5,
+        compaction_min_bytes: int=1048576,
+        background_compaction: bool=True,
+        fsync: bool=False,
         logger=L
     ):
-        # TODO: check that folder exists...
-        self.cached_data = None
-        self.cached_data_timestamp = 0
-        self.cache_max_age = cache_max_age
-        self.enable_cache = enable_cache
+        """Initialize the store and recover the index
+
+        :param file_folder_path: str with the folder containing the journal
+        :param file_name: str with the journal file name
+        :param compaction_threshold: float with the fraction of garbage in the journal that triggers compaction (default=0.5)
+        :param compaction_min_bytes: int with the minimum number of garbage bytes before compaction is considered (default=1048576)
+        :param background_compaction: bool to compact in a background thread rather than during the triggering write (default=True)
+        :param fsync: bool to flush appended records to stable storage (default=False)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
         super().__init__(
             uri='{}{}{}'.format(
                 file_folder_path,
@@ -322,73 +3766,517 @@ class TextFileIO(GenericIO):
             ),
             logger=logger
         )
+        self.file_folder_path = file_folder_path
+        self.file_name = file_name
+        self.checkpoint_uri = '{}.checkpoint'.format(self.uri)
+        self.compaction_threshold = compaction_threshold
+        self.compaction_min_bytes = compaction_min_bytes
+        self.background_compaction = background_compaction
+        self.fsync = fsync
+        self.index = dict()
+        self.journal_size = 0
+        self.garbage_bytes = 0
+        self.compactions = 0
+        self.lock = threading.RLock()
+        self.compaction_lock = threading.Lock()
+        self.compaction_thread = None
+        self.written_version = None
+        self.written_container = None
+        self._recover()
 
-    def read_from_cache(self, **kwarg)->str:
-        if self.enable_cache is True:
-            now = get_utc_timestamp()
-            if 'force' not in kwarg:
-                if self.cached_data is not None and (now - self.cached_data_timestamp) < self.cache_max_age:
-                    self.logger.info('Returning cached value')
-                    return self.cached_data
-            else:
-                self.logger.info('Cache reset forced.')
-            self.cached_data = None
-            self.cached_data_timestamp = 0
-        return None
+    def _apply_record(self, index: dict, record: dict, offset: int, length: int, digest: str)->int:
+        """Apply a journal record to an index and return the number of bytes that became garbage
+        """
+        garbage = 0
+        key = record['k']
+        if key in index:
+            garbage = garbage + index[key][1]
+        if 'd' in record:
+            garbage = garbage + length
+            index.pop(key, None)
+        else:
+            index[key] = (offset, length, digest)
+        return garbage
 
-    def update_cache(self, data: GenericDataContainer, **kwarg):
-        if self.enable_cache is True:
-            self.cached_data = data
-            self.cached_data_timestamp = get_utc_timestamp()
-            self.logger.info('Cache updated')
+    def _value_digest(self, payload: str)->str:
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
 
-    def data_processing(self, data: GenericDataContainer, processor: GenericIOProcessor, **kwarg):
-        if processor is not None:
-            if isinstance(processor, GenericIOProcessor):
-                self.logger.info('Running processor')
-                self.logger.debug('kwarg={}'.format(kwarg))
-                processor.process(data=data, **kwarg)
+    def _scan(self, f, index: dict, offset: int)->tuple:
+        """Apply all complete records from offset onwards. Returns the position after the last complete record and the garbage found
+        """
+        garbage = 0
+        position = offset
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            record = json.loads(line.decode('utf-8'))
+            digest = None
+            if 'd' not in record:
+                digest = self._value_digest(payload=json.dumps(record['v']))
+            garbage = garbage + self._apply_record(index=index, record=record, offset=position, length=len(line), digest=digest)
+            position = position + len(line)
+        return position, garbage
+
+    def _load_checkpoint(self)->bool:
+        if not os.path.isfile(self.checkpoint_uri):
+            return False
+        try:
+            with open(self.checkpoint_uri, 'r') as f:
+                checkpoint = json.load(f)
+            journal_stat = os.stat(self.uri)
+            if checkpoint['inode'] != journal_stat.st_ino or checkpoint['size'] > journal_stat.st_size:
+                self.logger.warning('Checkpoint "{}" does not match the journal - ignoring'.format(self.checkpoint_uri))
+                return False
+            self.index = dict()
+            for key, offset, length, digest in checkpoint['index']:
+                self.index[key] = (offset, length, digest)
+            self.journal_size = checkpoint['size']
+            self.garbage_bytes = checkpoint['garbage']
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            self.logger.warning('Could not load checkpoint "{}" - ignoring'.format(self.checkpoint_uri))
+            return False
+
+    def _recover(self):
+        if not os.path.isfile(self.uri):
+            return
+        if not self._load_checkpoint():
+            self.index = dict()
+            self.journal_size = 0
+            self.garbage_bytes = 0
+        with open(self.uri, 'r+b') as f:
+            position, garbage = self._scan(f=f, index=self.index, offset=self.journal_size)
+            if position < os.fstat(f.fileno()).st_size:
+                self.logger.warning('Discarding incomplete record at the end of journal "{}"'.format(self.uri))
+                f.truncate(position)
+        self.journal_size = position
+        self.garbage_bytes = self.garbage_bytes + garbage
+        self.logger.info('Recovered {} keys from journal "{}"'.format(len(self.index), self.uri))
+
+    def checkpoint(self):
+        """Save the index so that the next start-up does not need to scan the whole journal
+        """
+        with self.lock:
+            if not os.path.isfile(self.uri):
+                return
+            checkpoint = {
+                'inode': os.stat(self.uri).st_ino,
+                'size': self.journal_size,
+                'garbage': self.garbage_bytes,
+                'index': [[key, offset, length, digest] for key, (offset, length, digest) in self.index.items()],
+            }
+            tmp_path = '{}.tmp'.format(self.checkpoint_uri)
+            with open(tmp_path, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, self.checkpoint_uri)
+
+    def _append(self, lines: list):
+        """Append (key, line, digest, is_delete) entries to the journal and update the index. The lock must be held
+        """
+        if len(lines) == 0:
+            return
+        buffer = b''.join([line for key, line, digest, is_delete in lines])
+        with open(self.uri, 'ab') as f:
+            f.write(buffer)
+            if self.fsync is True:
+                f.flush()
+                os.fsync(f.fileno())
+        offset = self.journal_size
+        for key, line, digest, is_delete in lines:
+            if key in self.index:
+                self.garbage_bytes = self.garbage_bytes + self.index[key][1]
+            if is_delete is True:
+                self.garbage_bytes = self.garbage_bytes + len(line)
+                self.index.pop(key, None)
             else:
-                self.logger.error('Skipping processor - wrong type. Expected a GenericIOProcessor')
+                self.index[key] = (offset, len(line), digest)
+            offset = offset + len(line)
+        self.journal_size = offset
+        self._maybe_compact()
+
+    def _check_key(self, key: object):
+        """Keys are written as JSON, so only keys that read back as the same dict key are accepted
+        """
+        if not isinstance(key, (str, int)):
+            raise Exception('Keys must be strings or integers but got "{}"'.format(type(key).__name__))
+
+    def _put_line(self, key: object, value: object)->tuple:
+        self._check_key(key=key)
+        payload = json.dumps(value)
+        digest = self._value_digest(payload=payload)
+        line = '{{"k": {}, "v": {}}}\n'.format(json.dumps(key), payload).encode('utf-8')
+        return (key, line, digest, False)
+
+    def _delete_line(self, key: object)->tuple:
+        self._check_key(key=key)
+        return (key, '{{"k": {}, "d": true}}\n'.format(json.dumps(key)).encode('utf-8'), None, True)
+
+    def put(self, key: object, value: object):
+        with self.lock:
+            self._append(lines=[self._put_line(key=key, value=value)])
+            self.written_container = None
+
+    def delete(self, key: object):
+        with self.lock:
+            if key in self.index:
+                self._append(lines=[self._delete_line(key=key)])
+                self.written_container = None
+
+    def _read_record(self, f, key: object)->object:
+        offset, length, digest = self.index[key]
+        f.seek(offset)
+        return json.loads(f.read(length).decode('utf-8'))['v']
+
+    def get(self, key: object)->object:
+        """Get the value of a key
+
+        :returns: object with the value, or None if the key does not exist
+        """
+        with self.lock:
+            if key not in self.index:
+                return None
+            with open(self.uri, 'rb') as f:
+                return self._read_record(f=f, key=key)
+
+    def keys(self)->list:
+        with self.lock:
+            return list(self.index.keys())
 
     def read(self, read_processor: GenericIOProcessor=None, **kwarg)->GenericDataContainer:
-        """Read text data from a file
+        """Read all live keys into a dict GenericDataContainer
 
-        :param read_processor: GenericIOProcessor that is not used in this function - whatever is supplied here will be ignored (for now)
-        :param force: bool which is an optional argument. If the keyword is present, any cached data will be ignored (cache will be cleared as well)
+        :param read_processor: GenericIOProcessor to run after the data was read
 
-        :returns: GenericDataContainer
+        :returns: GenericDataContainer with a dict data type
+        """
+        data = GenericDataContainer(result_set_name=self.uri, data_type=dict, logger=self.logger)
+        with self.lock:
+            if len(self.index) > 0:
+                with open(self.uri, 'rb') as f:
+                    for key in sorted(self.index.keys(), key=lambda k: self.index[k][0]):
+                        data.data[key] = self._read_record(f=f, key=key)
+        self.logger.info('{} keys read.'.format(len(data.data)))
+        self.data_processing(data=data, processor=read_processor, **kwarg)
+        return data
+
+    def _changed_put_lines(self, items: object)->list:
+        """Returns the put lines for the (key, value) items whose value differs from the stored value. The lock must be held
         """
-        data = self.read_from_cache(**kwarg)
-        if data is not None:
-            return data
-        data = GenericDataContainer(result_set_name=self.uri, data_type=str)
-        data_str = ''
         lines = list()
-        with open(self.uri, 'r') as f:
-            lines = f.readlines()
-        if len(lines) > 1:
-            data_str = ''.join(lines)
-        elif len(lines) == 1:
-            data_str = lines[0]
+        for key, value in items:
+            entry = self._put_line(key=key, value=value)
+            if key in self.index and self.index[key][2] == entry[2]:
+                continue
+            lines.append(entry)
+        return lines
+
+    def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, since_version: int=None, **kwarg):
+        """Persist a dict GenericDataContainer, appending only the keys that changed or were removed since the last write
+
+        Comparing every value with the stored value means serializing and hashing the whole container. For 
+        containers that track changes this is avoided: when the previous write to this store was the same container 
+        (and no put() or delete() was done since), only the keys that changed after ``written_version`` are 
+        written. Pass ``since_version`` to choose the container version to write the changes from explicitly.
+
+        :param data: GenericDataContainer with a dict data type
+        :param write_processor: GenericIOProcessor to run after the data was written
+        :param since_version: int with the container version of the previous write (default=None, meaning the changes since the previous write of the same change tracking container, otherwise all keys are compared)
+        """
+        if data.data_type.__name__ != 'dict':
+            raise Exception('Expected a GenericDataContainer with a dict data type')
+        if since_version is None and data.track_changes is True:
+            with self.lock:
+                if self.written_container is not None and self.written_container() is data:
+                    if self.written_version >= data.changes_base_version:
+                        since_version = self.written_version
+        changes = None
+        if since_version is not None:
+            changes = data.changes_since(version=since_version)
+        with self.lock:
+            if changes is not None:
+                lines = self._changed_put_lines(items=changes['changed'].items())
+                lines.extend([self._delete_line(key=key) for key in changes['deleted'] if key in self.index])
+                self.written_version = changes['version']
+            else:
+                lines = self._changed_put_lines(items=data.data.items())
+                lines.extend([self._delete_line(key=key) for key in self.index.keys() if key not in data.data])
+                self.written_version = data.version
+            self._append(lines=lines)
+            self.written_container = None
+            if data.track_changes is True:
+                self.written_container = weakref.ref(data)
+            self.logger.debug('{} changed keys written'.format(len(lines)))
+        self.data_processing(data=data, processor=write_processor, **kwarg)
+
+    def _maybe_compact(self):
+        if self.garbage_bytes < self.compaction_min_bytes:
+            return
+        if self.garbage_bytes < self.journal_size * self.compaction_threshold:
+            return
+        if self.background_compaction is True:
+            if self.compaction_thread is None or not self.compaction_thread.is_alive():
+                self.compaction_thread = threading.Thread(target=self.compact, name='odc_compaction', daemon=True)
+                self.compaction_thread.start()
         else:
-            data_str = ''
-        data.store(data=data_str)
-        self.logger.info('{} bytes read.'.format(len(data_str)))
-        self.update_cache(data=data, **kwarg)
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal with only the live records
+
+        The live records are copied without holding the store lock. Records appended during the copy are copied 
+        afterwards, while holding the lock, before the new journal replaces the old one.
+        """
+        with self.compaction_lock:
+            with self.lock:
+                snapshot = sorted(self.index.items(), key=lambda item: item[1][0])
+                snapshot_size = self.journal_size
+            tmp_path = '{}.compact'.format(self.uri)
+            new_index = dict()
+            with open(self.uri, 'rb') as source, open(tmp_path, 'wb') as target:
+                position = 0
+                for key, (offset, length, digest) in snapshot:
+                    source.seek(offset)
+                    target.write(source.read(length))
+                    new_index[key] = (position, length, digest)
+                    position = position + length
+                with self.lock:
+                    source.seek(snapshot_size)
+                    tail = source.read(self.journal_size - snapshot_size)
+                    target.write(tail)
+                    target.flush()
+                    with open(tmp_path, 'rb') as f:
+                        end, garbage = self._scan(f=f, index=new_index, offset=position)
+                    if self.fsync is True:
+                        os.fsync(target.fileno())
+                    os.replace(tmp_path, self.uri)
+                    if self.fsync is True:
+                        _fsync_path(path=self.file_folder_path, is_directory=True)
+                    old_size = self.journal_size
+                    self.index = new_index
+                    self.journal_size = end
+                    self.garbage_bytes = garbage
+                    self.compactions = self.compactions + 1
+                    self.checkpoint()
+            self.logger.info('Journal "{}" compacted from {} to {} bytes'.format(self.uri, old_size, end))
+
+    def close(self):
+        """Wait for any running compaction and save a checkpoint
+        """
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+        self.checkpoint()
+
+
+class BatchReadResult:
+    """The result of reading one source in a TextFileBatchReader batch
+    """
+
+    def __init__(self, io: GenericIO, data: GenericDataContainer=None, error: Exception=None, error_traceback: str=None):
+        self.io = io
+        self.uri = io.uri
+        self.data = data
+        self.error = error
+        self.error_traceback = error_traceback
+        self.is_error = error is not None
+
+
+class TextFileBatchReader:
+    """Reads many files concurrently on a thread pool
+
+    Sources can be ``(file_folder_path, file_name)`` pairs, which will be read with a default TextFileIO, or 
+    GenericIO instances (typically TextFileIO), in which case the instance's own cache settings apply.
+    """
+
+    def __init__(self, sources: list, max_workers: int=8, logger=L):
+        """Initialize the reader
+
+        :param sources: list of (file_folder_path, file_name) tuples and/or GenericIO instances
+        :param max_workers: int with the maximum number of files read at the same time (default=8)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        if max_workers < 1:
+            raise Exception('max_workers must be 1 or more')
+        self.ios = list()
+        for source in sources:
+            if isinstance(source, GenericIO):
+                self.ios.append(source)
+            elif isinstance(source, (tuple, list)) and len(source) == 2:
+                self.ios.append(TextFileIO(file_folder_path=source[0], file_name=source[1], logger=logger))
+            else:
+                raise Exception('Expected a GenericIO or a (file_folder_path, file_name) tuple but got "{}"'.format(source))
+        self.max_workers = max_workers
+        self.logger = logger
+
+    def _read_one(self, io: GenericIO, read_processor: GenericIOProcessor=None, **kwarg)->BatchReadResult:
+        try:
+            return BatchReadResult(io=io, data=io.read(read_processor=read_processor, **kwarg))
+        except Exception as e:
+            self.logger.error('Failed to read "{}": {}'.format(io.uri, e))
+            return BatchReadResult(io=io, error=e, error_traceback=traceback.format_exc())
+
+    def read(self, read_processor: GenericIOProcessor=None, **kwarg):
+        """Read all sources, yielding a BatchReadResult for each source as soon as it was read
+
+        Errors are captured in the BatchReadResult of the failing source and do not stop the batch. Results are not 
+        returned in the order of the sources. Reads not yet started are cancelled when the generator is closed early.
+
+        :param read_processor: GenericIOProcessor passed on to each read
+        :param **kwarg: All additional arguments are passed on to each read
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='odc_batch_read') as executor:
+            futures = [executor.submit(self._read_one, io, read_processor, **kwarg) for io in self.ios]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+class DirectoryIO(GenericIO):
+    """Bulk IO for all the files in a folder, based on an incremental change manifest
+
+    Each read() scans the folder once with ``os.scandir`` and compares the (size, mtime_ns) of each file with the 
+    manifest from the previous scan, so only files that were added, changed or removed are reported (and, 
+    optionally, read). The manifest can be persisted so that changes are also detected across restarts. A persisted 
+    manifest stored in the scanned folder is not reported as a change itself.
+    """
+
+    def __init__(
+        self,
+        folder_path: str,
+        manifest_path: str=None,
+        max_workers: int=8,
+        logger=L
+    ):
+        """Initialize the directory IO
+
+        :param folder_path: str with the folder to scan
+        :param manifest_path: str with a file path to persist the manifest in (default=None, meaning the manifest is only kept in memory)
+        :param max_workers: int with the maximum number of files read at the same time (default=8)
+        :param logger: OculusDLogger defining the logger to use (default=OculusDLogger())
+        """
+        super().__init__(uri=folder_path, logger=logger)
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers
+        self.manifest = dict()
+        self.excluded_names = set()
+        if manifest_path is not None:
+            manifest_folder_path = os.path.dirname(manifest_path)
+            if manifest_folder_path == '':
+                manifest_folder_path = '.'
+            if os.path.realpath(manifest_folder_path) == os.path.realpath(folder_path):
+                manifest_name = os.path.basename(manifest_path)
+                self.excluded_names = {manifest_name, '{}.tmp'.format(manifest_name)}
+        if manifest_path is not None and os.path.isfile(manifest_path):
+            with open(manifest_path, 'r') as f:
+                self.manifest = {name: tuple(entry) for name, entry in json.load(f).items()}
+
+    def _scan(self)->tuple:
+        """Scan the folder and compare it with the manifest, without updating the manifest
+
+        :returns: tuple with the new manifest and the changes dict
+        """
+        current = dict()
+        with os.scandir(self.uri) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name not in self.excluded_names:
+                    entry_stat = entry.stat()
+                    current[entry.name] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+        added = list()
+        changed = list()
+        for name, entry in current.items():
+            if name not in self.manifest:
+                added.append(name)
+            elif self.manifest[name] != entry:
+                changed.append(name)
+        removed = [name for name in self.manifest.keys() if name not in current and name not in self.excluded_names]
+        self.logger.info('Scanned "{}": {} added, {} changed, {} removed'.format(self.uri, len(added), len(changed), len(removed)))
+        return (current, {'added': sorted(added), 'changed': sorted(changed), 'removed': sorted(removed)})
+
+    def _commit_manifest(self, manifest: dict):
+        self.manifest = manifest
+        if self.manifest_path is not None:
+            tmp_path = '{}.tmp'.format(self.manifest_path)
+            with open(tmp_path, 'w') as f:
+                json.dump(self.manifest, f)
+            os.replace(tmp_path, self.manifest_path)
+
+    def scan(self)->dict:
+        """Scan the folder and update the manifest
+
+        :returns: dict with sorted lists of file names under the keys 'added', 'changed' and 'removed'
+        """
+        manifest, changes = self._scan()
+        self._commit_manifest(manifest=manifest)
+        return changes
+
+    def read(
+        self,
+        read_processor: GenericIOProcessor=None,
+        read_files: bool=False,
+        file_read_processor: GenericIOProcessor=None,
+        **kwarg
+    )->GenericDataContainer:
+        """Report (and optionally read) the files that changed since the previous read
+
+        When ``read_files`` is True, the added and changed files are read in parallel with a TextFileBatchReader. 
+        The GenericDataContainer of each file is available under the 'files' key and the exceptions of files that 
+        could not be read under the 'errors' key. Files that could not be read are not recorded in the manifest, so 
+        they are reported (and read) again by the next read().
+
+        :param read_processor: GenericIOProcessor to run on the returned GenericDataContainer
+        :param read_files: bool to read the added and changed files (default=False)
+        :param file_read_processor: GenericIOProcessor passed on to each file read (default=None)
+
+        :returns: GenericDataContainer with a dict data type with the keys 'added', 'changed' and 'removed' (and 'files' and 'errors' when reading files)
+        """
+        manifest, changes = self._scan()
+        data = GenericDataContainer(result_set_name=self.uri, data_type=dict, logger=self.logger)
+        data.data.update(changes)
+        if read_files is False:
+            self._commit_manifest(manifest=manifest)
+        else:
+            files = dict()
+            errors = dict()
+            sources = [(self.uri, name) for name in changes['added'] + changes['changed']]
+            reader = TextFileBatchReader(sources=sources, max_workers=self.max_workers, logger=self.logger)
+            for result in reader.read(read_processor=file_read_processor, **kwarg):
+                if result.is_error:
+                    errors[result.io.file_name] = result.error
+                else:
+                    files[result.io.file_name] = result.data
+            for name in errors.keys():
+                if name in self.manifest:
+                    manifest[name] = self.manifest[name]
+                else:
+                    manifest.pop(name, None)
+            self._commit_manifest(manifest=manifest)
+            data.data['files'] = files
+            data.data['errors'] = errors
         self.data_processing(data=data, processor=read_processor, **kwarg)
         return data
 
     def write(self, data: GenericDataContainer, write_processor: GenericIOProcessor=None, **kwarg):
-        data_to_write = data.data
-        if data.data_type.__name__ != 'str':
-            if data.data_type.__name__ == 'dict':
-                data_to_write = json.dumps(data_to_write)
-            else:
-                data_to_write = '{}'.format(data_to_write)
-        with open(self.uri, 'w') as f:
-            f.write(data_to_write)
-            self.update_cache(data=data, **kwarg)
+        """Write each item of a dict GenericDataContainer to a file in the folder, using the key as the file name
+
+        Values can be GenericDataContainer instances or plain values, which are written as text. Files are written 
+        atomically.
+
+        :param data: GenericDataContainer with a dict data type
+        :param write_processor: GenericIOProcessor to run after all files were written
+        """
+        if data.data_type.__name__ != 'dict':
+            raise Exception('Expected a GenericDataContainer with a dict data type')
+        for file_name, value in data.data.items():
+            if os.sep in file_name or (os.altsep is not None and os.altsep in file_name):
+                raise Exception('Invalid file name "{}" - file names can not contain a path separator'.format(file_name))
+            if not isinstance(value, GenericDataContainer):
+                container = GenericDataContainer(result_set_name=file_name, data_type=str, logger=self.logger)
+                container.store(data=value)
+                value = container
+            TextFileIO(file_folder_path=self.uri, file_name=file_name, write_mode=WRITE_MODE_ATOMIC, logger=self.logger).write(data=value)
         self.data_processing(data=data, processor=write_processor, **kwarg)
 
 # EOF
@@ -31,6 +31,7 @@ setup(
     extras_require={
         'dev': ['check-manifest'],
         'test': ['coverage'],
+        'codecs': ['orjson', 'ujson', 'msgpack'],
     },
     project_urls={
         'Bug Reports': 'https://www.oculusd.com/',
@@ -20,6 +20,14 @@ import unittest
 from tests.test_logging import TestOculusDLogger, TestGetUtcTimestamp
 from tests.test_security import TestInitFunctions, TestEmailValidation, TestStringValidation, TestDataValidator, TestStringDataValidator, TestNumberDataValidator
 from tests.test_persistence import TestGenericDataContainer, TestGenericIOProcessor, TestGenericIO, TestTextFileIO, TestValidateFileExistIOProcessor
+from tests.test_persistence import TestWriteBehindBuffer, TestAsyncTextFileIO, TestTextFileBatchReader
+from tests.test_persistence import TestBinaryFileIO, TestJsonLinesFileIO, TestSerializationCodec
+from tests.test_persistence import TestCompressedFileIO, TestSqliteKeyValueIO, TestLogStructuredDictIO
+from tests.test_persistence import TestLineOffsetIndex, TestTextFileIOFollow, TestDirectoryIO, TestGenericIOProcessorPipeline
+from tests.test_persistence import TestBatchValidateFileExistIOProcessor, TestGenericIOProcessorProcessPool
+from tests.test_persistence import TestSharedMemoryDataContainer, TestSnapshot, TestRunningAggregates
+from tests.test_persistence import TestDictSecondaryIndex, TestConcurrentDataContainer, TestChangeTracking
+from tests.test_persistence import TestMemoryAccounting
 
 
 def suite():
@@ -124,6 +132,11 @@ def suite():
     suite.addTest(TestGenericDataContainer('test_generic_data_container_decimal_with_validator_and_valid_decimal'))
     suite.addTest(TestGenericDataContainer('test_generic_data_container_decimal_with_validator_and_invalid_decimal_expect_exception'))
     suite.addTest(TestGenericDataContainer('test_generic_data_container_decimal_with_invalid_validator_and_valid_decimal_expect_exception'))
+    suite.addTest(TestGenericDataContainer('test_generic_data_container_bytes_with_no_validator_and_valid_buffers'))
+    suite.addTest(TestGenericDataContainer('test_generic_data_container_bytes_with_invalid_input_type_expect_exception'))
+    suite.addTest(TestGenericDataContainer('test_generic_data_container_list_with_memory_ceiling_spills_to_disk'))
+    suite.addTest(TestGenericDataContainer('test_generic_data_container_list_with_memory_ceiling_pickle'))
+    suite.addTest(TestGenericDataContainer('test_generic_data_container_list_with_memory_ceiling_written_by_text_file_io'))
     suite.addTest(TestGenericDataContainer('test_generic_data_container_unsupported_data_type_expect_exception'))
     suite.addTest(TestGenericDataContainer('test_generic_data_container_string_with_string_validator_and_valid_string'))
 
@@ -133,6 +146,7 @@ def suite():
     suite.addTest(TestGenericIO('test_init_generic_io'))
     suite.addTest(TestGenericIO('test_generic_io_read_unimplemented_exception'))
     suite.addTest(TestGenericIO('test_generic_io_write_unimplemented_exception'))
+    suite.addTest(TestGenericIO('test_generic_io_aread_unimplemented_exception'))
 
     suite.addTest(TestTextFileIO('test_init_text_file_io'))
     suite.addTest(TestTextFileIO('test_text_file_io_basic_text_data_read_without_cache'))
@@ -149,6 +163,168 @@ def suite():
     suite.addTest(TestTextFileIO('test_text_file_io_basic_text_data_write_without_cache_with_write_processor'))
     suite.addTest(TestTextFileIO('test_text_file_io_basic_text_data_write_without_cache_with_invalid_write_processor'))
     suite.addTest(TestTextFileIO('test_text_file_io_basic_text_data_write_without_cache'))
+    suite.addTest(TestTextFileIO('test_text_file_io_invalid_write_mode_expect_exception'))
+    suite.addTest(TestTextFileIO('test_text_file_io_atomic_write'))
+    suite.addTest(TestTextFileIO('test_text_file_io_append_write'))
+    suite.addTest(TestTextFileIO('test_text_file_io_write_with_grouped_fsync'))
+    suite.addTest(TestTextFileIO('test_text_file_io_atomic_write_new_file_mode_matches_open'))
+    suite.addTest(TestTextFileIO('test_text_file_io_atomic_write_with_grouped_fsync_syncs_data_before_replace'))
+    suite.addTest(TestTextFileIO('test_text_file_io_skip_unchanged_write'))
+    suite.addTest(TestTextFileIO('test_text_file_io_skip_unchanged_write_detects_external_change'))
+    suite.addTest(TestTextFileIO('test_text_file_io_skip_unchanged_write_with_fingerprint_sidecar'))
+
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_coalesce_and_explicit_flush'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_runs_write_processor_on_flush'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_interval_flush'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_failed_flush_stays_pending'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_failed_flush_keeps_newer_value'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_read_during_flush_sees_pending_value'))
+    suite.addTest(TestWriteBehindBuffer('test_write_behind_buffer_is_not_kept_alive'))
+
+    suite.addTest(TestAsyncTextFileIO('test_async_text_file_io_write_and_read'))
+    suite.addTest(TestAsyncTextFileIO('test_async_text_file_io_read_with_processor'))
+    suite.addTest(TestAsyncTextFileIO('test_async_text_file_io_read_from_cache'))
+    suite.addTest(TestAsyncTextFileIO('test_async_text_file_io_event_loop_stays_responsive'))
+
+    suite.addTest(TestTextFileBatchReader('test_init_text_file_batch_reader_invalid_source_expect_exception'))
+    suite.addTest(TestTextFileBatchReader('test_text_file_batch_reader_read_all'))
+    suite.addTest(TestTextFileBatchReader('test_text_file_batch_reader_captures_errors'))
+    suite.addTest(TestTextFileBatchReader('test_text_file_batch_reader_with_cache_and_read_processor'))
+
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_read_all'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_ranged_read_reuses_buffer'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_read_without_buffer_reuse'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_result_written_by_text_file_io_as_raw_bytes'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_read_into'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_write_and_write_at_offset'))
+    suite.addTest(TestBinaryFileIO('test_binary_file_io_write_with_invalid_container_expect_exception'))
+
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_append_and_read'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_resume_from_offset'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_incomplete_last_line_not_consumed'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_read_with_validator_expect_exception'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_write_invalid_container_expect_exception'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_write_after_torn_last_line'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_write_after_torn_only_line'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_write_waits_for_record_in_progress'))
+    suite.addTest(TestJsonLinesFileIO('test_json_lines_file_io_concurrent_writers'))
+
+    suite.addTest(TestSerializationCodec('test_default_codecs_registered'))
+    suite.addTest(TestSerializationCodec('test_all_registered_codecs_round_trip'))
+    suite.addTest(TestSerializationCodec('test_get_unknown_codec_expect_exception'))
+    suite.addTest(TestSerializationCodec('test_register_invalid_codec_expect_exception'))
+    suite.addTest(TestSerializationCodec('test_text_file_io_with_codec_round_trip'))
+    suite.addTest(TestSerializationCodec('test_text_file_io_with_codec_list_and_int'))
+    suite.addTest(TestSerializationCodec('test_text_file_io_with_codec_unsupported_data_type_expect_exception'))
+    suite.addTest(TestSerializationCodec('test_text_file_io_with_codec_unsupported_nested_value_expect_exception'))
+    suite.addTest(TestSerializationCodec('test_text_file_io_with_marshal_codec_tuple_round_trip'))
+
+    suite.addTest(TestCompressedFileIO('test_detect_compression'))
+    suite.addTest(TestCompressedFileIO('test_detect_compression_text_starting_with_bzip2_magic'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_compressed_round_trip_by_extension'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_compression_detected_from_magic_bytes_on_read'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_text_starting_with_bzip2_magic'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_undecompressable_magic_bytes_read_as_plain_text'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_forced_compression_with_codec_and_atomic_write'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_invalid_compression_expect_exception'))
+    suite.addTest(TestCompressedFileIO('test_text_file_io_compressed_append'))
+    suite.addTest(TestCompressedFileIO('test_json_lines_file_io_compressed_append_and_resume'))
+
+    suite.addTest(TestSqliteKeyValueIO('test_init_sqlite_key_value_io_invalid_table_name_expect_exception'))
+    suite.addTest(TestSqliteKeyValueIO('test_sqlite_key_value_io_in_memory_write_and_read'))
+    suite.addTest(TestSqliteKeyValueIO('test_sqlite_key_value_io_prefix_and_range_queries'))
+    suite.addTest(TestSqliteKeyValueIO('test_sqlite_key_value_io_file_database_with_wal'))
+    suite.addTest(TestSqliteKeyValueIO('test_sqlite_key_value_io_non_string_key_expect_exception'))
+    suite.addTest(TestSqliteKeyValueIO('test_sqlite_key_value_io_write_invalid_container_expect_exception'))
+
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_appends_only_changes'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_recover_by_scan_and_checkpoint'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_discards_incomplete_record'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_compaction'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_background_compaction'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_write_invalid_container_expect_exception'))
+    suite.addTest(TestLogStructuredDictIO('test_log_structured_dict_io_invalid_key_expect_exception'))
+
+    suite.addTest(TestLineOffsetIndex('test_line_offset_index_build_and_read'))
+    suite.addTest(TestLineOffsetIndex('test_line_offset_index_without_trailing_newline'))
+    suite.addTest(TestLineOffsetIndex('test_line_offset_index_loaded_from_sidecar_and_invalidated'))
+    suite.addTest(TestLineOffsetIndex('test_text_file_io_read_lines'))
+    suite.addTest(TestLineOffsetIndex('test_line_offset_index_sidecar_save_failure_keeps_index_in_memory'))
+    suite.addTest(TestLineOffsetIndex('test_line_offset_index_truncated_sidecar_is_ignored'))
+    suite.addTest(TestLineOffsetIndex('test_text_file_io_read_lines_without_sidecar'))
+
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_read_new_returns_only_appended_data'))
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_read_new_from_end'))
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_read_new_detects_truncation'))
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_read_new_detects_rotation'))
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_read_new_with_read_processor_and_partial_utf8'))
+    suite.addTest(TestTextFileIOFollow('test_text_file_io_follow_generator'))
+
+    suite.addTest(TestDirectoryIO('test_directory_io_reports_only_changes'))
+    suite.addTest(TestDirectoryIO('test_directory_io_read_files_in_parallel'))
+    suite.addTest(TestDirectoryIO('test_directory_io_persisted_manifest'))
+    suite.addTest(TestDirectoryIO('test_directory_io_manifest_in_scanned_folder_is_ignored'))
+    suite.addTest(TestDirectoryIO('test_directory_io_failed_file_read_is_reported_again'))
+    suite.addTest(TestDirectoryIO('test_directory_io_write'))
+
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_invalid_stage_config_expect_exception'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_inline_and_thread_stages_preserve_order'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_process_stage'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_drop_backpressure'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_error_policies'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_stop_on_error'))
+    suite.addTest(TestGenericIOProcessorPipeline('test_pipeline_as_read_processor'))
+
+    suite.addTest(TestGenericIOProcessorProcessPool('test_process_pool_invalid_config_expect_exception'))
+    suite.addTest(TestGenericIOProcessorProcessPool('test_process_pool_ordered_results'))
+    suite.addTest(TestGenericIOProcessorProcessPool('test_process_pool_worker_errors'))
+    suite.addTest(TestGenericIOProcessorProcessPool('test_process_pool_spilled_list_container'))
+
+    suite.addTest(TestSharedMemoryDataContainer('test_shared_memory_data_container_attach_zero_copy'))
+    suite.addTest(TestSharedMemoryDataContainer('test_shared_memory_data_container_typecode_from_list'))
+    suite.addTest(TestSharedMemoryDataContainer('test_shared_memory_data_container_close_and_unlink_are_idempotent'))
+    suite.addTest(TestSharedMemoryDataContainer('test_shared_memory_attach_only_skips_tracking_of_the_attached_segment'))
+    suite.addTest(TestSharedMemoryDataContainer('test_shared_memory_data_container_in_process_pool'))
+
+    suite.addTest(TestSnapshot('test_snapshot_bytes_array_memory_mapped'))
+    suite.addTest(TestSnapshot('test_snapshot_dict_with_validator'))
+    suite.addTest(TestSnapshot('test_snapshot_validator_that_can_not_be_created_expect_exception'))
+    suite.addTest(TestSnapshot('test_snapshot_other_data_types'))
+    suite.addTest(TestSnapshot('test_snapshot_invalid_file_expect_exception'))
+
+    suite.addTest(TestRunningAggregates('test_running_aggregates_decimal_list'))
+    suite.addTest(TestRunningAggregates('test_running_aggregates_window'))
+    suite.addTest(TestRunningAggregates('test_running_aggregates_number_and_tuple_modes'))
+
+    suite.addTest(TestDictSecondaryIndex('test_dict_secondary_index_equality_lookup'))
+    suite.addTest(TestDictSecondaryIndex('test_dict_secondary_index_range_lookup'))
+    suite.addTest(TestDictSecondaryIndex('test_dict_secondary_index_stats_and_errors'))
+    suite.addTest(TestDictSecondaryIndex('test_dict_secondary_index_rejected_value_leaves_all_indexes_unchanged'))
+    suite.addTest(TestDictSecondaryIndex('test_dict_secondary_index_unhashable_value_expect_exception'))
+
+    suite.addTest(TestConcurrentDataContainer('test_concurrent_data_container_dict_stress'))
+    suite.addTest(TestConcurrentDataContainer('test_concurrent_data_container_dict_snapshot_copy_on_write'))
+    suite.addTest(TestConcurrentDataContainer('test_concurrent_data_container_tuple_race'))
+    suite.addTest(TestConcurrentDataContainer('test_concurrent_data_container_snapshot_cache'))
+
+    suite.addTest(TestChangeTracking('test_change_tracking_changes_since'))
+    suite.addTest(TestChangeTracking('test_change_tracking_drain_changes'))
+    suite.addTest(TestChangeTracking('test_change_tracking_concurrent_container'))
+    suite.addTest(TestChangeTracking('test_change_tracking_log_structured_dict_io_write'))
+    suite.addTest(TestChangeTracking('test_change_tracking_log_structured_dict_io_write_uses_changes_by_default'))
+
+    suite.addTest(TestMemoryAccounting('test_deep_sizeof'))
+    suite.addTest(TestMemoryAccounting('test_container_memory_usage'))
+    suite.addTest(TestMemoryAccounting('test_container_memory_usage_while_storing'))
+    suite.addTest(TestMemoryAccounting('test_registry_skips_container_changed_while_measured'))
+    suite.addTest(TestMemoryAccounting('test_cache_budget_eviction'))
+    suite.addTest(TestMemoryAccounting('test_cache_size_only_estimated_when_needed'))
+    suite.addTest(TestMemoryAccounting('test_budget_warnings'))
+    suite.addTest(TestMemoryAccounting('test_memory_leak_check'))
+
+    suite.addTest(TestBatchValidateFileExistIOProcessor('test_batch_validate_file_exists_io_processor_result_map'))
+    suite.addTest(TestBatchValidateFileExistIOProcessor('test_batch_validate_file_exists_io_processor_listing_cache'))
+    suite.addTest(TestBatchValidateFileExistIOProcessor('test_batch_validate_file_exists_io_processor_invalid_data_expect_exception'))
 
     suite.addTest(TestNumberDataValidator('test_init_number_data_validator'))
     suite.addTest(TestNumberDataValidator('test_number_data_validator_int_input_no_validator_params'))
@@ -14,12 +14,41 @@ Usage with coverage:
 """
 
 import unittest
+import unittest.mock
 from odc_pycommons.persistence import GenericDataContainer, GenericIOProcessor, GenericIO, TextFileIO, ValidateFileExistIOProcessor
+from odc_pycommons.persistence import WRITE_MODE_ATOMIC, WRITE_MODE_APPEND, WriteBehindBuffer, configure_async_io
+from odc_pycommons.persistence import TextFileBatchReader, BinaryFileIO, JsonLinesFileIO, DirectoryIO
+from odc_pycommons.persistence import SerializationCodec, SERIALIZATION_CODECS, register_codec, get_codec
+from odc_pycommons.persistence import COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_BZ2, COMPRESSION_LZMA, detect_compression
+from odc_pycommons.persistence import SqliteKeyValueIO, LogStructuredDictIO, SpillableList, LineOffsetIndex
+from odc_pycommons.persistence import GenericIOProcessorPipeline, GenericIOProcessorPipelineStage
+from odc_pycommons.persistence import PIPELINE_EXECUTOR_THREAD, PIPELINE_EXECUTOR_PROCESS, PIPELINE_BACKPRESSURE_DROP
+from odc_pycommons.persistence import PIPELINE_ERROR_SKIP, PIPELINE_ERROR_CONTINUE, BatchValidateFileExistIOProcessor
+from odc_pycommons.persistence import GenericIOProcessorProcessPool, SharedMemoryDataContainer, save_snapshot, load_snapshot
+from odc_pycommons.persistence import RunningAggregates, DictSecondaryIndex, ConcurrentDataContainer
+from odc_pycommons.persistence import deep_sizeof, MEMORY_REGISTRY, MEMORY_BUDGET_WARN
+import odc_pycommons.persistence as persistence_module
 from decimal import Decimal
 from odc_pycommons.security import DataValidator, L, StringDataValidator, NumberDataValidator
 from datetime import datetime
 import os
 import json
+import time
+import asyncio
+import array
+import gzip
+import bz2
+import threading
+import shutil
+import random
+import statistics
+import gc
+import stat
+import pickle
+import weakref
+import sys
+import tracemalloc
+import logging
 
 
 class DictValueNotNoneDataValidator(DataValidator):
@@ -33,6 +62,15 @@ class DictValueNotNoneDataValidator(DataValidator):
         return False
 
 
+class DictValueMinimumDataValidator(DataValidator):
+    def __init__(self, minimum: int, logger=L):
+        self.minimum = minimum
+        self.logger = logger
+
+    def validate(self, data: object, **kwarg)->bool:
+        return data >= self.minimum
+
+
 class TextMultiplierGenericIOProcessor(GenericIOProcessor):
 
     def __init__(self):
@@ -48,6 +86,40 @@ class TextMultiplierGenericIOProcessor(GenericIOProcessor):
         result_generic_data_container.store(data=data.data*multiplier)
 
 
+class UpperCaseGenericIOProcessor(GenericIOProcessor):
+
+    def __init__(self, delay: float=0.0):
+        super().__init__()
+        self.delay = delay
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        if self.delay > 0:
+            time.sleep(self.delay)
+        if 'fail' in data.data:
+            raise Exception('Failing on request')
+        data.store(data='{}{}'.format(data.data.upper(), kwarg.get('suffix', '')))
+
+
+class ChecksumGenericIOProcessor(GenericIOProcessor):
+
+    def __init__(self):
+        super().__init__()
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        if len(data.data) == 0:
+            raise Exception('No data to checksum')
+        data.result_set_name = '{}:{}'.format(kwarg.get('prefix', ''), sum(bytes(data.data)))
+
+
+class SumGenericIOProcessor(GenericIOProcessor):
+
+    def __init__(self):
+        super().__init__()
+
+    def process(self, data: GenericDataContainer, **kwarg):
+        data.result_set_name = '{}'.format(sum(data.data))
+
+
 class TestGenericDataContainer(unittest.TestCase):
 
     def setUp(self):
@@ -386,6 +458,64 @@ class TestGenericDataContainer(unittest.TestCase):
         with self.assertRaises(Exception):
             gdc.store(data=l, min_value=Decimal(0.0), max_value=Decimal(9999.0))
 
+    def test_generic_data_container_bytes_with_no_validator_and_valid_buffers(self):
+        gdc = GenericDataContainer(result_set_name='Test', data_type=bytes)
+        self.assertEqual(b'', gdc.data)
+        self.assertEqual(4, gdc.store(data=b'TEST'))
+        buffer = bytearray(b'ABCDEF')
+        self.assertEqual(3, gdc.store(data=memoryview(buffer)[1:4]))
+        self.assertEqual(b'BCD', bytes(gdc.data))
+        self.assertEqual(8, gdc.store(data=array.array('i', [1, 2])))
+
+    def test_generic_data_container_bytes_with_invalid_input_type_expect_exception(self):
+        gdc = GenericDataContainer(result_set_name='Test', data_type=bytes)
+        with self.assertRaises(Exception):
+            gdc.store(data='Not bytes')
+
+    def test_generic_data_container_list_with_memory_ceiling_spills_to_disk(self):
+        gdc = GenericDataContainer(result_set_name='Test', data_type=list, max_items_in_memory=3)
+        self.assertIsInstance(gdc.data, SpillableList)
+        for i in range(10):
+            self.assertEqual(i + 1, gdc.store(data={'reading': i}))
+        self.assertEqual(10, len(gdc.data))
+        self.assertEqual(3, len(gdc.data.memory_items))
+        self.assertEqual(7, gdc.data.spilled_items)
+        self.assertGreater(gdc.data.spilled_bytes, 0)
+        self.assertEqual([{'reading': i} for i in range(10)], list(gdc.data))
+        self.assertEqual({'reading': 1}, gdc.data[1])
+        self.assertEqual({'reading': 5}, gdc.data[5])
+        self.assertEqual({'reading': 9}, gdc.data[-1])
+        self.assertEqual([{'reading': 8}, {'reading': 9}], gdc.data[8:])
+        with self.assertRaises(IndexError):
+            gdc.data[10]
+        gdc.data.close()
+
+    def test_generic_data_container_list_with_memory_ceiling_pickle(self):
+        gdc = GenericDataContainer(result_set_name='Test', data_type=list, max_items_in_memory=2)
+        for i in range(5):
+            gdc.store(data=i)
+        copy = pickle.loads(pickle.dumps(gdc))
+        self.assertIsInstance(copy.data, SpillableList)
+        self.assertEqual([0, 1, 2, 3, 4], list(copy.data))
+        self.assertEqual(3, copy.data.spilled_items)
+        self.assertIsNot(gdc.data.spill_file, copy.data.spill_file)
+        copy.store(data=5)
+        self.assertEqual(5, len(gdc.data))
+        copy.data.close()
+        gdc.data.close()
+
+    def test_generic_data_container_list_with_memory_ceiling_written_by_text_file_io(self):
+        gdc = GenericDataContainer(result_set_name='Test', data_type=list, max_items_in_memory=1)
+        gdc.store(data=1)
+        gdc.store(data=2)
+        tfio = TextFileIO(file_folder_path='.', file_name='SPILL_TEST', codec='json')
+        tfio.write(data=gdc)
+        self.assertEqual([1, 2], tfio.read().data)
+        tfio = TextFileIO(file_folder_path='.', file_name='SPILL_TEST')
+        tfio.write(data=gdc)
+        self.assertEqual('[1, 2]', tfio.read().data)
+        os.remove('SPILL_TEST')
+
     def test_generic_data_container_unsupported_data_type_expect_exception(self):
         with self.assertRaises(Exception):
             gdc = GenericDataContainer(result_set_name='Test', data_type=datetime)
@@ -429,6 +559,13 @@ class TestGenericIO(unittest.TestCase):
         with self.assertRaises(Exception):
             gio.write(data=gdc)
 
+    def test_generic_io_aread_unimplemented_exception(self):
+        gio = GenericIO(uri='a_file.txt')
+        loop = asyncio.new_event_loop()
+        with self.assertRaises(Exception):
+            loop.run_until_complete(gio.aread())
+        loop.close()
+
 
 class TestTextFileIO(unittest.TestCase):
 
@@ -660,6 +797,1866 @@ class TestTextFileIO(unittest.TestCase):
         self.assertEqual('', gdc_result.data)
 
 
+    def test_text_file_io_invalid_write_mode_expect_exception(self):
+        with self.assertRaises(Exception):
+            TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode='random')
+
+    def test_text_file_io_atomic_write(self):
+        with open('WRITE_TEST', 'w') as f:
+            f.write('Old Data That Is Longer')
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode=WRITE_MODE_ATOMIC, fsync=True)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='New Data')
+        tfio.write(data=gdp)
+        with open('WRITE_TEST', 'r') as f:
+            result = f.read()
+        self.assertEqual('New Data', result)
+        tmp_files = [file_name for file_name in os.listdir('.') if file_name.startswith('.WRITE_TEST.')]
+        self.assertEqual(0, len(tmp_files))
+
+    def test_text_file_io_append_write(self):
+        if os.path.isfile('WRITE_TEST'):
+            os.remove('WRITE_TEST')
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode=WRITE_MODE_APPEND)
+        for line in ('line 1\n', 'line 2\n'):
+            gdp = GenericDataContainer(data_type=str)
+            gdp.store(data=line)
+            tfio.write(data=gdp)
+        with open('WRITE_TEST', 'r') as f:
+            result = f.read()
+        self.assertEqual('line 1\nline 2\n', result)
+
+    def test_text_file_io_write_with_grouped_fsync(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode=WRITE_MODE_ATOMIC, fsync=True, fsync_batch_size=3)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='TEST')
+        tfio.write(data=gdp)
+        tfio.write(data=gdp)
+        self.assertEqual(2, tfio.unsynced_writes)
+        self.assertTrue(tfio.unsynced_directory)
+        tfio.write(data=gdp)
+        self.assertEqual(0, tfio.unsynced_writes)
+        self.assertFalse(tfio.unsynced_directory)
+        tfio.write(data=gdp)
+        tfio.sync()
+        self.assertEqual(0, tfio.unsynced_writes)
+        with open('WRITE_TEST', 'r') as f:
+            result = f.read()
+        self.assertEqual('TEST', result)
+
+    def test_text_file_io_atomic_write_new_file_mode_matches_open(self):
+        with open('WRITE_TEST_PLAIN', 'w') as f:
+            f.write('TEST')
+        try:
+            expected_mode = stat.S_IMODE(os.stat('WRITE_TEST_PLAIN').st_mode)
+        finally:
+            os.remove('WRITE_TEST_PLAIN')
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode=WRITE_MODE_ATOMIC)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='TEST')
+        tfio.write(data=gdp)
+        self.assertEqual(expected_mode, stat.S_IMODE(os.stat('WRITE_TEST').st_mode))
+        self.assertEqual([], [file_name for file_name in os.listdir('.') if file_name.endswith('.probe')])
+
+    def test_text_file_io_atomic_write_with_grouped_fsync_syncs_data_before_replace(self):
+        synced_paths = list()
+
+        def record_fsync(path: str, is_directory: bool=False):
+            synced_paths.append((path, is_directory))
+
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', write_mode=WRITE_MODE_ATOMIC, fsync=True, fsync_batch_size=3)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='TEST')
+        with unittest.mock.patch('odc_pycommons.persistence._fsync_path', side_effect=record_fsync):
+            tfio.write(data=gdp)
+            self.assertEqual(1, len(synced_paths))
+            self.assertFalse(synced_paths[0][1])
+            self.assertTrue('.WRITE_TEST.' in synced_paths[0][0])
+            tfio.sync()
+        self.assertEqual([True], [is_directory for path, is_directory in synced_paths[1:]])
+
+    def test_text_file_io_skip_unchanged_write(self):
+        if os.path.isfile('WRITE_TEST'):
+            os.remove('WRITE_TEST')
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', skip_unchanged=True)
+        gdp = GenericDataContainer(data_type=dict)
+        gdp.store(data=True, key='DidItWork')
+        tfio.write(data=gdp)
+        tfio.write(data=gdp)
+        self.assertEqual(1, tfio.writes_skipped)
+        self.assertEqual(len(json.dumps(gdp.data)), tfio.bytes_skipped)
+        self.assertEqual(len(json.dumps(gdp.data)), tfio.bytes_written)
+        gdp.store(data=False, key='DidItWork')
+        tfio.write(data=gdp)
+        self.assertEqual(1, tfio.writes_skipped)
+        with open('WRITE_TEST', 'r') as f:
+            self.assertFalse(json.load(f)['DidItWork'])
+
+    def test_text_file_io_skip_unchanged_write_detects_external_change(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', skip_unchanged=True)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='TEST')
+        tfio.write(data=gdp)
+        with open('WRITE_TEST', 'w') as f:
+            f.write('Changed by someone else')
+        tfio.write(data=gdp)
+        self.assertEqual(0, tfio.writes_skipped)
+        with open('WRITE_TEST', 'r') as f:
+            self.assertEqual('TEST', f.read())
+
+    def test_text_file_io_skip_unchanged_write_with_fingerprint_sidecar(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', skip_unchanged=True, fingerprint_sidecar=True)
+        gdp = GenericDataContainer(data_type=str)
+        gdp.store(data='Sidecar Test')
+        tfio.write(data=gdp)
+        self.assertTrue(os.path.isfile('WRITE_TEST.fingerprint'))
+        tfio2 = TextFileIO(file_folder_path='.', file_name='WRITE_TEST', skip_unchanged=True, fingerprint_sidecar=True)
+        tfio2.write(data=gdp)
+        self.assertEqual(1, tfio2.writes_skipped)
+        self.assertEqual(0, tfio2.bytes_written)
+        os.remove('WRITE_TEST.fingerprint')
+
+class TestSerializationCodec(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = {
+            'device_id': 'dev-001',
+            'readings': [{'sensor': 'temp', 'value': 21.5, 'ts': 1546300800 + i} for i in range(100)],
+            'online': True,
+            'tags': ['a', 'b'],
+        }
+
+    def tearDown(self):
+        if os.path.isfile('CODEC_TEST'):
+            os.remove('CODEC_TEST')
+
+    def test_default_codecs_registered(self):
+        self.assertTrue('json' in SERIALIZATION_CODECS)
+        self.assertTrue('marshal' in SERIALIZATION_CODECS)
+
+    def test_all_registered_codecs_round_trip(self):
+        for name, codec in SERIALIZATION_CODECS.items():
+            raw = codec.encode(self.payload)
+            self.assertIsInstance(raw, bytes, 'Codec "{}" failed to encode to bytes'.format(name))
+            self.assertEqual(self.payload, codec.decode(raw), 'Codec "{}" failed to round trip'.format(name))
+
+    def test_get_unknown_codec_expect_exception(self):
+        with self.assertRaises(Exception):
+            get_codec(name='no-such-codec')
+        with self.assertRaises(Exception):
+            TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec='no-such-codec')
+
+    def test_register_invalid_codec_expect_exception(self):
+        with self.assertRaises(Exception):
+            register_codec(codec='json')
+        with self.assertRaises(Exception):
+            register_codec(codec=SerializationCodec())
+
+    def test_text_file_io_with_codec_round_trip(self):
+        for name in SERIALIZATION_CODECS.keys():
+            tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec=name, write_mode=WRITE_MODE_ATOMIC)
+            gdc = GenericDataContainer(data_type=dict)
+            for key, value in self.payload.items():
+                gdc.store(data=value, key=key)
+            tfio.write(data=gdc)
+            result = tfio.read()
+            self.assertEqual('dict', result.data_type.__name__)
+            self.assertEqual(self.payload, result.data)
+
+    def test_text_file_io_with_codec_unsupported_data_type_expect_exception(self):
+        for name in SERIALIZATION_CODECS.keys():
+            tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec=name)
+            gdc = GenericDataContainer(data_type=Decimal)
+            gdc.store(data=Decimal('1.10'))
+            with self.assertRaises(Exception) as context:
+                tfio.write(data=gdc)
+            self.assertTrue('does not support' in str(context.exception), 'Codec "{}"'.format(name))
+        self.assertFalse(os.path.isfile('CODEC_TEST'))
+        tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec='json', write_behind_buffer=WriteBehindBuffer(flush_interval=0))
+        gdc = GenericDataContainer(data_type=tuple)
+        with self.assertRaises(Exception):
+            tfio.write(data=gdc)
+
+    def test_text_file_io_with_codec_unsupported_nested_value_expect_exception(self):
+        for name in SERIALIZATION_CODECS.keys():
+            tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec=name)
+            gdc = GenericDataContainer(data_type=dict)
+            gdc.store(data=Decimal('1.10'), key='price')
+            with self.assertRaises(Exception) as context:
+                tfio.write(data=gdc)
+            self.assertIs(Exception, type(context.exception), 'Codec "{}"'.format(name))
+            self.assertTrue('could not encode' in str(context.exception), 'Codec "{}"'.format(name))
+
+    def test_text_file_io_with_marshal_codec_tuple_round_trip(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec='marshal')
+        gdc = GenericDataContainer(data_type=tuple)
+        gdc.store(data=(1, 'two'))
+        tfio.write(data=gdc)
+        result = tfio.read()
+        self.assertEqual('tuple', result.data_type.__name__)
+        self.assertEqual((1, 'two'), result.data)
+
+    def test_text_file_io_with_codec_list_and_int(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='CODEC_TEST', codec='marshal')
+        gdc = GenericDataContainer(data_type=list)
+        gdc.store(data=1)
+        gdc.store(data='two')
+        tfio.write(data=gdc)
+        result = tfio.read()
+        self.assertEqual('list', result.data_type.__name__)
+        self.assertEqual([1, 'two'], result.data)
+        gdc = GenericDataContainer(data_type=int)
+        gdc.store(data=42)
+        tfio.write(data=gdc)
+        result = tfio.read()
+        self.assertEqual('int', result.data_type.__name__)
+        self.assertEqual(42, result.data)
+
+class TestCompressedFileIO(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('COMPRESS_TEST'):
+                os.remove(file_name)
+
+    def test_detect_compression(self):
+        self.assertEqual(COMPRESSION_GZIP, detect_compression(path='COMPRESS_TEST.gz'))
+        self.assertEqual(COMPRESSION_BZ2, detect_compression(path='COMPRESS_TEST.bz2'))
+        self.assertEqual(COMPRESSION_LZMA, detect_compression(path='COMPRESS_TEST.xz'))
+        self.assertEqual(COMPRESSION_NONE, detect_compression(path='COMPRESS_TEST.txt'))
+        with gzip.open('COMPRESS_TEST', 'wb') as f:
+            f.write(b'TEST')
+        self.assertEqual(COMPRESSION_NONE, detect_compression(path='COMPRESS_TEST'))
+        self.assertEqual(COMPRESSION_GZIP, detect_compression(path='COMPRESS_TEST', read_magic_bytes=True))
+
+    def test_detect_compression_text_starting_with_bzip2_magic(self):
+        with open('COMPRESS_TEST', 'w') as f:
+            f.write('BZh is the start of the bzip2 header')
+        self.assertEqual(COMPRESSION_NONE, detect_compression(path='COMPRESS_TEST', read_magic_bytes=True))
+        with bz2.open('COMPRESS_TEST', 'wb') as f:
+            f.write(b'TEST')
+        self.assertEqual(COMPRESSION_BZ2, detect_compression(path='COMPRESS_TEST', read_magic_bytes=True))
+
+    def test_text_file_io_compressed_round_trip_by_extension(self):
+        text_data = 'line of log data\n' * 1000
+        for extension in ('gz', 'bz2', 'xz'):
+            file_name = 'COMPRESS_TEST.{}'.format(extension)
+            tfio = TextFileIO(file_folder_path='.', file_name=file_name, compression_level=1)
+            gdc = GenericDataContainer(data_type=str)
+            gdc.store(data=text_data)
+            tfio.write(data=gdc)
+            self.assertLess(os.path.getsize(file_name), len(text_data))
+            self.assertEqual(text_data, tfio.read().data)
+
+    def test_text_file_io_compression_detected_from_magic_bytes_on_read(self):
+        with gzip.open('COMPRESS_TEST', 'wt') as f:
+            f.write('Compressed Data')
+        tfio = TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST', read_magic_bytes=True)
+        self.assertEqual('Compressed Data', tfio.read().data)
+
+    def test_text_file_io_text_starting_with_bzip2_magic(self):
+        with open('COMPRESS_TEST', 'w') as f:
+            f.write('BZh is the start of the bzip2 header')
+        self.assertEqual('BZh is the start of the bzip2 header', TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST').read().data)
+        self.assertEqual('BZh is the start of the bzip2 header', TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST', read_magic_bytes=True).read().data)
+
+    def test_text_file_io_undecompressable_magic_bytes_read_as_plain_text(self):
+        with open('COMPRESS_TEST', 'w') as f:
+            f.write('BZh91AY&SY is not followed by bzip2 data')
+        tfio = TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST', read_magic_bytes=True)
+        self.assertEqual('BZh91AY&SY is not followed by bzip2 data', tfio.read().data)
+
+    def test_text_file_io_forced_compression_with_codec_and_atomic_write(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST', compression=COMPRESSION_LZMA, codec='json', write_mode=WRITE_MODE_ATOMIC)
+        gdc = GenericDataContainer(data_type=dict)
+        gdc.store(data=[1, 2, 3], key='values')
+        tfio.write(data=gdc)
+        self.assertEqual(COMPRESSION_LZMA, detect_compression(path='COMPRESS_TEST', read_magic_bytes=True))
+        self.assertEqual({'values': [1, 2, 3]}, tfio.read().data)
+
+    def test_text_file_io_invalid_compression_expect_exception(self):
+        with self.assertRaises(Exception):
+            TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST', compression='zip')
+
+    def test_text_file_io_compressed_append(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='COMPRESS_TEST.gz', write_mode=WRITE_MODE_APPEND)
+        for line in ('line 1\n', 'line 2\n'):
+            gdc = GenericDataContainer(data_type=str)
+            gdc.store(data=line)
+            tfio.write(data=gdc)
+        self.assertEqual('line 1\nline 2\n', tfio.read().data)
+
+    def test_json_lines_file_io_compressed_append_and_resume(self):
+        jlio = JsonLinesFileIO(file_folder_path='.', file_name='COMPRESS_TEST.jsonl.gz')
+        gdc = GenericDataContainer(data_type=dict)
+        gdc.store(data=1, key='id')
+        jlio.write(data=gdc)
+        self.assertEqual([{'id': 1}], jlio.read().data)
+        offset = jlio.last_offset
+        gdc.store(data=2, key='id')
+        jlio.write(data=gdc)
+        self.assertEqual(COMPRESSION_GZIP, detect_compression(path='COMPRESS_TEST.jsonl.gz'))
+        self.assertEqual([{'id': 2}], list(jlio.iter_records(offset=offset)))
+
+class TestLineOffsetIndex(unittest.TestCase):
+
+    def setUp(self):
+        with open('LINE_TEST', 'w') as f:
+            for i in range(1000):
+                f.write('line {}\n'.format(i))
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('LINE_TEST'):
+                os.remove(file_name)
+
+    def test_line_offset_index_build_and_read(self):
+        loi = LineOffsetIndex(path='LINE_TEST', chunk_size=64)
+        self.assertEqual(1000, loi.line_count())
+        self.assertEqual('line 0\n', loi.read_lines(start=0))
+        self.assertEqual('line 500\nline 501\n', loi.read_lines(start=500, end=502))
+        self.assertEqual('line 999\n', loi.read_lines(start=999, end=5000))
+        self.assertTrue(os.path.isfile('LINE_TEST.lineidx'))
+        with self.assertRaises(Exception):
+            loi.read_lines(start=1000)
+
+    def test_line_offset_index_without_trailing_newline(self):
+        with open('LINE_TEST', 'w') as f:
+            f.write('a\nb\nc')
+        loi = LineOffsetIndex(path='LINE_TEST', use_sidecar=False)
+        self.assertEqual(3, loi.line_count())
+        self.assertEqual('c', loi.read_lines(start=2))
+        self.assertFalse(os.path.isfile('LINE_TEST.lineidx'))
+        with open('LINE_TEST', 'w') as f:
+            f.write('')
+        self.assertEqual(0, loi.line_count())
+
+    def test_line_offset_index_loaded_from_sidecar_and_invalidated(self):
+        LineOffsetIndex(path='LINE_TEST').ensure()
+        loi = LineOffsetIndex(path='LINE_TEST')
+        self.assertTrue(loi.load())
+        self.assertEqual(1000, len(loi.offsets))
+        with open('LINE_TEST', 'a') as f:
+            f.write('line 1000\n')
+        self.assertFalse(loi.is_valid())
+        self.assertFalse(LineOffsetIndex(path='LINE_TEST').load())
+        self.assertEqual('line 1000\n', loi.read_lines(start=1000))
+
+    def test_text_file_io_read_lines(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='LINE_TEST')
+        result = tfio.read_lines(start=10, end=12)
+        self.assertIsInstance(result, GenericDataContainer)
+        self.assertEqual('line 10\nline 11\n', result.data)
+
+    def test_line_offset_index_sidecar_save_failure_keeps_index_in_memory(self):
+        loi = LineOffsetIndex(path='LINE_TEST')
+        with unittest.mock.patch.object(persistence_module.os, 'replace', side_effect=PermissionError('read-only')):
+            self.assertEqual('line 10\n', loi.read_lines(start=10))
+        self.assertFalse(os.path.isfile('LINE_TEST.lineidx'))
+        self.assertFalse(os.path.isfile('LINE_TEST.lineidx.tmp'))
+        self.assertEqual(1000, loi.line_count())
+
+    def test_line_offset_index_truncated_sidecar_is_ignored(self):
+        LineOffsetIndex(path='LINE_TEST').ensure()
+        with open('LINE_TEST.lineidx', 'r+b') as f:
+            f.truncate(os.path.getsize('LINE_TEST.lineidx') - 8)
+        loi = LineOffsetIndex(path='LINE_TEST')
+        self.assertFalse(loi.load())
+        self.assertEqual('line 999\n', loi.read_lines(start=999))
+
+    def test_text_file_io_read_lines_without_sidecar(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='LINE_TEST')
+        self.assertEqual('line 10\n', tfio.read_lines(start=10, use_sidecar=False).data)
+        self.assertFalse(os.path.isfile('LINE_TEST.lineidx'))
+
+class TestTextFileIOFollow(unittest.TestCase):
+
+    def setUp(self):
+        with open('FOLLOW_TEST', 'w') as f:
+            f.write('first\n')
+        self.tfio = TextFileIO(file_folder_path='.', file_name='FOLLOW_TEST')
+
+    def tearDown(self):
+        self.tfio.stop_following()
+        for file_name in os.listdir('.'):
+            if file_name.startswith('FOLLOW_TEST'):
+                os.remove(file_name)
+
+    def test_text_file_io_read_new_returns_only_appended_data(self):
+        self.assertEqual('first\n', self.tfio.read_new().data)
+        self.assertEqual('', self.tfio.read_new().data)
+        with open('FOLLOW_TEST', 'a') as f:
+            f.write('second\n')
+        self.assertEqual('second\n', self.tfio.read_new().data)
+        self.assertEqual(13, self.tfio.follow_offset)
+
+    def test_text_file_io_read_new_from_end(self):
+        self.assertEqual('', self.tfio.read_new(from_end=True).data)
+        with open('FOLLOW_TEST', 'a') as f:
+            f.write('second\n')
+        self.assertEqual('second\n', self.tfio.read_new().data)
+
+    def test_text_file_io_read_new_detects_truncation(self):
+        self.tfio.read_new()
+        with open('FOLLOW_TEST', 'w') as f:
+            f.write('new\n')
+        self.assertEqual('new\n', self.tfio.read_new().data)
+        self.assertEqual(1, self.tfio.truncations_detected)
+
+    def test_text_file_io_read_new_detects_rotation(self):
+        self.tfio.read_new()
+        with open('FOLLOW_TEST', 'a') as f:
+            f.write('last line before rotation\n')
+        os.rename('FOLLOW_TEST', 'FOLLOW_TEST.1')
+        with open('FOLLOW_TEST', 'w') as f:
+            f.write('rotated\n')
+        self.assertEqual('last line before rotation\nrotated\n', self.tfio.read_new().data)
+        self.assertEqual(1, self.tfio.rotations_detected)
+
+    def test_text_file_io_read_new_with_read_processor_and_partial_utf8(self):
+        gdc_result = GenericDataContainer(result_set_name='Result', data_type=str)
+        self.tfio.read_new()
+        with open('FOLLOW_TEST', 'ab') as f:
+            f.write('\u00e9'.encode('utf-8')[:1])
+        self.assertEqual('', self.tfio.read_new(read_processor=TextMultiplierGenericIOProcessor(), result_generic_data_container=gdc_result).data)
+        self.assertEqual('', gdc_result.data)
+        with open('FOLLOW_TEST', 'ab') as f:
+            f.write('\u00e9'.encode('utf-8')[1:])
+        self.assertEqual('\u00e9', self.tfio.read_new(read_processor=TextMultiplierGenericIOProcessor(), result_generic_data_container=gdc_result).data)
+        self.assertEqual('\u00e9\u00e9', gdc_result.data)
+
+    def test_text_file_io_follow_generator(self):
+        stop_event = threading.Event()
+        results = list()
+        for data in self.tfio.follow(poll_interval=0.01, stop_event=stop_event):
+            results.append(data.data)
+            if len(results) == 1:
+                with open('FOLLOW_TEST', 'a') as f:
+                    f.write('second\n')
+            else:
+                stop_event.set()
+        self.assertEqual(['first\n', 'second\n'], results)
+
+class TestWriteBehindBuffer(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.isfile('WRITE_BEHIND_TEST'):
+            os.remove('WRITE_BEHIND_TEST')
+
+    def tearDown(self):
+        if os.path.isfile('WRITE_BEHIND_TEST'):
+            os.remove('WRITE_BEHIND_TEST')
+
+    def test_write_behind_coalesce_and_explicit_flush(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        for value in ('1', '2', '3'):
+            gdc = GenericDataContainer(data_type=str)
+            gdc.store(data=value)
+            tfio.write(data=gdc)
+        self.assertFalse(os.path.isfile('WRITE_BEHIND_TEST'))
+        self.assertEqual(2, wbb.coalesced_writes)
+        self.assertEqual('3', tfio.read().data)
+        tfio.flush()
+        self.assertIsNone(wbb.get(uri=tfio.uri))
+        with open('WRITE_BEHIND_TEST', 'r') as f:
+            self.assertEqual('3', f.read())
+
+    def test_write_behind_runs_write_processor_on_flush(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        gdc_result = GenericDataContainer(result_set_name='Result', data_type=str)
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='*')
+        tfio.write(data=gdc, write_processor=TextMultiplierGenericIOProcessor(), multiplier=4, result_generic_data_container=gdc_result)
+        self.assertEqual('', gdc_result.data)
+        wbb.flush()
+        self.assertEqual('****', gdc_result.data)
+
+    def test_write_behind_interval_flush(self):
+        wbb = WriteBehindBuffer(flush_interval=0.05)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='TEST')
+        tfio.write(data=gdc)
+        result = ''
+        waited = 0.0
+        while result != 'TEST' and waited < 5.0:
+            time.sleep(0.05)
+            waited = waited + 0.05
+            if os.path.isfile('WRITE_BEHIND_TEST'):
+                with open('WRITE_BEHIND_TEST', 'r') as f:
+                    result = f.read()
+        self.assertEqual('TEST', result)
+        self.assertIsNone(wbb.get(uri=tfio.uri))
+
+    def test_write_behind_failed_flush_stays_pending(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='TEST')
+        tfio.write(data=gdc)
+        with unittest.mock.patch.object(tfio, 'write_now', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                wbb.flush()
+        self.assertIs(gdc, wbb.get(uri=tfio.uri))
+        wbb.flush()
+        self.assertIsNone(wbb.get(uri=tfio.uri))
+        with open('WRITE_BEHIND_TEST', 'r') as f:
+            self.assertEqual('TEST', f.read())
+
+    def test_write_behind_failed_flush_keeps_newer_value(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        gdc_old = GenericDataContainer(data_type=str)
+        gdc_old.store(data='OLD')
+        gdc_new = GenericDataContainer(data_type=str)
+        gdc_new.store(data='NEW')
+        tfio.write(data=gdc_old)
+
+        def fail_after_newer_write(**kwarg):
+            tfio.write(data=gdc_new)
+            raise OSError('disk full')
+
+        with unittest.mock.patch.object(tfio, 'write_now', side_effect=fail_after_newer_write):
+            wbb.flush(raise_errors=False)
+        self.assertIs(gdc_new, wbb.get(uri=tfio.uri))
+
+    def test_write_behind_read_during_flush_sees_pending_value(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        tfio = TextFileIO(file_folder_path='.', file_name='WRITE_BEHIND_TEST', write_behind_buffer=wbb)
+        gdc_old = GenericDataContainer(data_type=str)
+        gdc_old.store(data='old')
+        tfio.write_now(data=gdc_old)
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='new')
+        gdc_newer = GenericDataContainer(data_type=str)
+        gdc_newer.store(data='newer')
+        tfio.write(data=gdc)
+        read_during_flush = list()
+        write_now = tfio.write_now
+
+        def read_then_write(**kwarg):
+            read_during_flush.append(tfio.read().data)
+            tfio.write(data=gdc_newer)
+            write_now(**kwarg)
+
+        with unittest.mock.patch.object(tfio, 'write_now', side_effect=read_then_write):
+            wbb.flush()
+        self.assertEqual(['new'], read_during_flush)
+        self.assertIs(gdc_newer, wbb.get(uri=tfio.uri))
+        wbb.flush()
+        self.assertIsNone(wbb.get(uri=tfio.uri))
+        with open('WRITE_BEHIND_TEST', 'r') as f:
+            self.assertEqual('newer', f.read())
+
+    def test_write_behind_buffer_is_not_kept_alive(self):
+        wbb = WriteBehindBuffer(flush_interval=0)
+        wbb_ref = weakref.ref(wbb)
+        del wbb
+        gc.collect()
+        self.assertIsNone(wbb_ref())
+
+class TestAsyncTextFileIO(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+        for file_name in os.listdir('.'):
+            if file_name.startswith('ASYNC_TEST'):
+                os.remove(file_name)
+
+    def test_async_text_file_io_write_and_read(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='ASYNC_TEST')
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='Async Data')
+        self.loop.run_until_complete(tfio.awrite(data=gdc))
+        result = self.loop.run_until_complete(tfio.aread())
+        self.assertIsInstance(result, GenericDataContainer)
+        self.assertEqual('Async Data', result.data)
+
+    def test_async_text_file_io_read_with_processor(self):
+        with open('ASYNC_TEST', 'w') as f:
+            f.write('*')
+        gdc_result = GenericDataContainer(result_set_name='Result', data_type=str)
+        tfio = TextFileIO(file_folder_path='.', file_name='ASYNC_TEST')
+        self.loop.run_until_complete(tfio.aread(read_processor=TextMultiplierGenericIOProcessor(), multiplier=3, result_generic_data_container=gdc_result))
+        self.assertEqual('***', gdc_result.data)
+
+    def test_async_text_file_io_read_from_cache(self):
+        with open('ASYNC_TEST', 'w') as f:
+            f.write('Cached')
+        tfio = TextFileIO(file_folder_path='.', file_name='ASYNC_TEST', enable_cache=True)
+        first = self.loop.run_until_complete(tfio.aread())
+        os.remove('ASYNC_TEST')
+        second = self.loop.run_until_complete(tfio.aread())
+        self.assertIs(first, second)
+
+    def test_async_text_file_io_event_loop_stays_responsive(self):
+        configure_async_io(max_workers=2)
+        ios = [TextFileIO(file_folder_path='.', file_name='ASYNC_TEST_{}'.format(i)) for i in range(50)]
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='x' * 100000)
+        max_gap = list([0.0])
+
+        async def heartbeat(done: asyncio.Event):
+            last = time.monotonic()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.monotonic()
+                max_gap[0] = max(max_gap[0], now - last)
+                last = now
+
+        async def run():
+            done = asyncio.Event()
+            beat = asyncio.ensure_future(heartbeat(done=done))
+            await asyncio.gather(*[io.awrite(data=gdc) for io in ios])
+            results = await asyncio.gather(*[io.aread() for io in ios])
+            done.set()
+            await beat
+            return results
+
+        results = self.loop.run_until_complete(run())
+        self.assertEqual(50, len(results))
+        self.assertEqual(100000, len(results[0].data))
+        self.assertLess(max_gap[0], 0.5)
+        configure_async_io()
+
+class TestBinaryFileIO(unittest.TestCase):
+
+    def setUp(self):
+        with open('BINARY_TEST', 'wb') as f:
+            f.write(bytes(range(256)))
+
+    def tearDown(self):
+        if os.path.isfile('BINARY_TEST'):
+            os.remove('BINARY_TEST')
+
+    def test_binary_file_io_read_all(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST')
+        gdc = bfio.read()
+        self.assertEqual('bytes', gdc.data_type.__name__)
+        self.assertEqual(bytes(range(256)), bytes(gdc.data))
+
+    def test_binary_file_io_ranged_read_reuses_buffer(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST', buffer_size=128)
+        gdc = bfio.read(offset=10, length=5)
+        self.assertEqual(bytes(range(10, 15)), bytes(gdc.data))
+        buffer = bfio.buffer
+        self.assertEqual(128, len(buffer))
+        gdc = bfio.read(offset=250, length=100)
+        self.assertEqual(bytes(range(250, 256)), bytes(gdc.data))
+        self.assertIs(buffer, bfio.buffer)
+
+    def test_binary_file_io_result_written_by_text_file_io_as_raw_bytes(self):
+        gdc = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST').read()
+        for write_mode in (WRITE_MODE_ATOMIC, WRITE_MODE_APPEND):
+            TextFileIO(file_folder_path='.', file_name='BINARY_TEST_COPY', write_mode=write_mode).write(data=gdc)
+        with open('BINARY_TEST_COPY', 'rb') as f:
+            self.assertEqual(bytes(range(256)) * 2, f.read())
+        gdc = GenericDataContainer(data_type=bytes)
+        gdc.store(data=b'\x00raw')
+        TextFileIO(file_folder_path='.', file_name='BINARY_TEST_COPY').write(data=gdc)
+        with open('BINARY_TEST_COPY', 'rb') as f:
+            self.assertEqual(b'\x00raw', f.read())
+        os.remove('BINARY_TEST_COPY')
+
+    def test_binary_file_io_read_without_buffer_reuse(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST', reuse_buffer=False)
+        first = bfio.read(length=4)
+        second = bfio.read(offset=4, length=4)
+        self.assertEqual(bytes(range(4)), bytes(first.data))
+        self.assertEqual(bytes(range(4, 8)), bytes(second.data))
+        self.assertIsNone(bfio.buffer)
+
+    def test_binary_file_io_read_into(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST')
+        buffer = bytearray(8)
+        self.assertEqual(8, bfio.read_into(buffer=buffer, offset=100))
+        self.assertEqual(bytes(range(100, 108)), bytes(buffer))
+
+    def test_binary_file_io_write_and_write_at_offset(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST')
+        gdc = GenericDataContainer(data_type=bytes)
+        gdc.store(data=bytearray(b'0123456789'))
+        bfio.write(data=gdc)
+        gdc.store(data=memoryview(b'ab'))
+        bfio.write(data=gdc, offset=3)
+        with open('BINARY_TEST', 'rb') as f:
+            self.assertEqual(b'012ab56789', f.read())
+
+    def test_binary_file_io_write_with_invalid_container_expect_exception(self):
+        bfio = BinaryFileIO(file_folder_path='.', file_name='BINARY_TEST')
+        gdc = GenericDataContainer(data_type=str)
+        gdc.store(data='text')
+        with self.assertRaises(Exception):
+            bfio.write(data=gdc)
+
+class DictWithIdDataValidator(DataValidator):
+    def __init__(self, logger=L):
+        self.logger = logger
+
+    def validate(self, data: object, **kwarg)->bool:
+        return isinstance(data, dict) and 'id' in data
+
+
+class TestJsonLinesFileIO(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.isfile('JSONL_TEST'):
+            os.remove('JSONL_TEST')
+        self.jlio = JsonLinesFileIO(file_folder_path='.', file_name='JSONL_TEST')
+
+    def tearDown(self):
+        if os.path.isfile('JSONL_TEST'):
+            os.remove('JSONL_TEST')
+
+    def _write_records(self, count: int, start: int=0):
+        gdc = GenericDataContainer(data_type=list)
+        for i in range(start, start+count):
+            gdc.store(data={'id': i})
+        self.jlio.write(data=gdc)
+
+    def test_json_lines_file_io_append_and_read(self):
+        self._write_records(count=3)
+        gdc = GenericDataContainer(data_type=dict)
+        gdc.store(data=3, key='id')
+        self.jlio.write(data=gdc)
+        with open('JSONL_TEST', 'r') as f:
+            self.assertEqual(4, len(f.readlines()))
+        result = self.jlio.read()
+        self.assertEqual([{'id': 0}, {'id': 1}, {'id': 2}, {'id': 3}], result.data)
+
+    def test_json_lines_file_io_resume_from_offset(self):
+        self._write_records(count=2)
+        records = list(self.jlio.iter_records())
+        self.assertEqual(2, len(records))
+        offset = self.jlio.last_offset
+        self._write_records(count=2, start=2)
+        result = self.jlio.read(offset=offset)
+        self.assertEqual([{'id': 2}, {'id': 3}], result.data)
+
+    def test_json_lines_file_io_incomplete_last_line_not_consumed(self):
+        self._write_records(count=1)
+        with open('JSONL_TEST', 'a') as f:
+            f.write('{"id": ')
+        records = list(self.jlio.iter_records())
+        self.assertEqual([{'id': 0}], records)
+        with open('JSONL_TEST', 'a') as f:
+            f.write('1}\n')
+        self.assertEqual([{'id': 1}], list(self.jlio.iter_records(offset=self.jlio.last_offset)))
+
+    def test_json_lines_file_io_read_with_validator_expect_exception(self):
+        self._write_records(count=2)
+        with open('JSONL_TEST', 'a') as f:
+            f.write('{"no_id": true}\n')
+        with self.assertRaises(Exception):
+            self.jlio.read(data_validator=DictWithIdDataValidator())
+        streamed = list()
+        with self.assertRaises(Exception):
+            for record in self.jlio.iter_records(data_validator=DictWithIdDataValidator()):
+                streamed.append(record)
+        self.assertEqual(2, len(streamed))
+
+    def test_json_lines_file_io_write_invalid_container_expect_exception(self):
+        gdc = GenericDataContainer(data_type=str)
+        with self.assertRaises(Exception):
+            self.jlio.write(data=gdc)
+
+    def test_json_lines_file_io_write_after_torn_last_line(self):
+        self._write_records(count=2)
+        with open('JSONL_TEST', 'a') as f:
+            f.write('{"id": 2, "na')
+        self.assertEqual([{'id': 0}, {'id': 1}], self.jlio.read().data)
+        self._write_records(count=1, start=3)
+        self.assertEqual([{'id': 0}, {'id': 1}, {'id': 3}], self.jlio.read().data)
+
+    def test_json_lines_file_io_write_after_torn_only_line(self):
+        with open('JSONL_TEST', 'w') as f:
+            f.write('{"id": 0')
+        self._write_records(count=1, start=1)
+        self.assertEqual([{'id': 1}], self.jlio.read().data)
+
+    @unittest.skipIf(sys.platform.startswith('win'), 'flock is not available on Windows')
+    def test_json_lines_file_io_write_waits_for_record_in_progress(self):
+        import fcntl
+        self._write_records(count=1)
+        with open('JSONL_TEST', 'ab') as other_writer:
+            fcntl.flock(other_writer.fileno(), fcntl.LOCK_EX)
+            other_writer.write(b'{"id": 1, ')
+            other_writer.flush()
+            writer_thread = threading.Thread(target=self._write_records, kwargs={'count': 1, 'start': 2})
+            writer_thread.start()
+            writer_thread.join(timeout=0.2)
+            self.assertTrue(writer_thread.is_alive())
+            other_writer.write(b'"name": "in progress"}\n')
+            other_writer.flush()
+            fcntl.flock(other_writer.fileno(), fcntl.LOCK_UN)
+        writer_thread.join()
+        self.assertEqual([{'id': 0}, {'id': 1, 'name': 'in progress'}, {'id': 2}], self.jlio.read().data)
+
+    def test_json_lines_file_io_concurrent_writers(self):
+        def write_records(writer_id: int):
+            jlio = JsonLinesFileIO(file_folder_path='.', file_name='JSONL_TEST')
+            for i in range(25):
+                gdc = GenericDataContainer(data_type=dict)
+                gdc.store(data=writer_id, key='writer')
+                gdc.store(data=i, key='i')
+                jlio.write(data=gdc)
+
+        threads = [threading.Thread(target=write_records, args=(writer_id,)) for writer_id in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        records = self.jlio.read().data
+        self.assertEqual(100, len(records))
+        self.assertEqual(list(range(25)), [record['i'] for record in records if record['writer'] == 3])
+
+class TestSqliteKeyValueIO(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('SQLITE_TEST'):
+                os.remove(file_name)
+
+    def test_init_sqlite_key_value_io_invalid_table_name_expect_exception(self):
+        with self.assertRaises(Exception):
+            SqliteKeyValueIO(table_name='store; DROP TABLE store')
+
+    def test_sqlite_key_value_io_in_memory_write_and_read(self):
+        kvio = SqliteKeyValueIO(batch_size=2)
+        gdc = GenericDataContainer(data_type=dict)
+        for i in range(5):
+            gdc.store(data={'temp': 20 + i}, key='device-{}'.format(i))
+        kvio.write(data=gdc)
+        self.assertEqual(5, kvio.count())
+        result = kvio.read()
+        self.assertEqual(gdc.data, result.data)
+        self.assertEqual({'temp': 22}, kvio.get(key='device-2'))
+        self.assertIsNone(kvio.get(key='device-99'))
+        kvio.delete(key='device-2')
+        self.assertEqual(4, kvio.count())
+        self.assertEqual(['device-1', 'device-3'], sorted(kvio.read(keys=['device-1', 'device-2', 'device-3']).data.keys()))
+        kvio.close()
+
+    def test_sqlite_key_value_io_prefix_and_range_queries(self):
+        kvio = SqliteKeyValueIO(batch_size=3)
+        kvio.store_many(items=[('a:{}'.format(i), i) for i in range(10)] + [('b:{}'.format(i), i) for i in range(10)])
+        self.assertEqual(20, kvio.count())
+        self.assertEqual(['b:{}'.format(i) for i in range(10)], [key for key, value in kvio.iter_items(prefix='b:')])
+        result = kvio.read(start_key='a:3', end_key='a:6')
+        self.assertEqual({'a:3': 3, 'a:4': 4, 'a:5': 5}, result.data)
+        self.assertEqual(13, len(list(kvio.iter_items(start_key='a:7'))))
+        self.assertEqual(3, len(list(kvio.iter_items(end_key='a:3'))))
+        kvio.close()
+
+    def test_sqlite_key_value_io_file_database_with_wal(self):
+        kvio = SqliteKeyValueIO(database_path='SQLITE_TEST.db', codec='marshal')
+        kvio.store(key='k', value=[1, 2, 3])
+        self.assertEqual('wal', kvio.connection.execute('PRAGMA journal_mode').fetchone()[0])
+        kvio.close()
+        kvio = SqliteKeyValueIO(database_path='SQLITE_TEST.db', codec='marshal')
+        self.assertEqual([1, 2, 3], kvio.get(key='k'))
+        kvio.close()
+
+    def test_sqlite_key_value_io_non_string_key_expect_exception(self):
+        kvio = SqliteKeyValueIO()
+        with self.assertRaises(Exception):
+            kvio.store(key=1, value='one')
+        kvio.close()
+
+    def test_sqlite_key_value_io_write_invalid_container_expect_exception(self):
+        kvio = SqliteKeyValueIO()
+        with self.assertRaises(Exception):
+            kvio.write(data=GenericDataContainer(data_type=list))
+        kvio.close()
+
+class TestLogStructuredDictIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tearDown()
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('LOG_TEST'):
+                os.remove(file_name)
+
+    def _container(self, values: dict)->GenericDataContainer:
+        gdc = GenericDataContainer(data_type=dict)
+        for key, value in values.items():
+            gdc.store(data=value, key=key)
+        return gdc
+
+    def test_log_structured_dict_io_appends_only_changes(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        values = {'key-{}'.format(i): {'value': i} for i in range(100)}
+        lsio.write(data=self._container(values=values))
+        size = os.path.getsize('LOG_TEST')
+        values['key-5'] = {'value': 'changed'}
+        del values['key-6']
+        lsio.write(data=self._container(values=values))
+        with open('LOG_TEST', 'rb') as f:
+            f.seek(size)
+            appended = f.read().decode('utf-8').splitlines()
+        self.assertEqual(2, len(appended))
+        self.assertEqual({'value': 'changed'}, lsio.get(key='key-5'))
+        self.assertIsNone(lsio.get(key='key-6'))
+        self.assertEqual(values, lsio.read().data)
+        lsio.write(data=self._container(values=values))
+        self.assertEqual(size + len('\n'.join(appended)) + 1, os.path.getsize('LOG_TEST'))
+
+    def test_log_structured_dict_io_recover_by_scan_and_checkpoint(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        lsio.put(key='a', value=1)
+        lsio.put(key='b', value=2)
+        lsio.delete(key='a')
+        recovered = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        self.assertEqual({'b': 2}, recovered.read().data)
+        self.assertEqual(lsio.garbage_bytes, recovered.garbage_bytes)
+        lsio.close()
+        self.assertTrue(os.path.isfile('LOG_TEST.checkpoint'))
+        lsio.put(key='c', value=3)
+        recovered = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        self.assertEqual({'b': 2, 'c': 3}, recovered.read().data)
+
+    def test_log_structured_dict_io_discards_incomplete_record(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        lsio.put(key='a', value=1)
+        size = os.path.getsize('LOG_TEST')
+        with open('LOG_TEST', 'ab') as f:
+            f.write(b'{"k": "b", "v"')
+        recovered = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        self.assertEqual(['a'], recovered.keys())
+        self.assertEqual(size, os.path.getsize('LOG_TEST'))
+
+    def test_log_structured_dict_io_compaction(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST', compaction_min_bytes=1000, background_compaction=False)
+        for i in range(100):
+            lsio.put(key='counter', value=i)
+            lsio.put(key='static-{}'.format(i % 3), value='x')
+        self.assertGreater(lsio.compactions, 0)
+        self.assertLess(os.path.getsize('LOG_TEST'), 2000)
+        self.assertEqual({'counter': 99, 'static-0': 'x', 'static-1': 'x', 'static-2': 'x'}, lsio.read().data)
+        recovered = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        self.assertEqual(lsio.read().data, recovered.read().data)
+
+    def test_log_structured_dict_io_background_compaction(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST', compaction_min_bytes=1000)
+        for i in range(500):
+            lsio.put(key='key-{}'.format(i % 10), value=i)
+        lsio.close()
+        self.assertGreater(lsio.compactions, 0)
+        self.assertEqual({'key-{}'.format(i): 490 + i for i in range(10)}, lsio.read().data)
+        recovered = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        self.assertEqual(lsio.read().data, recovered.read().data)
+
+    def test_log_structured_dict_io_write_invalid_container_expect_exception(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        with self.assertRaises(Exception):
+            lsio.write(data=GenericDataContainer(data_type=list))
+
+    def test_log_structured_dict_io_invalid_key_expect_exception(self):
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST')
+        lsio.put(key='key', value=1)
+        lsio.put(key=2, value=2)
+        with self.assertRaises(Exception):
+            lsio.put(key=('a', 'b'), value=3)
+        with self.assertRaises(Exception):
+            lsio.write(data=self._container(values={'key': 1, 2: 2, ('a', 'b'): 3}))
+        self.assertEqual({'key': 1, 2: 2}, LogStructuredDictIO(file_folder_path='.', file_name='LOG_TEST').read().data)
+
+class TestTextFileBatchReader(unittest.TestCase):
+
+    def setUp(self):
+        for i in range(20):
+            with open('BATCH_TEST_{}'.format(i), 'w') as f:
+                f.write('data {}'.format(i))
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('BATCH_TEST'):
+                os.remove(file_name)
+
+    def test_init_text_file_batch_reader_invalid_source_expect_exception(self):
+        with self.assertRaises(Exception):
+            TextFileBatchReader(sources=['BATCH_TEST_1'])
+
+    def test_text_file_batch_reader_read_all(self):
+        sources = [('.', 'BATCH_TEST_{}'.format(i)) for i in range(10)]
+        sources.extend([TextFileIO(file_folder_path='.', file_name='BATCH_TEST_{}'.format(i)) for i in range(10, 20)])
+        reader = TextFileBatchReader(sources=sources, max_workers=4)
+        results = dict()
+        for result in reader.read():
+            self.assertFalse(result.is_error)
+            results[result.uri] = result.data.data
+        self.assertEqual(20, len(results))
+        self.assertEqual('data 15', results['.{}BATCH_TEST_15'.format(os.sep)])
+
+    def test_text_file_batch_reader_captures_errors(self):
+        sources = [('.', 'BATCH_TEST_1'), ('.', 'BATCH_TEST_MISSING'), ('.', 'BATCH_TEST_2')]
+        results = list(TextFileBatchReader(sources=sources).read())
+        self.assertEqual(3, len(results))
+        errors = [result for result in results if result.is_error]
+        self.assertEqual(1, len(errors))
+        self.assertEqual('.{}BATCH_TEST_MISSING'.format(os.sep), errors[0].uri)
+        self.assertIsInstance(errors[0].error, FileNotFoundError)
+        self.assertIsNotNone(errors[0].error_traceback)
+
+    def test_text_file_batch_reader_with_cache_and_read_processor(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='BATCH_TEST_3', enable_cache=True)
+        tfio.read()
+        os.remove('BATCH_TEST_3')
+        gdc_result = GenericDataContainer(result_set_name='Result', data_type=str)
+        results = list(TextFileBatchReader(sources=[tfio, ('.', 'BATCH_TEST_4')]).read(
+            read_processor=TextMultiplierGenericIOProcessor(), multiplier=2, result_generic_data_container=gdc_result
+        ))
+        self.assertEqual(2, len(results))
+        self.assertFalse(results[0].is_error)
+        self.assertFalse(results[1].is_error)
+        self.assertEqual('data 4data 4', gdc_result.data)
+
+class TestDirectoryIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tearDown()
+        os.mkdir('DIRECTORY_TEST')
+        for i in range(5):
+            with open(os.path.join('DIRECTORY_TEST', 'file-{}'.format(i)), 'w') as f:
+                f.write('data {}'.format(i))
+
+    def tearDown(self):
+        if os.path.isdir('DIRECTORY_TEST'):
+            shutil.rmtree('DIRECTORY_TEST')
+        if os.path.isfile('DIRECTORY_TEST.manifest'):
+            os.remove('DIRECTORY_TEST.manifest')
+
+    def test_directory_io_reports_only_changes(self):
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST')
+        result = dio.read()
+        self.assertEqual(['file-{}'.format(i) for i in range(5)], result.data['added'])
+        self.assertEqual([], result.data['changed'])
+        result = dio.read()
+        self.assertEqual({'added': [], 'changed': [], 'removed': []}, result.data)
+        with open(os.path.join('DIRECTORY_TEST', 'file-1'), 'w') as f:
+            f.write('changed data')
+        os.remove(os.path.join('DIRECTORY_TEST', 'file-2'))
+        with open(os.path.join('DIRECTORY_TEST', 'file-9'), 'w') as f:
+            f.write('new')
+        result = dio.read()
+        self.assertEqual({'added': ['file-9'], 'changed': ['file-1'], 'removed': ['file-2']}, result.data)
+
+    def test_directory_io_read_files_in_parallel(self):
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST', max_workers=2)
+        result = dio.read(read_files=True)
+        self.assertEqual(5, len(result.data['files']))
+        self.assertEqual('data 3', result.data['files']['file-3'].data)
+        self.assertEqual({}, result.data['errors'])
+        with open(os.path.join('DIRECTORY_TEST', 'file-0'), 'w') as f:
+            f.write('changed data')
+        result = dio.read(read_files=True)
+        self.assertEqual(['file-0'], list(result.data['files'].keys()))
+
+    def test_directory_io_persisted_manifest(self):
+        DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path='DIRECTORY_TEST.manifest').read()
+        with open(os.path.join('DIRECTORY_TEST', 'file-5'), 'w') as f:
+            f.write('new')
+        result = DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path='DIRECTORY_TEST.manifest').read()
+        self.assertEqual(['file-5'], result.data['added'])
+
+    def test_directory_io_manifest_in_scanned_folder_is_ignored(self):
+        manifest_path = os.path.join('DIRECTORY_TEST', 'manifest.json')
+        result = DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path=manifest_path).read()
+        self.assertEqual(['file-{}'.format(i) for i in range(5)], result.data['added'])
+        self.assertTrue(os.path.isfile(manifest_path))
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path=manifest_path)
+        self.assertEqual({'added': [], 'changed': [], 'removed': []}, dio.read().data)
+        self.assertEqual({'added': [], 'changed': [], 'removed': []}, dio.read().data)
+
+    def test_directory_io_failed_file_read_is_reported_again(self):
+        failed_files = list()
+
+        class FailOnceIOProcessor(GenericIOProcessor):
+            def process(self, data: GenericDataContainer, **kwarg):
+                if data.result_set_name.endswith('file-2') and len(failed_files) == 0:
+                    failed_files.append(data.result_set_name)
+                    raise Exception('Simulated read failure')
+
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path='DIRECTORY_TEST.manifest')
+        result = dio.read(read_files=True, file_read_processor=FailOnceIOProcessor())
+        self.assertEqual(['file-2'], list(result.data['errors'].keys()))
+        self.assertEqual(4, len(result.data['files']))
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST', manifest_path='DIRECTORY_TEST.manifest')
+        result = dio.read(read_files=True, file_read_processor=FailOnceIOProcessor())
+        self.assertEqual(['file-2'], result.data['added'])
+        self.assertEqual('data 2', result.data['files']['file-2'].data)
+        self.assertEqual({'added': [], 'changed': [], 'removed': []}, dio.read().data)
+
+    def test_directory_io_write(self):
+        dio = DirectoryIO(folder_path='DIRECTORY_TEST')
+        dio.read()
+        gdc = GenericDataContainer(data_type=dict)
+        gdc.store(data='plain value', key='written-1')
+        value = GenericDataContainer(data_type=dict)
+        value.store(data=1, key='a')
+        gdc.store(data=value, key='written-2')
+        dio.write(data=gdc)
+        result = dio.read(read_files=True)
+        self.assertEqual(['written-1', 'written-2'], result.data['added'])
+        self.assertEqual('plain value', result.data['files']['written-1'].data)
+        self.assertEqual({'a': 1}, json.loads(result.data['files']['written-2'].data))
+        gdc = GenericDataContainer(data_type=dict)
+        gdc.store(data='x', key='..{}escape'.format(os.sep))
+        with self.assertRaises(Exception):
+            dio.write(data=gdc)
+
+class TestGenericIOProcessorPipeline(unittest.TestCase):
+
+    def _containers(self, values: list)->list:
+        containers = list()
+        for value in values:
+            gdc = GenericDataContainer(result_set_name=value, data_type=str)
+            gdc.store(data=value)
+            containers.append(gdc)
+        return containers
+
+    def test_pipeline_invalid_stage_config_expect_exception(self):
+        with self.assertRaises(Exception):
+            GenericIOProcessorPipeline(stages=[])
+        with self.assertRaises(Exception):
+            GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(), executor='gpu')
+        with self.assertRaises(Exception):
+            GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(), backpressure='sometimes')
+        with self.assertRaises(Exception):
+            GenericIOProcessorPipelineStage(processor='not a processor')
+
+    def test_pipeline_inline_and_thread_stages_preserve_order(self):
+        pipeline = GenericIOProcessorPipeline(
+            stages=[
+                GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(delay=0.01), executor=PIPELINE_EXECUTOR_THREAD, max_workers=4, queue_size=2),
+                TextMultiplierGenericIOProcessor(),
+            ],
+            collect_results=True
+        )
+        with pipeline:
+            for gdc in self._containers(['item-{}'.format(i) for i in range(20)]):
+                pipeline.process(data=gdc, suffix='!')
+        self.assertEqual(['ITEM-{}!'.format(i) for i in range(20)], [gdc.data for gdc in pipeline.results])
+        self.assertEqual(20, pipeline.stages[0].processed)
+        self.assertEqual(20, pipeline.stages[1].processed)
+
+    def test_pipeline_process_stage(self):
+        pipeline = GenericIOProcessorPipeline(
+            stages=[GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(), executor=PIPELINE_EXECUTOR_PROCESS, max_workers=2)],
+            collect_results=True
+        )
+        with pipeline:
+            for gdc in self._containers(['a', 'b', 'c']):
+                pipeline.process(data=gdc)
+        self.assertEqual(['A', 'B', 'C'], [gdc.data for gdc in pipeline.results])
+
+    def test_pipeline_drop_backpressure(self):
+        pipeline = GenericIOProcessorPipeline(
+            stages=[GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(delay=0.05), queue_size=1, backpressure=PIPELINE_BACKPRESSURE_DROP)],
+            collect_results=True
+        )
+        with pipeline:
+            for gdc in self._containers(['item-{}'.format(i) for i in range(10)]):
+                pipeline.process(data=gdc)
+        self.assertTrue(pipeline.stages[0].dropped > 0)
+        self.assertEqual(10, pipeline.stages[0].dropped + len(pipeline.results))
+
+    def test_pipeline_error_policies(self):
+        pipeline = GenericIOProcessorPipeline(
+            stages=[
+                GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(), error_policy=PIPELINE_ERROR_CONTINUE, name='first'),
+                GenericIOProcessorPipelineStage(processor=UpperCaseGenericIOProcessor(), executor=PIPELINE_EXECUTOR_THREAD, error_policy=PIPELINE_ERROR_SKIP, name='second'),
+            ],
+            collect_results=True
+        )
+        with pipeline:
+            for gdc in self._containers(['a', 'fail', 'b']):
+                pipeline.process(data=gdc)
+        self.assertEqual(['A', 'B'], [gdc.data for gdc in pipeline.results])
+        self.assertEqual(['first', 'second'], [error[0] for error in pipeline.errors])
+        self.assertTrue('Failing on request' in pipeline.errors[0][3])
+
+    def test_pipeline_stop_on_error(self):
+        pipeline = GenericIOProcessorPipeline(stages=[UpperCaseGenericIOProcessor()], collect_results=True)
+        for gdc in self._containers(['a', 'fail', 'b']):
+            try:
+                pipeline.process(data=gdc)
+            except Exception:
+                pass
+        with self.assertRaises(Exception) as context:
+            pipeline.close()
+        self.assertTrue('Failing on request' in str(context.exception))
+        self.assertTrue('fail' not in [gdc.data for gdc in pipeline.results])
+        for gdc in self._containers(['c']):
+            pipeline.process(data=gdc)
+        pipeline.close()
+        self.assertEqual('C', pipeline.results[-1].data)
+
+    def test_pipeline_as_read_processor(self):
+        with open('PIPELINE_TEST', 'w') as f:
+            f.write('pipeline data')
+        try:
+            pipeline = GenericIOProcessorPipeline(stages=[UpperCaseGenericIOProcessor()])
+            gdc = TextFileIO(file_folder_path='.', file_name='PIPELINE_TEST').read(read_processor=pipeline)
+            pipeline.close()
+            self.assertEqual('PIPELINE DATA', gdc.data)
+        finally:
+            os.remove('PIPELINE_TEST')
+
+class TestGenericIOProcessorProcessPool(unittest.TestCase):
+
+    def _containers(self, count: int)->list:
+        containers = list()
+        for i in range(count):
+            gdc = GenericDataContainer(result_set_name='item-{}'.format(i), data_type=bytes)
+            gdc.store(data=memoryview(bytes([i, 1])))
+            containers.append(gdc)
+        return containers
+
+    def test_process_pool_invalid_config_expect_exception(self):
+        with self.assertRaises(Exception):
+            GenericIOProcessorProcessPool(processor='not a processor')
+        with self.assertRaises(Exception):
+            GenericIOProcessorProcessPool(processor=ChecksumGenericIOProcessor(), max_workers=0)
+
+    def test_process_pool_ordered_results(self):
+        containers = self._containers(count=25)
+        with GenericIOProcessorProcessPool(processor=ChecksumGenericIOProcessor(), max_workers=2, chunk_size=4) as pool:
+            results = list(pool.map(containers=containers, prefix='sum'))
+            self.assertEqual(list(range(25)), [result.index for result in results])
+            self.assertEqual(['sum:{}'.format(i + 1) for i in range(25)], [result.data.result_set_name for result in results])
+            self.assertEqual('item-3', containers[3].result_set_name)
+            results = list(pool.map(containers=containers, ordered=False))
+            self.assertEqual(list(range(25)), sorted([result.index for result in results]))
+
+    def test_process_pool_worker_errors(self):
+        containers = self._containers(count=4)
+        empty = GenericDataContainer(result_set_name='empty', data_type=bytes)
+        containers.insert(2, empty)
+        with GenericIOProcessorProcessPool(processor=ChecksumGenericIOProcessor(), max_workers=2) as pool:
+            with self.assertRaises(Exception) as context:
+                list(pool.map(containers=containers))
+            self.assertTrue('No data to checksum' in str(context.exception))
+            self.assertTrue('Traceback' in str(context.exception))
+            results = list(pool.map(containers=containers, raise_errors=False))
+        self.assertEqual([False, False, True, False, False], [result.is_error for result in results])
+        self.assertTrue('No data to checksum' in results[2].error_traceback)
+
+    def test_process_pool_spilled_list_container(self):
+        gdc = GenericDataContainer(result_set_name='spilled', data_type=list, max_items_in_memory=2)
+        for i in range(10):
+            gdc.store(data=i)
+        with GenericIOProcessorProcessPool(processor=SumGenericIOProcessor(), max_workers=1) as pool:
+            results = list(pool.map(containers=[gdc]))
+        self.assertEqual('45', results[0].data.result_set_name)
+        self.assertEqual(list(range(10)), list(results[0].data.data))
+        gdc.data.close()
+
+class TestSharedMemoryDataContainer(unittest.TestCase):
+
+    def test_shared_memory_data_container_attach_zero_copy(self):
+        with SharedMemoryDataContainer.create(data=array.array('d', [1.5, 2.5, 3.5]), writable=True) as owner:
+            self.assertTrue(owner.owner)
+            self.assertEqual('bytes', owner.data_type.__name__)
+            with SharedMemoryDataContainer.attach(name=owner.name) as attached:
+                self.assertFalse(attached.owner)
+                self.assertEqual([1.5, 2.5, 3.5], attached.data.tolist())
+                self.assertTrue(attached.data.readonly)
+                with self.assertRaises(TypeError):
+                    attached.data[0] = 9.0
+                with self.assertRaises(Exception):
+                    attached.store(data=[1.0, 2.0, 3.0])
+                with self.assertRaises(Exception):
+                    attached.unlink()
+                owner.store(data=[7.0, 8.0, 9.0])
+                self.assertEqual([7.0, 8.0, 9.0], attached.data.tolist())
+                with self.assertRaises(Exception):
+                    owner.store(data=[1.0])
+            name = owner.name
+        with self.assertRaises(Exception):
+            SharedMemoryDataContainer.attach(name=name)
+
+    def test_shared_memory_data_container_typecode_from_list(self):
+        owner = SharedMemoryDataContainer.create(data=[1, 2, 3], typecode='i', result_set_name='ints')
+        try:
+            self.assertEqual('i', owner.typecode)
+            self.assertEqual([1, 2, 3], owner.data.tolist())
+            self.assertTrue(owner.data.readonly)
+            with self.assertRaises(Exception):
+                owner.store(data=[4, 5, 6])
+        finally:
+            owner.unlink()
+        self.assertIsNone(owner.name)
+
+    def test_shared_memory_data_container_close_and_unlink_are_idempotent(self):
+        owner = SharedMemoryDataContainer.create(data=[1.0, 2.0])
+        attached = SharedMemoryDataContainer.attach(name=owner.name)
+        attached.close()
+        attached.close()
+        self.assertTrue(attached.closed)
+        with self.assertRaises(Exception):
+            attached.unlink()
+        owner.close()
+        owner.close()
+        owner.unlink()
+        owner.unlink()
+        self.assertIsNone(owner.name)
+
+    def test_shared_memory_attach_only_skips_tracking_of_the_attached_segment(self):
+        registered = list()
+
+        def shared_memory_without_track(name: str, **kwarg):
+            if 'track' in kwarg:
+                raise TypeError('unexpected keyword argument track')
+            persistence_module.resource_tracker.register('/{}'.format(name), 'shared_memory')
+            persistence_module.resource_tracker.register('/other-segment', 'shared_memory')
+            return name
+
+        with unittest.mock.patch.object(persistence_module.resource_tracker, 'register', side_effect=lambda name, rtype: registered.append(name)):
+            with unittest.mock.patch.object(persistence_module.shared_memory, 'SharedMemory', side_effect=shared_memory_without_track):
+                self.assertEqual('attached-segment', persistence_module._attach_untracked_shared_memory(name='attached-segment'))
+            persistence_module.resource_tracker.register('/later-segment', 'shared_memory')
+        self.assertEqual(['/other-segment', '/later-segment'], registered)
+
+    def test_shared_memory_data_container_in_process_pool(self):
+        with SharedMemoryDataContainer.create(data=array.array('d', range(1000))) as owner:
+            with GenericIOProcessorProcessPool(processor=SumGenericIOProcessor(), max_workers=2) as pool:
+                results = list(pool.map(containers=[owner, owner, owner]))
+            for result in results:
+                self.assertEqual('499500.0', result.data.result_set_name)
+                self.assertEqual(owner.name, result.data.name)
+                result.data.close()
+
+class TestSnapshot(unittest.TestCase):
+
+    def tearDown(self):
+        if os.path.isfile('SNAPSHOT_TEST'):
+            os.remove('SNAPSHOT_TEST')
+
+    def test_snapshot_bytes_array_memory_mapped(self):
+        gdc = GenericDataContainer(result_set_name='calibration', data_type=bytes)
+        gdc.store(data=array.array('d', [float(i) for i in range(1000)]))
+        size = save_snapshot(data=gdc, path='SNAPSHOT_TEST')
+        self.assertEqual(size, os.path.getsize('SNAPSHOT_TEST'))
+        self.assertTrue(size > 8000)
+        loaded = load_snapshot(path='SNAPSHOT_TEST')
+        self.assertEqual('calibration', loaded.result_set_name)
+        self.assertEqual('bytes', loaded.data_type.__name__)
+        self.assertIsInstance(loaded.data, memoryview)
+        self.assertTrue(loaded.data.readonly)
+        self.assertEqual('d', loaded.data.format)
+        self.assertEqual(gdc.data.tolist(), loaded.data.tolist())
+        loaded = load_snapshot(path='SNAPSHOT_TEST', use_mmap=False)
+        self.assertEqual(gdc.data.tolist(), loaded.data.tolist())
+
+    def test_snapshot_dict_with_validator(self):
+        gdc = GenericDataContainer(result_set_name='dict', data_type=dict, data_validator=DictValueNotNoneDataValidator())
+        gdc.store(data=Decimal('1.5'), key='a')
+        gdc.store(data=bytearray(b'raw'), key='b')
+        save_snapshot(data=gdc, path='SNAPSHOT_TEST')
+        loaded = load_snapshot(path='SNAPSHOT_TEST')
+        self.assertEqual(gdc.data, loaded.data)
+        self.assertIsInstance(loaded.data_validator, DictValueNotNoneDataValidator)
+        with self.assertRaises(Exception):
+            loaded.store(data=None, key='c')
+        loaded = load_snapshot(path='SNAPSHOT_TEST', restore_validator=False)
+        self.assertIsNone(loaded.data_validator)
+
+    def test_snapshot_validator_that_can_not_be_created_expect_exception(self):
+        gdc = GenericDataContainer(result_set_name='dict', data_type=dict, data_validator=DictValueMinimumDataValidator(minimum=1))
+        gdc.store(data=2, key='a')
+        save_snapshot(data=gdc, path='SNAPSHOT_TEST')
+        with self.assertRaisesRegex(Exception, 'Could not import the snapshot data validator'):
+            load_snapshot(path='SNAPSHOT_TEST')
+        self.assertEqual({'a': 2}, load_snapshot(path='SNAPSHOT_TEST', restore_validator=False).data)
+
+    def test_snapshot_other_data_types(self):
+        for data_type, value in ((str, 'text'), (int, 42), (float, 1.25), (tuple, [1, 2])):
+            gdc = GenericDataContainer(data_type=data_type)
+            gdc.store(data=value)
+            save_snapshot(data=gdc, path='SNAPSHOT_TEST')
+            loaded = load_snapshot(path='SNAPSHOT_TEST')
+            self.assertEqual(data_type, loaded.data_type)
+            self.assertEqual(gdc.data, loaded.data)
+        gdc = GenericDataContainer(data_type=list, max_items_in_memory=2)
+        for i in range(5):
+            gdc.store(data=i)
+        save_snapshot(data=gdc, path='SNAPSHOT_TEST')
+        self.assertEqual([0, 1, 2, 3, 4], load_snapshot(path='SNAPSHOT_TEST').data)
+
+    def test_snapshot_invalid_file_expect_exception(self):
+        with open('SNAPSHOT_TEST', 'wb') as f:
+            f.write(b'NOT A SNAPSHOT FILE')
+        with self.assertRaises(Exception):
+            load_snapshot(path='SNAPSHOT_TEST')
+        with self.assertRaises(Exception):
+            save_snapshot(data='not a container', path='SNAPSHOT_TEST')
+
+class TestRunningAggregates(unittest.TestCase):
+
+    def test_running_aggregates_decimal_list(self):
+        values = [Decimal('{}.{}'.format(random.randint(-100, 100), random.randint(0, 99))) for _ in range(200)]
+        gdc = GenericDataContainer(data_type=list, aggregates=True)
+        for value in values:
+            gdc.store(data=value)
+        self.assertEqual(200, gdc.aggregates.count)
+        self.assertEqual(sum(values), gdc.aggregates.sum)
+        self.assertEqual(min(values), gdc.aggregates.min)
+        self.assertEqual(max(values), gdc.aggregates.max)
+        self.assertIsInstance(gdc.aggregates.mean, Decimal)
+        self.assertAlmostEqual(float(statistics.mean(values)), float(gdc.aggregates.mean), places=9)
+        self.assertAlmostEqual(float(statistics.pvariance(values)), float(gdc.aggregates.variance), places=6)
+        self.assertAlmostEqual(float(statistics.variance(values)), float(gdc.aggregates.sample_variance), places=6)
+        self.assertAlmostEqual(float(statistics.pstdev(values)), float(gdc.aggregates.stddev), places=6)
+        gdc.store(data=1)
+        self.assertEqual(sum(values) + 1, gdc.aggregates.sum)
+        self.assertIsInstance(gdc.aggregates.sum, Decimal)
+        with self.assertRaises(Exception):
+            gdc.store(data='not a number')
+        self.assertEqual(201, len(gdc.data))
+
+    def test_running_aggregates_window(self):
+        values = [random.uniform(-50, 50) for _ in range(100)]
+        aggregates = RunningAggregates(window=10)
+        for index, value in enumerate(values):
+            aggregates.add(value=value)
+            window_values = values[max(0, index - 9):index + 1]
+            self.assertEqual(len(window_values), aggregates.count)
+            self.assertEqual(min(window_values), aggregates.min)
+            self.assertEqual(max(window_values), aggregates.max)
+            self.assertAlmostEqual(sum(window_values), aggregates.sum, places=6)
+            self.assertAlmostEqual(statistics.pvariance(window_values), aggregates.variance, places=6)
+        self.assertEqual(100, aggregates.total_count)
+        with self.assertRaises(Exception):
+            RunningAggregates(window=0)
+
+    def test_running_aggregates_number_and_tuple_modes(self):
+        gdc = GenericDataContainer(data_type=int, aggregates=True, aggregate_window=2)
+        for value in (1, '5', 3.7):
+            gdc.store(data=value)
+        self.assertEqual({'count': 2, 'sum': 8, 'min': 3, 'max': 5, 'mean': 4.0, 'variance': 1.0}, gdc.aggregates.as_dict())
+        gdc = GenericDataContainer(data_type=tuple, aggregates=True)
+        gdc.store(data=[1.5, 2.5])
+        self.assertEqual(2.0, gdc.aggregates.mean)
+        gdc = GenericDataContainer(data_type=tuple, aggregates=True)
+        with self.assertRaises(Exception):
+            gdc.store(data=[1, 'a'])
+        self.assertEqual(0, gdc.aggregates.count)
+        self.assertIsNone(gdc.aggregates.as_dict()['mean'])
+        with self.assertRaises(Exception):
+            GenericDataContainer(data_type=dict, aggregates=True)
+
+class TestDictSecondaryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.gdc = GenericDataContainer(result_set_name='devices', data_type=dict)
+        for i in range(10):
+            self.gdc.store(data={'site': 'site-{}'.format(i % 3), 'temperature': 20 + i}, key='device-{}'.format(i))
+
+    def test_dict_secondary_index_equality_lookup(self):
+        self.gdc.add_index(name='site', field='site')
+        self.assertEqual(['device-0', 'device-3', 'device-6', 'device-9'], sorted(self.gdc.lookup(index_name='site', value='site-0').keys()))
+        self.gdc.store(data={'site': 'site-1', 'temperature': 1}, key='device-0')
+        self.assertEqual(['device-3', 'device-6', 'device-9'], sorted(self.gdc.lookup(index_name='site', value='site-0').keys()))
+        self.assertEqual({'site': 'site-1', 'temperature': 1}, self.gdc.lookup(index_name='site', value='site-1')['device-0'])
+        self.gdc.store(data={'temperature': 5}, key='device-new')
+        self.assertEqual(10, self.gdc.indexes['site'].entries)
+        self.assertEqual({}, self.gdc.lookup(index_name='site', value='site-9'))
+        with self.assertRaises(Exception):
+            self.gdc.lookup(index_name='unknown', value='site-0')
+
+    def test_dict_secondary_index_range_lookup(self):
+        self.gdc.add_index(name='temperature', key_function=lambda record: record.get('temperature'))
+        self.assertEqual(['device-2', 'device-3', 'device-4'], list(self.gdc.lookup_range(index_name='temperature', start=22, end=24).keys()))
+        self.assertEqual(['device-2', 'device-3'], list(self.gdc.lookup_range(index_name='temperature', start=22, end=24, include_end=False).keys()))
+        self.assertEqual(['device-8', 'device-9'], list(self.gdc.lookup_range(index_name='temperature', start=28).keys()))
+        self.gdc.store(data={'site': 'site-0', 'temperature': 0}, key='device-9')
+        self.assertEqual(['device-9', 'device-0'], list(self.gdc.lookup_range(index_name='temperature', end=20).keys()))
+        with self.assertRaises(Exception):
+            self.gdc.store(data={'temperature': 'hot'}, key='device-x')
+
+    def test_dict_secondary_index_stats_and_errors(self):
+        self.gdc.add_index(name='site', field='site')
+        stats = self.gdc.index_stats()
+        self.assertEqual(10, stats['site']['entries'])
+        self.assertEqual(3, stats['site']['distinct_values'])
+        self.assertTrue(stats['site']['memory_usage'] > 0)
+        with self.assertRaises(Exception):
+            self.gdc.add_index(name='site', field='site')
+        with self.assertRaises(Exception):
+            DictSecondaryIndex(name='invalid')
+        self.gdc.drop_index(name='site')
+        self.assertEqual({}, self.gdc.index_stats())
+        gdc = GenericDataContainer(data_type=list)
+        with self.assertRaises(Exception):
+            gdc.add_index(name='site', field='site')
+
+    def test_dict_secondary_index_rejected_value_leaves_all_indexes_unchanged(self):
+        self.gdc.add_index(name='site', field='site')
+        self.gdc.add_index(name='temperature', field='temperature')
+        stats = self.gdc.index_stats()
+        with self.assertRaises(Exception):
+            self.gdc.store(data={'site': 'site-new', 'temperature': 'hot'}, key='device-0')
+        self.assertEqual(stats, self.gdc.index_stats())
+        self.assertEqual({}, self.gdc.lookup(index_name='site', value='site-new'))
+        self.assertTrue('device-0' in self.gdc.lookup(index_name='site', value='site-0'))
+        self.assertEqual({'site': 'site-0', 'temperature': 20}, self.gdc.data['device-0'])
+
+    def test_dict_secondary_index_unhashable_value_expect_exception(self):
+        self.gdc.add_index(name='temperature', field='temperature')
+        self.gdc.add_index(name='site', field='site')
+        stats = self.gdc.index_stats()
+        with self.assertRaises(Exception) as context:
+            self.gdc.store(data={'site': ['site-0', 'site-1'], 'temperature': 99}, key='device-x')
+        self.assertIs(Exception, type(context.exception))
+        self.assertTrue('not hashable' in str(context.exception))
+        self.assertEqual(stats, self.gdc.index_stats())
+        self.assertEqual({}, self.gdc.lookup(index_name='temperature', value=99))
+        self.assertFalse('device-x' in self.gdc.data)
+
+class TestConcurrentDataContainer(unittest.TestCase):
+
+    def test_concurrent_data_container_dict_stress(self):
+        gdc = ConcurrentDataContainer(result_set_name='stress', data_type=dict, data_validator=DictValueNotNoneDataValidator(), lock_stripes=4)
+        gdc.add_index(name='writer', field='writer')
+        writers = 8
+        keys_per_writer = 250
+        stop_readers = threading.Event()
+        reader_errors = list()
+
+        def writer(writer_id: int):
+            for i in range(keys_per_writer):
+                gdc.store(data={'writer': writer_id, 'i': i}, key='key-{}'.format(i % 100 if writer_id % 2 == 0 else '{}-{}'.format(writer_id, i)))
+
+        def reader():
+            while not stop_readers.is_set():
+                snapshot = gdc.snapshot()
+                count = 0
+                for key, value in snapshot.items():
+                    count += 1
+                if count != len(snapshot):
+                    reader_errors.append('snapshot changed while iterating')    # pragma: no cover
+                time.sleep(0.001)
+
+        def index_user():
+            while not stop_readers.is_set():
+                try:
+                    gdc.add_index(name='i', field='i')
+                    gdc.lookup(index_name='i', value=1)
+                    gdc.lookup_range(index_name='i', start=10, end=20)
+                    gdc.index_stats()
+                    gdc.drop_index(name='i')
+                except Exception as e:                                          # pragma: no cover
+                    reader_errors.append(repr(e))
+                time.sleep(0.001)
+
+        reader_threads = [threading.Thread(target=reader) for _ in range(2)] + [threading.Thread(target=index_user)]
+        writer_threads = [threading.Thread(target=writer, args=(writer_id,)) for writer_id in range(writers)]
+        for thread in reader_threads + writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        stop_readers.set()
+        for thread in reader_threads:
+            thread.join()
+        self.assertEqual([], reader_errors)
+        self.assertEqual(writers * keys_per_writer, gdc.version)
+        self.assertEqual(100 + (writers // 2) * keys_per_writer, len(gdc.snapshot()))
+        self.assertEqual(len(gdc.data), gdc.indexes['writer'].entries)
+        for key, record in gdc.snapshot().items():
+            self.assertTrue(key in gdc.indexes['writer'].keys_by_value[record['writer']])
+        with self.assertRaises(TypeError):
+            gdc.snapshot()['new-key'] = 1
+
+    def test_concurrent_data_container_dict_snapshot_copy_on_write(self):
+        gdc = ConcurrentDataContainer(data_type=dict)
+        for i in range(3):
+            gdc.store(data=i, key='key-{}'.format(i))
+        first = gdc.snapshot()
+        self.assertEqual(0, gdc.snapshot_copies)
+        self.assertIs(first, gdc.snapshot())
+        gdc.store(data=3, key='key-3')
+        gdc.delete(key='key-0')
+        self.assertEqual(1, gdc.snapshot_copies)
+        self.assertEqual({'key-0': 0, 'key-1': 1, 'key-2': 2}, dict(first))
+        second = gdc.snapshot()
+        self.assertEqual({'key-1': 1, 'key-2': 2, 'key-3': 3}, dict(second))
+        gdc.delete(key='key-1')
+        self.assertEqual(2, gdc.snapshot_copies)
+        self.assertEqual({'key-1': 1, 'key-2': 2, 'key-3': 3}, dict(second))
+        gdc.store(data=4, key='key-4')
+        self.assertEqual(2, gdc.snapshot_copies)
+
+    def test_concurrent_data_container_tuple_race(self):
+        gdc = ConcurrentDataContainer(data_type=tuple)
+        results = list()
+
+        def store_tuple(value: int):
+            try:
+                gdc.store(data=[value, value])
+                results.append(True)
+            except Exception:
+                results.append(False)
+
+        threads = [threading.Thread(target=store_tuple, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, results.count(True))
+        self.assertEqual(2, len(gdc.snapshot()))
+
+    def test_concurrent_data_container_snapshot_cache(self):
+        gdc = ConcurrentDataContainer(data_type=list, aggregates=True)
+        gdc.store(data=1)
+        first = gdc.snapshot()
+        self.assertIs(first, gdc.snapshot())
+        self.assertEqual(1, gdc.snapshot_copies)
+        gdc.store(data=2)
+        self.assertEqual((1, 2), gdc.snapshot())
+        self.assertEqual((1,), first)
+        self.assertEqual(3, gdc.aggregates.sum)
+        with self.assertRaises(Exception):
+            ConcurrentDataContainer(lock_stripes=0)
+
+class TestChangeTracking(unittest.TestCase):
+
+    def tearDown(self):
+        for file_name in os.listdir('.'):
+            if file_name.startswith('CHANGE_TEST'):
+                os.remove(file_name)
+
+    def test_change_tracking_changes_since(self):
+        gdc = GenericDataContainer(result_set_name='shadow', data_type=dict, track_changes=True)
+        for i in range(5):
+            gdc.store(data=i, key='key-{}'.format(i))
+        version = gdc.version
+        self.assertEqual(5, version)
+        gdc.store(data=10, key='key-1')
+        gdc.delete(key='key-2')
+        gdc.store(data=11, key='key-5')
+        changes = gdc.changes_since(version=version)
+        self.assertEqual(8, changes['version'])
+        self.assertEqual({'key-1': 10, 'key-5': 11}, changes['changed'])
+        self.assertEqual(['key-2'], changes['deleted'])
+        self.assertEqual({'version': 8, 'changed': {}, 'deleted': []}, gdc.changes_since(version=8))
+        self.assertEqual(5, len(gdc.changes_since(version=0)['changed']))
+        gdc.store(data=12, key='key-2')
+        self.assertEqual({'key-2': 12}, gdc.changes_since(version=8)['changed'])
+        self.assertEqual([], gdc.changes_since(version=version)['deleted'])
+        with self.assertRaises(Exception):
+            gdc.delete(key='unknown')
+
+    def test_change_tracking_drain_changes(self):
+        gdc = GenericDataContainer(data_type=dict, track_changes=True)
+        gdc.add_index(name='value', key_function=lambda value: value)
+        gdc.store(data=1, key='a')
+        gdc.store(data=2, key='b')
+        self.assertEqual({'version': 2, 'changed': {'a': 1, 'b': 2}, 'deleted': []}, gdc.drain_changes())
+        self.assertEqual({'version': 2, 'changed': {}, 'deleted': []}, gdc.drain_changes())
+        gdc.delete(key='a')
+        self.assertEqual([], gdc.indexes['value'].lookup(value=1))
+        self.assertEqual(['a'], gdc.drain_changes()['deleted'])
+        with self.assertRaises(Exception):
+            gdc.changes_since(version=1)
+        with self.assertRaises(Exception):
+            GenericDataContainer(data_type=list, track_changes=True)
+        with self.assertRaises(Exception):
+            GenericDataContainer(data_type=dict).changes_since(version=0)
+        with self.assertRaises(Exception):
+            GenericDataContainer(data_type=list).delete(key='a')
+
+    def test_change_tracking_concurrent_container(self):
+        gdc = ConcurrentDataContainer(data_type=dict, track_changes=True)
+        gdc.store(data=1, key='a')
+        snapshot = gdc.snapshot()
+        gdc.delete(key='a')
+        self.assertEqual({'a': 1}, dict(snapshot))
+        self.assertEqual({}, dict(gdc.snapshot()))
+        self.assertEqual({'version': 2, 'changed': {}, 'deleted': ['a']}, gdc.drain_changes())
+
+    def test_change_tracking_log_structured_dict_io_write(self):
+        gdc = GenericDataContainer(data_type=dict, track_changes=True)
+        for i in range(10):
+            gdc.store(data={'value': i}, key='key-{}'.format(i))
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='CHANGE_TEST', background_compaction=False)
+        lsio.write(data=gdc)
+        self.assertEqual(10, lsio.written_version)
+        journal_size = lsio.journal_size
+        gdc.store(data={'value': 100}, key='key-3')
+        gdc.delete(key='key-4')
+        lsio.write(data=gdc, since_version=lsio.written_version)
+        self.assertEqual(12, lsio.written_version)
+        self.assertEqual(len('{"k": "key-3", "v": {"value": 100}}\n{"k": "key-4", "d": true}\n'), lsio.journal_size - journal_size)
+        self.assertEqual(gdc.data, lsio.read().data)
+        lsio.close()
+
+    def test_change_tracking_log_structured_dict_io_write_uses_changes_by_default(self):
+        gdc = GenericDataContainer(data_type=dict, track_changes=True)
+        for i in range(10):
+            gdc.store(data={'value': i}, key='key-{}'.format(i))
+        lsio = LogStructuredDictIO(file_folder_path='.', file_name='CHANGE_TEST', background_compaction=False)
+        lsio.write(data=gdc)
+        gdc.store(data={'value': 100}, key='key-3')
+        with unittest.mock.patch.object(lsio, '_changed_put_lines', wraps=lsio._changed_put_lines) as changed_put_lines:
+            lsio.write(data=gdc)
+        self.assertEqual(['key-3'], [key for key, value in changed_put_lines.call_args[1]['items']])
+        self.assertEqual(11, lsio.written_version)
+        lsio.put(key='key-5', value={'value': -1})
+        lsio.write(data=gdc)
+        self.assertEqual(gdc.data, lsio.read().data)
+        other_gdc = GenericDataContainer(data_type=dict, track_changes=True)
+        other_gdc.store(data={'value': 0}, key='key-0')
+        lsio.write(data=other_gdc)
+        self.assertEqual(other_gdc.data, lsio.read().data)
+        lsio.close()
+
+class TestMemoryAccounting(unittest.TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            with open('MEMORY_TEST_{}'.format(i), 'w') as f:
+                f.write('x' * 10000)
+
+    def tearDown(self):
+        MEMORY_REGISTRY.set_budgets()
+        for file_name in os.listdir('.'):
+            if file_name.startswith('MEMORY_TEST'):
+                os.remove(file_name)
+
+    def test_deep_sizeof(self):
+        value = 'x' * 1000
+        self.assertEqual(sys.getsizeof(value), deep_sizeof(value))
+        self.assertTrue(deep_sizeof({'a': [value]}) > 1000)
+        self.assertTrue(deep_sizeof([value, value]) < 2000)
+        self.assertTrue(deep_sizeof(memoryview(bytearray(5000))) > 5000)
+
+    def test_container_memory_usage(self):
+        gdc = GenericDataContainer(data_type=dict, track_changes=True)
+        empty = gdc.memory_usage()
+        for i in range(100):
+            gdc.store(data={'site': i % 10, 'payload': 'x' * 100}, key='key-{}'.format(i))
+        with_data = gdc.memory_usage()
+        self.assertTrue(with_data - empty > 10000)
+        gdc.add_index(name='site', field='site')
+        self.assertTrue(gdc.memory_usage() > with_data)
+        self.assertTrue(gdc in MEMORY_REGISTRY.containers)
+        gdc_ref = weakref.ref(gdc)
+        del gdc
+        gc.collect()
+        self.assertIsNone(gdc_ref())
+
+    def test_container_memory_usage_while_storing(self):
+        gdc = ConcurrentDataContainer(data_type=dict)
+        stop_writer = threading.Event()
+        errors = list()
+
+        def writer():
+            i = 0
+            while not stop_writer.is_set():
+                gdc.store(data={'payload': [i, i]}, key='key-{}'.format(i))
+                i += 1
+
+        writer_thread = threading.Thread(target=writer)
+        writer_thread.start()
+        try:
+            for _ in range(50):
+                try:
+                    gdc.memory_usage()
+                    MEMORY_REGISTRY.container_bytes()
+                except RuntimeError as e:                                       # pragma: no cover
+                    errors.append(repr(e))
+        finally:
+            stop_writer.set()
+            writer_thread.join()
+        self.assertEqual([], errors)
+
+    def test_registry_skips_container_changed_while_measured(self):
+        changing = GenericDataContainer(data_type=dict)
+        changing.store(data='x' * 1000, key='a')
+        container_bytes = MEMORY_REGISTRY.container_bytes()
+        with unittest.mock.patch.object(changing, 'memory_usage', side_effect=RuntimeError('dictionary changed size during iteration')):
+            self.assertTrue(MEMORY_REGISTRY.container_bytes() < container_bytes)
+
+    def test_cache_budget_eviction(self):
+        ios = [TextFileIO(file_folder_path='.', file_name='MEMORY_TEST_{}'.format(i), enable_cache=True) for i in range(3)]
+        for io in ios:
+            io.read()
+        self.assertTrue(ios[0].cached_data_size > 10000)
+        self.assertTrue(MEMORY_REGISTRY.cache_bytes() >= 30000)
+        evictions = MEMORY_REGISTRY.evictions
+        MEMORY_REGISTRY.set_budgets(cache_budget_bytes=25000)
+        MEMORY_REGISTRY.check_budgets()
+        self.assertEqual(evictions + 1, MEMORY_REGISTRY.evictions)
+        self.assertEqual(2, len([io for io in ios if io.cached_data is not None]))
+        self.assertTrue(MEMORY_REGISTRY.cache_bytes() <= 25000)
+        for io in ios:
+            io.read()
+        self.assertTrue(MEMORY_REGISTRY.cache_bytes() <= 25000)
+
+    def test_cache_size_only_estimated_when_needed(self):
+        tfio = TextFileIO(file_folder_path='.', file_name='MEMORY_TEST_0', enable_cache=True)
+        with unittest.mock.patch.object(persistence_module, 'deep_sizeof', wraps=persistence_module.deep_sizeof) as mock_deep_sizeof:
+            tfio.read()
+            tfio.read()
+            self.assertEqual(0, mock_deep_sizeof.call_count)
+            self.assertTrue(tfio.cached_data_size > 10000)
+            self.assertTrue(tfio.cached_data_size > 10000)
+            self.assertEqual(1, mock_deep_sizeof.call_count)
+            MEMORY_REGISTRY.set_budgets(cache_budget_bytes=1000000)
+            tfio.read(force=True)
+            self.assertTrue(any([call[0][0] is tfio.cached_data for call in mock_deep_sizeof.call_args_list[1:]]))
+        tfio.clear_cache()
+        self.assertEqual(0, tfio.cached_data_size)
+
+    def test_budget_warnings(self):
+        ios = [TextFileIO(file_folder_path='.', file_name='MEMORY_TEST_{}'.format(i), enable_cache=True) for i in range(3)]
+        warnings = MEMORY_REGISTRY.budget_warnings
+        MEMORY_REGISTRY.set_budgets(cache_budget_bytes=15000, container_budget_bytes=1000, cache_budget_action=MEMORY_BUDGET_WARN)
+        for io in ios:
+            io.read()
+        self.assertEqual(3, len([io for io in ios if io.cached_data is not None]))
+        self.assertEqual(warnings + 2, MEMORY_REGISTRY.budget_warnings)
+        MEMORY_REGISTRY.check_budgets()
+        self.assertEqual(warnings + 4, MEMORY_REGISTRY.budget_warnings)
+        with self.assertRaises(Exception):
+            MEMORY_REGISTRY.set_budgets(cache_budget_action='panic')
+
+    @unittest.skipUnless(os.getenv('LEAK_CHECK'), 'Set the LEAK_CHECK environment variable to run the memory leak check')
+    def test_memory_leak_check(self):
+        def loop(iterations: int):
+            for i in range(iterations):
+                gdc = GenericDataContainer(data_type=dict, track_changes=True)
+                gdc.add_index(name='value', field='value')
+                gdc.store(data={'value': i}, key='key')
+                gdc.drain_changes()
+                io = TextFileIO(file_folder_path='.', file_name='MEMORY_TEST_{}'.format(i % 3), enable_cache=True)
+                io.read()
+
+        # Log records retained by the test runner are not leaks
+        logging.disable(logging.CRITICAL)
+        loop(iterations=100)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            loop(iterations=int(os.getenv('LEAK_CHECK_ITERATIONS', '200')))
+            gc.collect()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+            logging.disable(logging.NOTSET)
+        trace_filters = [tracemalloc.Filter(True, sys.modules[GenericDataContainer.__module__].__file__)]
+        growth = sum([stat.size_diff for stat in after.filter_traces(trace_filters).compare_to(before.filter_traces(trace_filters), 'filename')])
+        self.assertTrue(growth < 65536, 'Memory grew by {} bytes'.format(growth))
+
 class TestValidateFileExistIOProcessor(unittest.TestCase):
 
     def setUp(self):
@@ -706,6 +2703,63 @@ class TestValidateFileExistIOProcessor(unittest.TestCase):
             fp.process(data=gdc)
 
 
+class TestBatchValidateFileExistIOProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self.tearDown()
+        for folder in ('BATCH_VALIDATE_A', 'BATCH_VALIDATE_B'):
+            os.mkdir(folder)
+            for i in range(3):
+                with open(os.path.join(folder, 'file-{}'.format(i)), 'w') as f:
+                    f.write('TEST')
+
+    def tearDown(self):
+        for folder in ('BATCH_VALIDATE_A', 'BATCH_VALIDATE_B'):
+            if os.path.isdir(folder):
+                shutil.rmtree(folder)
+
+    def test_batch_validate_file_exists_io_processor_result_map(self):
+        paths = [
+            os.path.join('BATCH_VALIDATE_A', 'file-0'),
+            os.path.join('BATCH_VALIDATE_A', 'file-9'),
+            os.path.join('BATCH_VALIDATE_B', 'file-2'),
+            os.path.join('BATCH_VALIDATE_C', 'file-0'),
+            'BATCH_VALIDATE_B',
+        ]
+        gdc = GenericDataContainer(result_set_name='Test', data_type=list)
+        for path in paths:
+            gdc.store(data=path)
+        result_gdc = GenericDataContainer(result_set_name='Result', data_type=dict)
+        fp = BatchValidateFileExistIOProcessor()
+        result = fp.process(data=gdc, result_generic_data_container=result_gdc)
+        self.assertEqual(dict(zip(paths, [True, False, True, False, False])), result)
+        self.assertEqual(result, result_gdc.data)
+
+    def test_batch_validate_file_exists_io_processor_listing_cache(self):
+        path = os.path.join('BATCH_VALIDATE_A', 'file-5')
+        gdc = GenericDataContainer(result_set_name='Test', data_type=str)
+        gdc.store(data=path)
+        fp = BatchValidateFileExistIOProcessor(cache_ttl=60)
+        self.assertEqual({path: False}, fp.process(data=gdc))
+        with open(path, 'w') as f:
+            f.write('TEST')
+        self.assertEqual({path: False}, fp.process(data=gdc))
+        fp.clear_cache()
+        self.assertEqual({path: True}, fp.process(data=gdc))
+        fp = BatchValidateFileExistIOProcessor(cache_ttl=0)
+        fp.process(data=gdc)
+        os.remove(path)
+        self.assertEqual({path: False}, fp.process(data=gdc))
+
+    def test_batch_validate_file_exists_io_processor_invalid_data_expect_exception(self):
+        fp = BatchValidateFileExistIOProcessor()
+        with self.assertRaises(Exception):
+            fp.process(data=['somefile.txt'])
+        gdc = GenericDataContainer(result_set_name='Test', data_type=int)
+        gdc.store(data=1)
+        with self.assertRaises(Exception):
+            fp.process(data=gdc)
+
 if __name__ == '__main__':
     unittest.main()
 